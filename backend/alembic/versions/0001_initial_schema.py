@@ -0,0 +1,198 @@
+"""initial schema
+
+Esquema exatamente como o create_all() do app criava. Bancos que já
+existiam antes das migrations: rodar `alembic stamp 0001` uma vez e
+depois `alembic upgrade head`. Por isso ela tem que ficar igual ao
+create_all: o que veio depois (fila de jobs, índices das listagens)
+está na 0007.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('password_hash', sa.String(length=255), nullable=True),
+        sa.Column('avatar_url', sa.Text(), nullable=True),
+        sa.Column('google_id', sa.String(length=255), nullable=True),
+        sa.Column('linkedin_id', sa.String(length=255), nullable=True),
+        sa.Column('total_points', sa.Integer(), nullable=True),
+        sa.Column('level', sa.Integer(), nullable=True),
+        sa.Column('badges', postgresql.JSONB(), nullable=True),
+        sa.Column('streak_days', sa.Integer(), nullable=True),
+        sa.Column('last_activity_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('preferred_topics', postgresql.JSONB(), nullable=True),
+        sa.Column('learning_style', sa.String(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_login', sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint('level >= 1 AND level <= 100', name='valid_level'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('google_id'),
+        sa.UniqueConstraint('linkedin_id'),
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'courses',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('level', sa.String(length=50), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=True),
+        sa.Column('tags', postgresql.JSONB(), nullable=True),
+        sa.Column('duration_hours', sa.Integer(), nullable=False),
+        sa.Column('modules_count', sa.Integer(), nullable=True),
+        sa.Column('prerequisites', postgresql.JSONB(), nullable=True),
+        sa.Column('learning_outcomes', postgresql.JSONB(), nullable=True),
+        sa.Column('structure', postgresql.JSONB(), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('is_public', sa.Boolean(), nullable=True),
+        sa.Column('created_by', sa.String(length=255), nullable=True),
+        sa.Column('generated_by', postgresql.JSONB(), nullable=True),
+        sa.Column('generation_time_seconds', sa.Integer(), nullable=True),
+        sa.Column('ai_quality_score', sa.DECIMAL(precision=3, scale=1), nullable=True),
+        sa.Column('total_enrollments', sa.Integer(), nullable=True),
+        sa.Column('average_completion_rate', sa.DECIMAL(precision=5, scale=2), nullable=True),
+        sa.Column('average_rating', sa.DECIMAL(precision=3, scale=2), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint("level IN ('basic', 'intermediate', 'advanced')", name='valid_level'),
+        sa.CheckConstraint("status IN ('draft', 'published', 'archived')", name='valid_status'),
+        sa.CheckConstraint('duration_hours > 0', name='valid_duration'),
+        sa.CheckConstraint('ai_quality_score >= 0 AND ai_quality_score <= 10', name='valid_quality_score'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_courses_id', 'courses', ['id'])
+
+    op.create_table(
+        'modules',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('module_index', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('duration_hours', sa.Integer(), nullable=False),
+        sa.Column('content_generated', sa.Boolean(), nullable=True),
+        sa.Column('exam_generated', sa.Boolean(), nullable=True),
+        sa.Column('lessons_count', sa.Integer(), nullable=True),
+        sa.Column('quiz', postgresql.JSONB(), nullable=True),
+        sa.Column('examples', postgresql.JSONB(), nullable=True),
+        sa.Column('exercises', postgresql.JSONB(), nullable=True),
+        sa.Column('resources', postgresql.JSONB(), nullable=True),
+        sa.Column('review_score', sa.DECIMAL(precision=3, scale=1), nullable=True),
+        sa.Column('review_feedback', postgresql.JSONB(), nullable=True),
+        sa.Column('reviewed_by', sa.String(length=100), nullable=True),
+        sa.Column('generated_by', sa.String(length=100), nullable=True),
+        sa.Column('generation_prompt', sa.Text(), nullable=True),
+        sa.Column('ai_model_used', sa.String(length=100), nullable=True),
+        sa.Column('is_published', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint('duration_hours > 0', name='valid_module_duration'),
+        sa.CheckConstraint('review_score >= 0 AND review_score <= 10', name='valid_review_score'),
+        sa.CheckConstraint('module_index > 0', name='valid_module_index'),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_modules_id', 'modules', ['id'])
+
+    op.create_table(
+        'lessons',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('module_id', sa.Integer(), nullable=False),
+        sa.Column('lesson_index', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('generated_by', sa.String(length=100), nullable=True),
+        sa.Column('reviewed_by', sa.String(length=100), nullable=True),
+        sa.Column('review_feedback', postgresql.JSONB(), nullable=True),
+        sa.Column('is_approved', sa.Boolean(), nullable=True),
+        sa.Column('estimated_read_time_minutes', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint('lesson_index > 0', name='valid_lesson_index'),
+        sa.ForeignKeyConstraint(['module_id'], ['modules.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_lessons_id', 'lessons', ['id'])
+    op.create_index('ix_lessons_module_id', 'lessons', ['module_id'])
+
+    op.create_table(
+        'progress',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('module_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('current_lesson_index', sa.Integer(), nullable=True),
+        sa.Column('can_advance', sa.Boolean(), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_accessed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('quiz_attempts', sa.Integer(), nullable=True),
+        sa.Column('quiz_score', sa.Integer(), nullable=True),
+        sa.Column('quiz_passed', sa.Boolean(), nullable=True),
+        sa.Column('quiz_answers', postgresql.JSONB(), nullable=True),
+        sa.Column('quiz_completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('tutor_analysis', postgresql.JSONB(), nullable=True),
+        sa.Column('time_spent_minutes', sa.Integer(), nullable=True),
+        sa.Column('points_earned', sa.Integer(), nullable=True),
+        sa.Column('badges', postgresql.JSONB(), nullable=True),
+        sa.Column('exercises_completed', sa.Integer(), nullable=True),
+        sa.Column('exercises_total', sa.Integer(), nullable=True),
+        sa.CheckConstraint("status IN ('not_started', 'in_progress', 'completed', 'failed')", name='valid_status'),
+        sa.CheckConstraint('quiz_score >= 0 AND quiz_score <= 100', name='valid_quiz_score'),
+        sa.CheckConstraint('quiz_attempts >= 0', name='valid_quiz_attempts'),
+        sa.CheckConstraint('current_lesson_index >= 1', name='valid_current_lesson_index'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['module_id'], ['modules.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_progress_id', 'progress', ['id'])
+    op.create_index('ix_progress_user_id', 'progress', ['user_id'])
+
+    op.create_table(
+        'lesson_completions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('lesson_id', sa.Integer(), nullable=False),
+        sa.Column('completed', sa.Boolean(), nullable=True),
+        sa.Column('time_spent_minutes', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint('time_spent_minutes >= 0', name='valid_time_spent'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['lesson_id'], ['lessons.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_lesson_completions_id', 'lesson_completions', ['id'])
+    op.create_index('ix_lesson_completions_user_id', 'lesson_completions', ['user_id'])
+    op.create_index('ix_lesson_completions_lesson_id', 'lesson_completions', ['lesson_id'])
+
+
+def downgrade() -> None:
+    op.drop_table('lesson_completions')
+    op.drop_table('progress')
+    op.drop_table('lessons')
+    op.drop_table('modules')
+    op.drop_table('courses')
+    op.drop_table('users')
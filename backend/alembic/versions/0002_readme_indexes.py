@@ -0,0 +1,52 @@
+"""readme indexes
+
+Índices listados em db/README.md que ainda não existiam: GIN em
+courses.tags, busca full-text em courses, módulos por curso e ranking
+de usuários por pontos.
+
+Criados com CONCURRENTLY (fora de transação) para não travar escritas
+em bancos que já têm dados.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+COURSES_SEARCH_EXPRESSION = "to_tsvector('portuguese', title || ' ' || coalesce(description, ''))"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_courses_tags', 'courses', ['tags'],
+            postgresql_using='gin', postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_courses_search', 'courses', [sa.text(COURSES_SEARCH_EXPRESSION)],
+            postgresql_using='gin', postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_modules_course_module', 'modules', ['course_id', 'module_index'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_users_total_points', 'users', [sa.text('total_points DESC')],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_users_total_points', table_name='users', postgresql_concurrently=True)
+        op.drop_index('idx_modules_course_module', table_name='modules', postgresql_concurrently=True)
+        op.drop_index('idx_courses_search', table_name='courses', postgresql_concurrently=True)
+        op.drop_index('idx_courses_tags', table_name='courses', postgresql_concurrently=True)
@@ -0,0 +1,75 @@
+"""search vectors
+
+Busca full-text (GET /courses/search): coluna search_vector gerada
+(GENERATED ALWAYS AS ... STORED) em courses, modules e lessons, com
+índice GIN em cada uma. Título com peso A, descrição/conteúdo com peso B.
+
+O índice de expressão idx_courses_search (0002) é substituído por um GIN
+sobre a coluna: com o tsvector gravado, ranking e destaque não precisam
+recalcular to_tsvector linha a linha.
+
+Atenção: ADD COLUMN ... STORED reescreve a tabela (lock exclusivo durante
+a operação). Em bancos grandes, rode numa janela de manutenção.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+# tabela -> (coluna de título, coluna de corpo)
+SEARCH_COLUMNS = {
+    'courses': ('title', 'description'),
+    'modules': ('title', 'description'),
+    'lessons': ('title', 'content'),
+}
+
+OLD_COURSES_SEARCH_EXPRESSION = "to_tsvector('portuguese', title || ' ' || coalesce(description, ''))"
+
+
+def search_vector_expression(title: str, body: str) -> str:
+    return (
+        f"setweight(to_tsvector('portuguese', coalesce({title}, '')), 'A') || "
+        f"setweight(to_tsvector('portuguese', coalesce({body}, '')), 'B')"
+    )
+
+
+def upgrade() -> None:
+    for table, (title, body) in SEARCH_COLUMNS.items():
+        op.add_column(table, sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(search_vector_expression(title, body), persisted=True),
+        ))
+
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_courses_search', table_name='courses', postgresql_concurrently=True)
+        for table in SEARCH_COLUMNS:
+            op.create_index(
+                f'idx_{table}_search', table, ['search_vector'],
+                postgresql_using='gin', postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in SEARCH_COLUMNS:
+            op.drop_index(f'idx_{table}_search', table_name=table, postgresql_concurrently=True)
+
+    for table in SEARCH_COLUMNS:
+        op.drop_column(table, 'search_vector')
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_courses_search', 'courses', [sa.text(OLD_COURSES_SEARCH_EXPRESSION)],
+            postgresql_using='gin', postgresql_concurrently=True
+        )
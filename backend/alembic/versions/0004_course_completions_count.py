@@ -0,0 +1,45 @@
+"""course completions count
+
+courses.completions_count (Progress concluídos do curso), usado pelas
+estatísticas incrementais (app/services/course_stats.py). Preenche
+total_enrollments, completions_count e average_completion_rate a partir
+de progress, que até aqui ninguém mantinha.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('courses', sa.Column('completions_count', sa.Integer(), server_default='0', nullable=True))
+
+    op.execute("""
+        WITH actual AS (
+            SELECT course_id,
+                   COUNT(DISTINCT user_id) AS enrollments,
+                   COUNT(*) FILTER (WHERE status = 'completed') AS completions
+            FROM progress
+            GROUP BY course_id
+        )
+        UPDATE courses SET
+            total_enrollments = COALESCE(actual.enrollments, 0),
+            completions_count = COALESCE(actual.completions, 0),
+            average_completion_rate = LEAST(100, COALESCE(ROUND(
+                100.0 * actual.completions / NULLIF(actual.enrollments * COALESCE(courses.modules_count, 0), 0), 2
+            ), 0))
+        FROM actual
+        WHERE courses.id = actual.course_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('courses', 'completions_count')
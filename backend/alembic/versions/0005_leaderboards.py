@@ -0,0 +1,65 @@
+"""leaderboards
+
+Leaderboards em memória (app/services/leaderboard.py):
+- point_events: cada mudança de pontos (users.total_points ou
+  progress.points_earned), lida pelos workers para manter os rankings
+- leaderboard_snapshots: cópia periódica das primeiras posições de cada
+  ranking (e o histórico das semanas encerradas)
+- idx_progress_course_id (listado em db/README.md): carga do ranking de um curso
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'point_events',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('course_id', sa.Integer(), nullable=True),
+        sa.Column('points', sa.Integer(), nullable=False),
+        sa.Column('reason', sa.String(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('idx_point_events_user_created', 'point_events', ['user_id', 'created_at'])
+    op.create_index('idx_point_events_created_at', 'point_events', ['created_at'])
+
+    op.create_table(
+        'leaderboard_snapshots',
+        sa.Column('board', sa.String(length=100), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.Column('last_event_id', sa.BigInteger(), nullable=True),
+        sa.Column('taken_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('board', 'user_id'),
+    )
+    op.create_index('idx_leaderboard_snapshots_position', 'leaderboard_snapshots', ['board', 'position'])
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_progress_course_id', 'progress', ['course_id'],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_progress_course_id', table_name='progress', postgresql_concurrently=True)
+
+    op.drop_table('leaderboard_snapshots')
+    op.drop_table('point_events')
@@ -0,0 +1,66 @@
+"""progress events
+
+Ingestão em lote de POST /progress/events (app/services/progress_events.py):
+- uq_lesson_completions_user_lesson: uma linha por (aluno, lição), para o
+  upsert. Duplicatas que já existam são juntadas antes (tempo somado,
+  concluída se alguma estava, primeira data de conclusão).
+- progress_event_keys: event_id já aplicados (idempotência)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        WITH merged AS (
+            SELECT MIN(id) AS keep_id,
+                   user_id,
+                   lesson_id,
+                   SUM(COALESCE(time_spent_minutes, 0)) AS time_spent_minutes,
+                   BOOL_OR(COALESCE(completed, false)) AS completed,
+                   MIN(completed_at) AS completed_at
+            FROM lesson_completions
+            GROUP BY user_id, lesson_id
+            HAVING COUNT(*) > 1
+        ),
+        updated AS (
+            UPDATE lesson_completions lc SET
+                time_spent_minutes = merged.time_spent_minutes,
+                completed = merged.completed,
+                completed_at = merged.completed_at
+            FROM merged
+            WHERE lc.id = merged.keep_id
+        )
+        DELETE FROM lesson_completions lc
+        USING merged
+        WHERE lc.user_id = merged.user_id
+          AND lc.lesson_id = merged.lesson_id
+          AND lc.id <> merged.keep_id
+    """)
+    op.create_index(
+        'uq_lesson_completions_user_lesson', 'lesson_completions', ['user_id', 'lesson_id'], unique=True
+    )
+
+    op.create_table(
+        'progress_event_keys',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.String(length=100), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'event_id'),
+    )
+    op.create_index('idx_progress_event_keys_created_at', 'progress_event_keys', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('progress_event_keys')
+    op.drop_index('uq_lesson_completions_user_lesson', table_name='lesson_completions')
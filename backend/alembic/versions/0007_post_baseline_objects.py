@@ -0,0 +1,70 @@
+"""post baseline objects
+
+generation_jobs (fila de jobs), idx_courses_status_created e
+idx_progress_user_course (listagens paginadas) estavam na 0001, mas o
+create_all antigo não criava nenhum deles: um banco marcado com
+`alembic stamp 0001` ficava sem eles para sempre. Agora ficam aqui, e
+só são criados se ainda não existem (bancos que rodaram a 0001 antiga
+já têm tudo).
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('generation_jobs'):
+        op.create_table(
+            'generation_jobs',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('kind', sa.String(length=50), nullable=False),
+            sa.Column('status', sa.String(length=50), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=True),
+            sa.Column('params', postgresql.JSONB(), nullable=False),
+            sa.Column('progress', postgresql.JSONB(), nullable=True),
+            sa.Column('result', postgresql.JSONB(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+            sa.CheckConstraint("status IN ('queued', 'running', 'completed', 'failed')", name='valid_job_status'),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_generation_jobs_id', 'generation_jobs', ['id'])
+        op.create_index('ix_generation_jobs_status', 'generation_jobs', ['status'])
+
+    course_indexes = {index['name'] for index in inspector.get_indexes('courses')}
+    progress_indexes = {index['name'] for index in inspector.get_indexes('progress')}
+
+    with op.get_context().autocommit_block():
+        if 'idx_courses_status_created' not in course_indexes:
+            op.create_index(
+                'idx_courses_status_created', 'courses',
+                ['status', sa.text('created_at DESC'), sa.text('id DESC')],
+                postgresql_concurrently=True
+            )
+        if 'idx_progress_user_course' not in progress_indexes:
+            op.create_index(
+                'idx_progress_user_course', 'progress', ['user_id', 'course_id'],
+                postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_progress_user_course', table_name='progress', postgresql_concurrently=True)
+        op.drop_index('idx_courses_status_created', table_name='courses', postgresql_concurrently=True)
+
+    op.drop_table('generation_jobs')
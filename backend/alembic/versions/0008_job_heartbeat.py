@@ -0,0 +1,26 @@
+"""job heartbeat
+
+generation_jobs.heartbeat_at: o worker que executa um job renova a
+coluna periodicamente. Só jobs 'running' com heartbeat vencido (worker
+morto) voltam para a fila.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('generation_jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('generation_jobs', 'heartbeat_at')
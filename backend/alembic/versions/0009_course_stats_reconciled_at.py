@@ -0,0 +1,27 @@
+"""course stats reconciled at
+
+courses.stats_reconciled_at: quando a reconciliação (app/services/course_stats.py)
+reescreveu as estatísticas do curso. Deltas de outros workers com eventos
+anteriores a esse instante já estão na recontagem e são descartados no
+flush, em vez de contados duas vezes.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('courses', sa.Column('stats_reconciled_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('courses', 'stats_reconciled_at')
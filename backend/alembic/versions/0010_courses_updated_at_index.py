@@ -0,0 +1,30 @@
+"""courses updated_at index
+
+idx_courses_updated_at: o refresh do índice de similaridade
+(app/services/course_index.py) busca a cada poucos segundos os cursos
+alterados desde o último refresh (updated_at > ...).
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_courses_updated_at', 'courses', ['updated_at'],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_courses_updated_at', table_name='courses', postgresql_concurrently=True)
@@ -0,0 +1,33 @@
+"""courses created_at/id index
+
+idx_courses_created_id: GET /courses sem filtro de status ordena por
+(created_at DESC, id DESC). O idx_courses_status_created começa por
+status e só serve quando a listagem filtra por ele; sem este índice a
+primeira página de cada cursor ordenava a tabela inteira.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_courses_created_id', 'courses',
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_courses_created_id', table_name='courses', postgresql_concurrently=True)
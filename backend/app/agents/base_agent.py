@@ -1,5 +1,7 @@
 # backend/app/agents/base_agent.py
 
+from app.core.metrics import AGENT_RUN_SECONDS, timed
+
 class BaseAgent:
     """
     Classe base para qualquer agente de IA.
@@ -15,5 +17,6 @@ class BaseAgent:
         """
         Envia um prompt para o service (Gemini, Llama, etc.)
         """
-        response = await self.service.generate(prompt)
+        with timed(AGENT_RUN_SECONDS, "agent_run", agent=type(self).__name__):
+            response = await self.service.generate(prompt)
         return response
@@ -61,4 +61,5 @@ class ContextAgent(BaseAgent):
             return await self.run(prompt)
         except Exception as e:
                 print(f"⚠️ Erro ao gerar Prompt: {e}")
+                raise
                 
\ No newline at end of file
@@ -1,5 +1,7 @@
 # backend/app/agents/orchestrator.py
 
+import os
+
 from .context_agent import ContextAgent
 from .specialist_agent import SpecialistAgent
 from .reviewer_agent import ReviewerAgent
@@ -10,6 +12,10 @@ from app.models.models import Course, Module, Progress, Lesson
 
 from app.services.gemini_service import GeminiService 
 from app.services.groq_service import GroqService
+from app.services.resilience import deadline_scope
+
+# Prazo total de um fluxo de geração (todas as chamadas + retries)
+GENERATION_DEADLINE_SECONDS = float(os.getenv("GENERATION_DEADLINE_SECONDS", "300"))
 
 
 class Orchestrator:
@@ -17,13 +23,16 @@ class Orchestrator:
     Coordena o fluxo completo de geração
     """
 
-    def __init__(self, model: str = "gemini"):
-        if model == "gemini":
-            service = GeminiService()
-        elif model == "llama":
-            service = GroqService()
-        else:
-            service = GeminiService()
+    def __init__(self, model: str = "gemini", service=None):
+        # O registry passa o service compartilhado; sem ele, cria um novo
+        if service is None:
+            if model == "llama":
+                service = GroqService()
+            else:
+                service = GeminiService()
+
+        self.provider = model
+        self.service = service
 
         self.context =  ContextAgent(service)
         self.specialist = SpecialistAgent(service)
@@ -39,11 +48,12 @@ class Orchestrator:
         """
         Gera APENAS a estrutura (rápido)
         """
-        return await self.specialist.generate_course_structure(
-            topic=topic,
-            level=level,
-            goal=goal
-        )
+        with deadline_scope(GENERATION_DEADLINE_SECONDS):
+            return await self.specialist.generate_course_structure(
+                topic=topic,
+                level=level,
+                goal=goal
+            )
     
     async def generate_module_structure(
         self, 
@@ -54,17 +64,40 @@ class Orchestrator:
         """
         Gera APENAS a estrutura (rápido)
         """
+        with deadline_scope(GENERATION_DEADLINE_SECONDS):
+            text_prompt = await self.context.json_text(
+                course=course,
+                module=module,
+                lessons=lessons
+            )
+
+            #return text_prompt
+
+            #print(f"Prompt do context = {text_prompt}")
+        
+            return await self.specialist.generate_lesson_content(
+                course=course,
+                prompt = text_prompt
+            )
+
+    async def stream_module_structure(
+        self,
+        course: str,
+        module: str,
+        lessons: str
+    ):
+        """
+        Igual a generate_module_structure, mas devolve o conteúdo da aula
+        em pedaços (async generator) assim que o provider gera.
+        """
         text_prompt = await self.context.json_text(
             course=course,
             module=module,
             lessons=lessons
         )
 
-        #return text_prompt
-
-        #print(f"Prompt do context = {text_prompt}")
-    
-        return await self.specialist.generate_lesson_content(
+        async for chunk in self.specialist.stream_lesson_content(
             course=course,
-            prompt = text_prompt
-        )
\ No newline at end of file
+            prompt=text_prompt
+        ):
+            yield chunk
@@ -0,0 +1,147 @@
+# backend/app/agents/registry.py
+"""
+Registro (singleton) de services de IA e Orchestrators
+
+Os services (GeminiService, GroqService) e os agentes são criados uma
+única vez por processo e reaproveitados por todas as requisições, via
+dependências do FastAPI. Evita re-executar genai.configure /
+GenerativeModel(...) e recriar os quatro agentes a cada chamada.
+"""
+
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.services.gemini_service import GeminiService
+from app.services.groq_service import GroqService
+from app.services.resilience import ResilientService
+from app.services.fake_service import FakeLLMService
+from .orchestrator import Orchestrator
+
+# provider -> (classe do service, modelo padrão)
+PROVIDERS = {
+    "gemini": (GeminiService, "gemini-2.5-flash"),
+    "llama": (GroqService, "llama-3.3-70b-versatile"),
+}
+
+# Provider local falso, só para benchmarks (nunca entra como fallback em produção)
+if os.getenv("FAKE_LLM_ENABLED", "false").lower() == "true":
+    PROVIDERS["fake"] = (FakeLLMService, "fake-llm")
+
+DEFAULT_PROVIDER = os.getenv("LLM_DEFAULT_PROVIDER", "gemini")
+if DEFAULT_PROVIDER not in PROVIDERS:
+    DEFAULT_PROVIDER = "gemini"
+
+# Se o provider principal falhar, tenta os outros configurados
+LLM_FAILOVER = os.getenv("LLM_FAILOVER", "true").lower() == "true"
+
+
+class AgentRegistry:
+    """
+    Guarda services por (provider, modelo) e Orchestrators por provider
+    """
+
+    def __init__(self):
+        self._services: Dict[Tuple[str, str], object] = {}
+        self._orchestrators: Dict[Tuple[str, str], Orchestrator] = {}
+        self._lock = threading.Lock()
+
+    def _resolve(self, provider: str, model_name: Optional[str]) -> Tuple[str, str]:
+        if provider not in PROVIDERS:
+            provider = DEFAULT_PROVIDER
+        return provider, model_name or PROVIDERS[provider][1]
+
+    def service(self, provider: str = DEFAULT_PROVIDER, model_name: Optional[str] = None):
+        """
+        Retorna o service do provider/modelo, criando na primeira vez
+        """
+        key = self._resolve(provider, model_name)
+        service = self._services.get(key)
+        if service is None:
+            with self._lock:
+                service = self._services.get(key)
+                if service is None:
+                    service_cls = PROVIDERS[key[0]][0]
+                    service = service_cls(key[1])
+                    self._services[key] = service
+        return service
+
+    def orchestrator(self, provider: str = DEFAULT_PROVIDER, model_name: Optional[str] = None) -> Orchestrator:
+        """
+        Retorna o Orchestrator (com seus agentes) do provider/modelo
+        """
+        key = self._resolve(provider, model_name)
+        orchestrator = self._orchestrators.get(key)
+        if orchestrator is None:
+            service = ResilientService([self.service(*key), *self._fallbacks(key[0])])
+            with self._lock:
+                orchestrator = self._orchestrators.get(key)
+                if orchestrator is None:
+                    orchestrator = Orchestrator(model=key[0], service=service)
+                    self._orchestrators[key] = orchestrator
+        return orchestrator
+
+    def _fallbacks(self, provider: str) -> list:
+        """
+        Services dos outros providers (os sem chave de API são ignorados).
+        O "fake" só entra se for o provider padrão: respostas falsas não
+        podem substituir um provider real que falhou.
+        """
+        if not LLM_FAILOVER:
+            return []
+
+        fallbacks = []
+        for other in PROVIDERS:
+            if other == provider:
+                continue
+            if other == "fake" and DEFAULT_PROVIDER != "fake":
+                continue
+            try:
+                fallbacks.append(self.service(other))
+            except ValueError:
+                pass
+        return fallbacks
+
+    def warm_up(self):
+        """
+        Cria os services padrão no startup. Provider sem chave de API
+        não derruba o app: só fica indisponível até ser configurado.
+        """
+        for provider in PROVIDERS:
+            try:
+                self.orchestrator(provider)
+            except Exception as e:
+                print(f"⚠️ Provider '{provider}' indisponível: {e}")
+
+
+registry = AgentRegistry()
+
+
+# ============================================
+# DEPENDÊNCIAS FASTAPI
+# ============================================
+def _unavailable(e: Exception) -> HTTPException:
+    return HTTPException(status_code=503, detail=f"Provider de IA indisponível: {str(e)}")
+
+
+def get_orchestrator() -> Orchestrator:
+    try:
+        return registry.orchestrator(DEFAULT_PROVIDER)
+    except ValueError as e:
+        raise _unavailable(e)
+
+
+def get_gemini_service() -> GeminiService:
+    try:
+        return registry.service("gemini")
+    except ValueError as e:
+        raise _unavailable(e)
+
+
+def get_groq_service() -> GroqService:
+    try:
+        return registry.service("llama")
+    except ValueError as e:
+        raise _unavailable(e)
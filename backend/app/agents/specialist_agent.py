@@ -1,8 +1,7 @@
 # backend/app/agents/specialist_agent.py
 
 from .base_agent import BaseAgent
-import json
-import re
+from app.services.json_extract import JSONExtractionError, extract_json
 
 class SpecialistAgent(BaseAgent):
     """
@@ -13,7 +12,6 @@ class SpecialistAgent(BaseAgent):
         """
         Gera estrutura JSON do curso
         """
-        print("entrei no generate!!!")
         prompt = f"""
                   Crie uma estrutura completa de curso para iniciantes.
 
@@ -61,15 +59,55 @@ class SpecialistAgent(BaseAgent):
         if hasattr(self.service, 'generate_json'):
             try:
                 return await self.service.generate_json(prompt)
-            except Exception as e:
+            except JSONExtractionError as e:
+                # Só gera de novo quando a resposta não tinha conserto
                 print(f"⚠️ Erro ao gerar JSON: {e}")
-                # Fallback: tenta extrair JSON do texto
                 text = await self.run(prompt)
-                return self._extract_json(text)
+                return extract_json(text)
         else:
             # Fallback para services sem generate_json
             text = await self.run(prompt)
-            return self._extract_json(text)
+            return extract_json(text)
+
+    def lesson_prompt(self, prompt: str) -> str:
+      """
+      Monta o prompt final da aula (Markdown + tempo de leitura no fim)
+      """
+      return f"""
+      You are the SpecialistAgent.
+
+      Your task is to generate the complete lesson content based on the instructions below.
+
+      ---------------------
+      {prompt}
+      ---------------------
+
+      ⚠️ OUTPUT RULES — FOLLOW THEM STRICTLY:
+
+      1. Return ONLY a Markdown lesson (no JSON, no code blocks, no backticks).
+      2. The lesson MUST be written entirely in Brazilian Portuguese.
+      3. The lesson MUST be complete, detailed, well-structured, and written for humans — not summarized.
+      4. The Markdown must include:
+        - Título da lição
+        - Seções e subseções organizadas
+        - Exemplos, explicações e conclusões
+      5. At the very end of the output, add this line:
+        estimated_read_time_minutes: X
+        Where X is the estimated reading time based on text length 
+        (approximately 200 words = 1 minute).
+      6. Do NOT include any other metadata, JSON, keys, wrappers or comments.
+      7. Do NOT wrap anything in ``` or any Markdown code delimiters.
+
+      Your output must be ONLY the Markdown lesson followed by the time estimate.
+      """
+
+    async def stream_lesson_content(self, prompt: str, course: str):
+      """
+      Igual a generate_lesson_content, mas devolve o Markdown em pedaços
+      à medida que o provider gera (async generator).
+      """
+      async for chunk in self.service.generate_stream(self.lesson_prompt(prompt)):
+          yield chunk
 
     async def generate_lesson_content(self, prompt: str, course: str) -> dict:
       """
@@ -103,44 +141,12 @@ class SpecialistAgent(BaseAgent):
         8. Ensure the JSON produced is valid, properly escaped, and without Markdown fences.
         """
       
-      final_prompt = f"""
-      You are the SpecialistAgent.
-
-      Your task is to generate the complete lesson content based on the instructions below.
-
-      ---------------------
-      {prompt}
-      ---------------------
-
-      ⚠️ OUTPUT RULES — FOLLOW THEM STRICTLY:
-
-      1. Return ONLY a Markdown lesson (no JSON, no code blocks, no backticks).
-      2. The lesson MUST be written entirely in Brazilian Portuguese.
-      3. The lesson MUST be complete, detailed, well-structured, and written for humans — not summarized.
-      4. The Markdown must include:
-        - Título da lição
-        - Seções e subseções organizadas
-        - Exemplos, explicações e conclusões
-      5. At the very end of the output, add this line:
-        estimated_read_time_minutes: X
-        Where X is the estimated reading time based on text length 
-        (approximately 200 words = 1 minute).
-      6. Do NOT include any other metadata, JSON, keys, wrappers or comments.
-      7. Do NOT wrap anything in ``` or any Markdown code delimiters.
-
-      Your output must be ONLY the Markdown lesson followed by the time estimate.
-      """
+      final_prompt = self.lesson_prompt(prompt)
 
       
 
 
 
-      if hasattr(self.service, 'generate_json'):
-          try:
-              return await self.run(final_prompt)
-          except Exception:
-              text = await self.run(final_prompt)
-              return self._extract_json(text)
-      text = await self.run(final_prompt)
-      return self._extract_json(text)
+      # Retry/backoff/failover ficam na camada de resiliência do service
+      return await self.run(final_prompt)
   
\ No newline at end of file
@@ -1,14 +1,93 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from jose import jwt, JWTError
-from core.security import SECRET_KEY, ALGORITHM
-from db.session import get_db
-from db.models import User
+from app.core.security import SECRET_KEY, ALGORITHM
+from app.database import get_db
+from app.models.models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+# ============================================
+# CACHE DO USUÁRIO AUTENTICADO (via .env)
+# ============================================
+# Evita uma ida ao banco por requisição autenticada: o principal fica em
+# memória por alguns segundos e é invalidado quando o usuário muda.
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Usuário autenticado, só com o necessário para autorização
+    (sem password_hash e sem os JSONB)
+    """
+    id: int
+    email: str
+    level: Optional[int] = None
+
+
+class PrincipalCache:
+    """
+    LRU com TTL: user_id -> (Principal, expira_em)
+    """
+
+    def __init__(self, ttl: float = AUTH_CACHE_TTL_SECONDS, max_entries: int = AUTH_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        # Dependências sync rodam no threadpool do FastAPI
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            principal, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def set(self, principal: Principal):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (principal, time.monotonic() + self.ttl)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+def invalidate_principal(user_id: int):
+    """
+    Chamar sempre que o usuário for alterado ou removido
+    """
+    principal_cache.invalidate(int(user_id))
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
@@ -16,12 +95,20 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         if user_id is None:
             raise HTTPException(status_code=401, detail="Token inválido.")
 
-        user = db.query(User).filter(User.id == user_id).first()
+        user_id = int(user_id)
+    except (JWTError, ValueError):
+        raise HTTPException(status_code=401, detail="Token inválido ou expirado.")
+
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
 
-        if user is None:
-            raise HTTPException(status_code=404, detail="Usuário não encontrado.")
+    # Só as colunas do principal (a sessão só conecta nesse caso)
+    row = db.query(User.id, User.email, User.level).filter(User.id == user_id).first()
 
-        return user
+    if row is None:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado.")
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Token inválido ou expirado.")
+    principal = Principal(id=row.id, email=row.email, level=row.level)
+    principal_cache.set(principal)
+    return principal
@@ -0,0 +1,96 @@
+# backend/app/core/executor.py
+"""
+Pool de threads limitado para trabalho bloqueante (SDK do Gemini, bcrypt)
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+
+class ExecutorBusy(Exception):
+    """
+    Fila do pool cheia (max_pending atingido)
+    """
+
+
+class BoundedExecutor:
+    """
+    Pool de threads limitado com métricas de fila.
+
+    - in_flight: chamadas submetidas e ainda não concluídas
+    - running: chamadas executando numa thread neste momento
+    - queued: chamadas aguardando uma thread livre (in_flight - running)
+    - completed / failed: chamadas concluídas com sucesso / com exceção
+    - rejected: chamadas recusadas com a fila cheia (só com max_pending)
+    """
+
+    # Exceção levantada quando a fila está cheia (subclasses trocam)
+    busy_error = ExecutorBusy
+
+    def __init__(self, name: str, max_workers: int, max_pending: Optional[int] = None):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=name
+        )
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _call(self, fn, args, kwargs):
+        with self._lock:
+            self.running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Executa fn(*args, **kwargs) no pool sem bloquear o event loop
+        """
+        with self._lock:
+            if self.max_pending is not None and self.in_flight >= self.max_pending:
+                self.rejected += 1
+                raise self.busy_error(f"Pool {self.name} cheio ({self.in_flight} pendentes)")
+            self.in_flight += 1
+
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._pool,
+                self._call, fn, args, kwargs
+            )
+            with self._lock:
+                self.completed += 1
+            return result
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "in_flight": self.in_flight,
+                "running": self.running,
+                "queued": max(self.in_flight - self.running, 0),
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,264 @@
+# backend/app/core/metrics.py
+"""
+Métricas (formato Prometheus) e logs estruturados
+
+- Contadores e histogramas em memória, expostos em GET /metrics no formato
+  texto do Prometheus (sem dependência externa)
+- Cada requisição HTTP ganha um request id (header X-Request-ID ou um novo),
+  propagado por contextvar para todos os logs feitos durante ela
+- log_event() escreve uma linha JSON por evento (logger "nia")
+
+Principais séries:
+  nia_http_request_seconds{method,route,status}
+  nia_llm_call_seconds{provider,model,cache,outcome}
+  nia_llm_tokens_total{provider,model,kind}      kind = prompt | completion
+  nia_llm_retries_total{provider} / nia_llm_failovers_total{provider}
+  nia_agent_run_seconds{agent,outcome}
+  nia_phase_seconds{phase,outcome}               etapas das rotas de geração
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional, Sequence, Tuple
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# Segundos: de cache hit (ms) até geração de curso inteiro (minutos)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+# ============================================
+# REQUEST ID
+# ============================================
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+# ============================================
+# LOG ESTRUTURADO
+# ============================================
+logger = logging.getLogger("nia")
+if not logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+
+
+def log_event(event: str, level: int = logging.INFO, **fields):
+    """
+    Uma linha JSON por evento, com timestamp e request id
+    """
+    if not logger.isEnabledFor(level):
+        return
+    record = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "event": event,
+        "request_id": request_id_var.get(),
+        **fields,
+    }
+    logger.log(level, json.dumps(record, ensure_ascii=False, default=str))
+
+
+# ============================================
+# MÉTRICAS
+# ============================================
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, key)} {value}")
+        return "\n".join(lines)
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # chave -> [contagem por bucket..., soma, total]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    le = _format_labels(self.labels, key, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{le} {count}")
+                inf = _format_labels(self.labels, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{inf} {series[-1]}")
+                labels = _format_labels(self.labels, key)
+                lines.append(f"{self.name}_sum{labels} {series[-2]}")
+                lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return "\n".join(lines)
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "nia_http_request_seconds", "Duração das requisições HTTP", ("method", "route", "status")
+)
+LLM_CALL_SECONDS = Histogram(
+    "nia_llm_call_seconds", "Duração das chamadas aos services de IA", ("provider", "model", "cache", "outcome")
+)
+LLM_TOKENS = Counter(
+    "nia_llm_tokens_total", "Tokens enviados/recebidos dos providers", ("provider", "model", "kind")
+)
+LLM_RETRIES = Counter(
+    "nia_llm_retries_total", "Novas tentativas após erro retryable", ("provider",)
+)
+LLM_FAILOVERS = Counter(
+    "nia_llm_failovers_total", "Trocas de provider por falha", ("provider",)
+)
+AGENT_RUN_SECONDS = Histogram(
+    "nia_agent_run_seconds", "Duração de BaseAgent.run por agente", ("agent", "outcome")
+)
+PHASE_SECONDS = Histogram(
+    "nia_phase_seconds", "Duração das etapas das rotas de geração", ("phase", "outcome")
+)
+
+REGISTRY = (
+    HTTP_REQUEST_SECONDS, LLM_CALL_SECONDS, LLM_TOKENS, LLM_RETRIES,
+    LLM_FAILOVERS, AGENT_RUN_SECONDS, PHASE_SECONDS,
+)
+
+
+def render_metrics() -> str:
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+# ============================================
+# INSTRUMENTAÇÃO
+# ============================================
+class LLMCall:
+    """
+    Dados de uma chamada ao service, preenchidos durante a chamada
+    """
+
+    def __init__(self, provider: str, model: str):
+        self.provider = provider
+        self.model = model
+        self.cache = "miss"
+        self.prompt_tokens: Optional[int] = None
+        self.completion_tokens: Optional[int] = None
+
+    def tokens(self, prompt: Optional[int], completion: Optional[int]):
+        self.prompt_tokens = prompt
+        self.completion_tokens = completion
+
+
+@contextmanager
+def llm_call(provider: str, model: str):
+    """
+    Mede uma chamada generate() de um service:
+
+        with llm_call("groq", self.model) as call:
+            ...
+            call.cache = "hit"
+            call.tokens(prompt_tokens, completion_tokens)
+    """
+    call = LLMCall(provider, model)
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield call
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        LLM_CALL_SECONDS.observe(seconds, provider=provider, model=model, cache=call.cache, outcome=outcome)
+        if call.prompt_tokens:
+            LLM_TOKENS.inc(call.prompt_tokens, provider=provider, model=model, kind="prompt")
+        if call.completion_tokens:
+            LLM_TOKENS.inc(call.completion_tokens, provider=provider, model=model, kind="completion")
+        log_event(
+            "llm_call",
+            provider=provider,
+            model=model,
+            cache=call.cache,
+            outcome=outcome,
+            seconds=round(seconds, 4),
+            prompt_tokens=call.prompt_tokens,
+            completion_tokens=call.completion_tokens,
+        )
+
+
+@contextmanager
+def timed(histogram: Histogram, event: str, **labels):
+    """
+    Mede o bloco num histograma (com outcome) e registra um evento
+    """
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        histogram.observe(seconds, outcome=outcome, **labels)
+        log_event(event, outcome=outcome, seconds=round(seconds, 4), **labels)
+
+
+def phase(name: str):
+    """
+    Etapa de uma rota de geração: with phase("structure.llm"): ...
+    """
+    return timed(PHASE_SECONDS, "phase", phase=name)
@@ -0,0 +1,145 @@
+# backend/app/core/pagination.py
+"""
+Paginação por cursor (keyset) para os endpoints de listagem
+
+Em vez de OFFSET (que lê e descarta todas as linhas anteriores), o cursor
+guarda os valores da ordenação da última linha da página; a próxima
+página filtra "depois desses valores" e usa o índice direto.
+
+Resposta: {"items": [...], "next_cursor": "..." | None, "limit": N}
+"""
+
+import base64
+import json
+import os
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Select, and_, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", "20"))
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", "100"))
+
+# (coluna, descendente?)
+OrderBy = Sequence[Tuple[object, bool]]
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError
+        return [_decode_value(v) for v in values]
+    except ValueError:
+        raise HTTPException(400, "Cursor inválido")
+
+
+def _after(order_by: OrderBy, values: list):
+    """
+    Condição "linha vem depois do cursor" na ordenação dada
+    """
+    directions = {desc for _, desc in order_by}
+    columns = [column for column, _ in order_by]
+
+    # Mesma direção em todas as colunas: comparação de tupla (usa o índice)
+    if len(directions) == 1:
+        if directions.pop():
+            return tuple_(*columns) < tuple_(*values)
+        return tuple_(*columns) > tuple_(*values)
+
+    # Direções mistas: (a > va) OR (a = va AND b > vb) OR ...
+    clauses = []
+    for i, (column, desc) in enumerate(order_by):
+        equal = [c == v for c, v in zip(columns[:i], values[:i])]
+        step = column < values[i] if desc else column > values[i]
+        clauses.append(and_(*equal, step))
+    return or_(*clauses)
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    if not limit:
+        return PAGE_SIZE_DEFAULT
+    return max(1, min(limit, PAGE_SIZE_MAX))
+
+
+def _prepare(query, order_by: OrderBy, cursor: Optional[str], limit: Optional[int]):
+    limit = clamp_limit(limit)
+
+    if cursor:
+        values = decode_cursor(cursor, len(order_by))
+        query = query.filter(_after(order_by, values))
+
+    query = query.order_by(*[
+        column.desc() if desc else column.asc()
+        for column, desc in order_by
+    ])
+
+    # Busca uma linha a mais para saber se existe próxima página
+    return query.limit(limit + 1), limit
+
+
+def _build_page(rows: list, order_by: OrderBy, limit: int) -> dict:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column, _ in order_by])
+
+    return {
+        "items": [dict(row._mapping) for row in rows],
+        "next_cursor": next_cursor,
+        "limit": limit,
+    }
+
+
+def keyset_page(
+    query: Query,
+    order_by: OrderBy,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> dict:
+    """
+    Aplica ordenação + cursor + limite na query e monta a página.
+
+    As colunas de order_by precisam estar na projeção da query.
+    """
+    query, limit = _prepare(query, order_by, cursor, limit)
+    return _build_page(query.all(), order_by, limit)
+
+
+async def keyset_page_async(
+    db: AsyncSession,
+    stmt: Select,
+    order_by: OrderBy,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> dict:
+    """
+    Igual a keyset_page, para select() executado numa AsyncSession
+    """
+    stmt, limit = _prepare(stmt, order_by, cursor, limit)
+    result = await db.execute(stmt)
+    return _build_page(result.all(), order_by, limit)
@@ -1,12 +1,35 @@
+import os
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
 from jose import jwt
 from passlib.context import CryptContext
+from app.core.executor import BoundedExecutor, ExecutorBusy
 
 SECRET_KEY = "sua_chave_super_secreta_aqui"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# ============================================
+# BCRYPT (via .env)
+# ============================================
+# Custo do bcrypt: cada +1 dobra o tempo de hash. Hashes com custo
+# diferente do atual são refeitos no próximo login (verify_and_update).
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Hash/verify levam ~100-300 ms de CPU. O bcrypt libera o GIL, então um
+# pool de threads do tamanho dos núcleos escala com a máquina sem travar
+# o event loop nem o threadpool das rotas.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "256"))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    # min = max = custo atual: qualquer outro custo "precisa de update"
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
@@ -23,3 +46,52 @@ def verify_password(plain_password, hashed_password):
 
 def hash_password(password: str):
     return pwd_context.hash(password)
+
+
+# ============================================
+# POOL DE HASHING
+# ============================================
+class PasswordPoolBusy(ExecutorBusy):
+    """
+    Fila do pool cheia: melhor responder 503 do que acumular logins
+    """
+
+
+class PasswordHasherPool(BoundedExecutor):
+    """
+    Pool de threads limitado para bcrypt (mesmo pool/métricas do Gemini,
+    com limite de fila)
+    """
+
+    busy_error = PasswordPoolBusy
+
+    def __init__(self, max_workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING):
+        super().__init__("bcrypt", max_workers, max_pending)
+        self.rehashed = 0
+
+    async def hash(self, password: str) -> str:
+        return await self.run(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Verifica a senha e, se o hash usa um custo antigo, devolve o novo hash
+
+        Returns:
+            tuple: (senha_ok, novo_hash ou None)
+        """
+        if not hashed:
+            return False, None
+        valid, new_hash = await self.run(pwd_context.verify_and_update, password, hashed)
+        if valid and new_hash:
+            with self._lock:
+                self.rehashed += 1
+        return valid, new_hash
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        with self._lock:
+            stats.update(bcrypt_rounds=BCRYPT_ROUNDS, rehashed=self.rehashed)
+        return stats
+
+
+password_hasher = PasswordHasherPool()
@@ -0,0 +1,84 @@
+# backend/app/core/startup.py
+"""
+Relatório de tempo de boot do worker
+
+Mede o import de cada módulo principal do app e cada etapa do startup,
+para acompanhar a meta de subir um worker em menos de STARTUP_BUDGET_SECONDS.
+
+O import de um módulo inclui tudo que ele importa pela primeira vez:
+quem aparece no topo da lista é quem puxou a dependência pesada.
+(Para o detalhe completo: python -X importtime -m uvicorn app.main:app)
+"""
+
+import importlib
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "1.0"))
+STARTUP_REPORT = os.getenv("STARTUP_REPORT", "true").lower() == "true"
+
+
+class BootReport:
+    def __init__(self):
+        # Início = primeiro import deste módulo (logo no topo do app.main)
+        self.started_at = time.perf_counter()
+        self.imports: List[Tuple[str, float]] = []
+        self.phases: List[Tuple[str, float]] = []
+        self.ready_at = None
+
+    @contextmanager
+    def measure_import(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.imports.append((name, time.perf_counter() - start))
+
+    def import_module(self, name: str):
+        with self.measure_import(name):
+            return importlib.import_module(name)
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def mark_ready(self):
+        self.ready_at = time.perf_counter()
+        if STARTUP_REPORT:
+            self.print_report()
+
+    def boot_seconds(self) -> float:
+        end = self.ready_at if self.ready_at is not None else time.perf_counter()
+        return end - self.started_at
+
+    def report(self) -> Dict:
+        return {
+            "boot_seconds": round(self.boot_seconds(), 4),
+            "budget_seconds": STARTUP_BUDGET_SECONDS,
+            "imports": [
+                {"module": name, "seconds": round(seconds, 4)}
+                for name, seconds in sorted(self.imports, key=lambda item: -item[1])
+            ],
+            "phases": [
+                {"phase": name, "seconds": round(seconds, 4)}
+                for name, seconds in self.phases
+            ],
+        }
+
+    def print_report(self, top: int = 8):
+        total = self.boot_seconds()
+        icon = "✅" if total <= STARTUP_BUDGET_SECONDS else "⚠️"
+        print(f"{icon} Worker pronto em {total:.3f}s (meta: {STARTUP_BUDGET_SECONDS:.1f}s)")
+        for name, seconds in sorted(self.imports, key=lambda item: -item[1])[:top]:
+            print(f"   import {name:<32} {seconds * 1000:8.1f} ms")
+        for name, seconds in self.phases:
+            print(f"   startup {name:<31} {seconds * 1000:8.1f} ms")
+
+
+boot = BootReport()
@@ -1,11 +1,17 @@
 # backend/app/database.py
 """
 Configuração da conexão com o banco de dados PostgreSQL
+
+Nada conecta nem é criado no import: os engines nascem no startup do app
+(init_engines) ou no primeiro uso (get_engine / get_db), para o boot dos
+workers ficar rápido.
 """
 
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 import os
+import threading
 from dotenv import load_dotenv
 
 # ============================================
@@ -13,63 +19,142 @@ from dotenv import load_dotenv
 # ============================================
 load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
 
-if not DATABASE_URL:
-    raise ValueError("❌ DATABASE_URL não encontrada no .env!")
+def get_database_url() -> str:
+    url = os.getenv("DATABASE_URL")
+    if not url:
+        raise ValueError("❌ DATABASE_URL não encontrada no .env!")
+    return url
 
-print(f"🔌 Conectando ao banco: {DATABASE_URL.split('@')[1]}")
 
 # ============================================
-# 2. ENGINE
+# 2. ENGINE ASSÍNCRONO (asyncpg) - URL
 # ============================================
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,  
-    echo=False,
-    pool_size=10,
-    max_overflow=20
-)
+# Usado pelas rotas async (geração com IA, progresso): as idas ao banco
+# não travam o event loop enquanto outras requisições esperam o LLM.
+def to_async_url(url: str) -> str:
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
 
-print("✅ Engine criado com sucesso!")
 
 # ============================================
-# 3. SESSIONMAKER
+# 3. SESSIONMAKER (o bind é feito em init_engines)
 # ============================================
 SessionLocal = sessionmaker(
     autocommit=False,
+    autoflush=False
+)
+
+# expire_on_commit=False: em async não existe lazy load depois do commit
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
     autoflush=False,
-    bind=engine
+    expire_on_commit=False
 )
 
 # ============================================
-# 4. BASE
+# 4. ENGINES (criados sob demanda)
+# ============================================
+_engine = None
+_async_engine = None
+_lock = threading.Lock()
+
+
+def init_engines():
+    """
+    Cria os engines sync e async e liga os sessionmakers a eles.
+    Idempotente; não abre conexão (o pool conecta na primeira query).
+    """
+    global _engine, _async_engine
+    if _engine is not None:
+        return
+
+    with _lock:
+        if _engine is not None:
+            return
+
+        database_url = get_database_url()
+        print(f"🔌 Conectando ao banco: {database_url.split('@')[-1]}")
+
+        engine = create_engine(
+            database_url,
+            pool_pre_ping=True,
+            echo=False,
+            pool_size=10,
+            max_overflow=20
+        )
+        async_engine = create_async_engine(
+            os.getenv("ASYNC_DATABASE_URL") or to_async_url(database_url),
+            pool_pre_ping=True,
+            echo=False,
+            pool_size=10,
+            max_overflow=20
+        )
+
+        SessionLocal.configure(bind=engine)
+        AsyncSessionLocal.configure(bind=async_engine)
+        _async_engine = async_engine
+        _engine = engine
+
+        print("✅ Engine criado com sucesso!")
+
+
+def get_engine():
+    init_engines()
+    return _engine
+
+
+def get_async_engine():
+    init_engines()
+    return _async_engine
+
+
+async def dispose_engines():
+    """
+    Fecha os pools (shutdown do app)
+    """
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+
+# ============================================
+# 5. BASE
 # ============================================
 Base = declarative_base()
 
 # ============================================
-# 5. DEPENDENCY FASTAPI
+# 6. DEPENDENCY FASTAPI
 # ============================================
 def get_db():
+    init_engines()
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+async def get_async_db():
+    init_engines()
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # ============================================
-# 6. CRIAR TABELAS (somente MVP)
+# 7. CRIAR TABELAS (somente testes locais; produção usa Alembic)
 # ============================================
 def create_tables():
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
     print("✅ Tabelas criadas com sucesso!")
 
 # ============================================
-# 7. TESTE DE CONEXÃO
+# 8. TESTE DE CONEXÃO
 # ============================================
 def test_connection():
     try:
-        with engine.connect() as connection:
+        with get_engine().connect() as connection:
             connection.execute(text("SELECT 1"))
             print("✅ Conexão com banco OK!")
             return True
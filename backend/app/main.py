@@ -1,9 +1,44 @@
-from fastapi import FastAPI
-from app.database import engine
-from app.models import models
-from app.routers import users, courses, modules, progress
-from app.routers import auth
-from app.routers import test_ai
+import asyncio
+import os
+import time
+
+from app.core.startup import boot
+
+with boot.measure_import("fastapi"):
+    from fastapi import FastAPI, Request
+    from fastapi.responses import PlainTextResponse
+with boot.measure_import("app.core.metrics"):
+    from app.core.metrics import (
+        HTTP_REQUEST_SECONDS,
+        log_event,
+        new_request_id,
+        render_metrics,
+        request_id_var
+    )
+with boot.measure_import("app.database"):
+    from app.database import init_engines, dispose_engines
+with boot.measure_import("app.models"):
+    from app.models import models  # noqa: F401  (registra os models no SQLAlchemy)
+with boot.measure_import("app.services"):
+    from app.services.gemini_service import get_executor
+    from app.services.http_client import init_http_client, close_http_client
+    from app.services.job_queue import job_queue
+    from app.services.course_index import course_index
+    from app.services.course_stats import course_stats
+    from app.services.leaderboard import leaderboard
+    from app.services.progress_events import progress_events
+with boot.measure_import("app.agents.registry"):
+    from app.agents.registry import registry
+with boot.measure_import("app.core.security"):
+    from app.core.security import password_hasher
+
+ROUTERS = ("auth", "users", "courses", "modules", "progress", "test_ai", "jobs", "leaderboard")
+
+# Criação dos services de IA (e import dos SDKs) no startup:
+#   background (padrão): numa thread, sem segurar o boot do worker
+#   startup: antes de aceitar requisições
+#   off: só na primeira requisição que usar o provider
+LLM_WARM_UP = os.getenv("LLM_WARM_UP", "background").lower()
 
 def create_app():
     app = FastAPI(
@@ -12,21 +47,149 @@ def create_app():
         version="1.0.0",
     )
 
-    # Importante para o SQLAlchemy registrar models
-    models.Base.metadata.create_all(bind=engine)
+    # O esquema é criado/atualizado pelas migrations (alembic upgrade head),
+    # rodadas uma vez por deploy: o startup dos workers não faz DDL
+
+    @app.middleware("http")
+    async def request_metrics(request: Request, call_next):
+        """
+        Request id (X-Request-ID) + duração de cada requisição
+        """
+        request_id = request.headers.get("x-request-id") or new_request_id()
+        token = request_id_var.set(request_id)
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            response.headers["X-Request-ID"] = request_id
+            return response
+        finally:
+            seconds = time.perf_counter() - start
+            # Template da rota (/courses/{course_id}), não a URL: evita uma série por id
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.observe(seconds, method=request.method, route=route, status=status)
+            log_event(
+                "http_request",
+                method=request.method,
+                route=route,
+                path=request.url.path,
+                status=status,
+                seconds=round(seconds, 4)
+            )
+            request_id_var.reset(token)
 
     # Registrar rotas
-    app.include_router(auth.router)
-    app.include_router(users.router)
-    app.include_router(courses.router)
-    app.include_router(modules.router)
-    app.include_router(progress.router)
-    app.include_router(test_ai.router)
+    for name in ROUTERS:
+        module = boot.import_module(f"app.routers.{name}")
+        app.include_router(module.router)
+
+    @app.on_event("startup")
+    def startup_database():
+        with boot.phase("database"):
+            init_engines()
+
+    @app.on_event("startup")
+    def startup_http_client():
+        with boot.phase("http_client"):
+            init_http_client()
+
+    @app.on_event("startup")
+    async def startup_agent_registry():
+        with boot.phase("agent_registry"):
+            if LLM_WARM_UP == "startup":
+                registry.warm_up()
+            elif LLM_WARM_UP == "background":
+                asyncio.get_running_loop().run_in_executor(None, registry.warm_up)
+
+    @app.on_event("startup")
+    async def startup_job_queue():
+        with boot.phase("job_queue"):
+            await job_queue.start()
+
+    @app.on_event("startup")
+    async def startup_course_index():
+        # Carga em background: até terminar, a detecção de duplicatas fica desligada
+        with boot.phase("course_index"):
+            await course_index.start()
+
+    @app.on_event("startup")
+    async def startup_course_stats():
+        with boot.phase("course_stats"):
+            await course_stats.start()
+
+    @app.on_event("startup")
+    async def startup_leaderboard():
+        # Carga em background: até terminar, /leaderboard responde 503
+        with boot.phase("leaderboard"):
+            await leaderboard.start()
+
+    @app.on_event("startup")
+    async def startup_progress_events():
+        with boot.phase("progress_events"):
+            await progress_events.start()
+
+    @app.on_event("startup")
+    def startup_report():
+        boot.mark_ready()
+
+    @app.on_event("shutdown")
+    async def shutdown_job_queue():
+        await job_queue.stop()
+
+    @app.on_event("shutdown")
+    async def shutdown_course_index():
+        await course_index.stop()
+
+    @app.on_event("shutdown")
+    async def shutdown_course_stats():
+        # Grava os deltas pendentes antes de fechar o pool do banco
+        await course_stats.stop()
+
+    @app.on_event("shutdown")
+    async def shutdown_leaderboard():
+        # Último snapshot dos rankings alterados
+        await leaderboard.stop()
+
+    @app.on_event("shutdown")
+    async def shutdown_progress_events():
+        # Grava o buffer antes de fechar o pool do banco
+        await progress_events.stop()
+
+    @app.on_event("shutdown")
+    async def shutdown_http_client():
+        await close_http_client()
+
+    @app.on_event("shutdown")
+    async def shutdown_database():
+        await dispose_engines()
+
+    @app.on_event("shutdown")
+    def shutdown_gemini_executor():
+        get_executor().shutdown()
+
+    @app.on_event("shutdown")
+    def shutdown_password_hasher():
+        password_hasher.shutdown()
 
     @app.get("/")
     def root():
         return {"status": "online", "message": "NIA API funcionando!"}
 
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics():
+        """
+        Métricas no formato texto do Prometheus
+        """
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+    @app.get("/startup")
+    def startup_stats():
+        """
+        Tempo de boot do worker: import por módulo e etapas do startup
+        """
+        return boot.report()
+
     return app
 
 app = create_app()
@@ -1,17 +1,36 @@
 """
 Models do banco de dados usando SQLAlchemy.
-Define as tabelas: users, courses, modules, lessons, lesson_completions, progress.
+Define as tabelas: users, courses, modules, lessons, lesson_completions, progress,
+generation_jobs, point_events, leaderboard_snapshots e progress_event_keys.
+
+O esquema do banco é versionado pelo Alembic (backend/alembic/versions):
+mudou um model, crie a migration correspondente.
 """
 
 from sqlalchemy import (
-    Column, Integer, String, Text, Boolean, DECIMAL, DateTime,
-    ForeignKey, CheckConstraint
+    Column, Integer, BigInteger, String, Text, Boolean, DECIMAL, DateTime,
+    ForeignKey, CheckConstraint, Index, Computed
 )
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.database import Base
 
+
+def search_vector_column(title: str, body: str):
+    """
+    tsvector gerado pelo próprio Postgres (GENERATED ... STORED): título com
+    peso A e corpo com peso B. Deferred para não vir em todo SELECT do model.
+    """
+    return deferred(Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('portuguese', coalesce({title}, '')), 'A') || "
+            f"setweight(to_tsvector('portuguese', coalesce({body}, '')), 'B')",
+            persisted=True
+        )
+    ))
+
 # ============================================================
 # 1. MODEL: USER (INALTERADO)
 # ============================================================
@@ -53,6 +72,7 @@ class User(Base):
     # Constraints
     __table_args__ = (
         CheckConstraint('level >= 1 AND level <= 100', name='valid_level'),
+        Index('idx_users_total_points', total_points.desc()),  # Ranking
     )
 
     def __repr__(self):
@@ -97,16 +117,21 @@ class Course(Base):
     generation_time_seconds = Column(Integer)
     ai_quality_score = Column(DECIMAL(3, 1))
 
-    # Estatísticas
+    # Estatísticas (mantidas por app/services/course_stats.py)
     total_enrollments = Column(Integer, default=0)
+    completions_count = Column(Integer, default=0, server_default='0')  # Progress concluídos
     average_completion_rate = Column(DECIMAL(5, 2), default=0.0)
     average_rating = Column(DECIMAL(3, 2), default=0.0)
+    stats_reconciled_at = Column(DateTime(timezone=True))  # última correção pela reconciliação
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     published_at = Column(DateTime(timezone=True))
 
+    # Busca full-text (GET /courses/search)
+    search_vector = search_vector_column("title", "description")
+
     # Relacionamentos
     modules = relationship("Module", back_populates="course", cascade="all, delete-orphan")
     progress = relationship("Progress", back_populates="course")
@@ -117,6 +142,11 @@ class Course(Base):
         CheckConstraint("status IN ('draft', 'published', 'archived')", name='valid_status'),
         CheckConstraint('duration_hours > 0', name='valid_duration'),
         CheckConstraint('ai_quality_score >= 0 AND ai_quality_score <= 10', name='valid_quality_score'),
+        Index('idx_courses_status_created', status, created_at.desc(), id.desc()),  # Listagem paginada
+        Index('idx_courses_created_id', created_at.desc(), id.desc()),  # Listagem sem filtro de status
+        Index('idx_courses_tags', tags, postgresql_using='gin'),
+        Index('idx_courses_updated_at', updated_at),  # Refresh do índice de similaridade
+        Index('idx_courses_search', 'search_vector', postgresql_using='gin'),  # Busca full-text
     )
 
     def __repr__(self):
@@ -170,6 +200,9 @@ class Module(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Busca full-text
+    search_vector = search_vector_column("title", "description")
+
     # Relacionamentos
     course = relationship("Course", back_populates="modules")
     progress = relationship("Progress", back_populates="module")
@@ -180,6 +213,8 @@ class Module(Base):
         CheckConstraint('duration_hours > 0', name='valid_module_duration'),
         CheckConstraint('review_score >= 0 AND review_score <= 10', name='valid_review_score'),
         CheckConstraint('module_index > 0', name='valid_module_index'),
+        Index('idx_modules_course_module', course_id, module_index),
+        Index('idx_modules_search', 'search_vector', postgresql_using='gin'),
     )
 
     def __repr__(self):
@@ -211,6 +246,9 @@ class Lesson(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Busca full-text
+    search_vector = search_vector_column("title", "content")
+
     # Relacionamentos
     module = relationship("Module", back_populates="lessons")
     completions = relationship("LessonCompletion", back_populates="lesson", cascade="all, delete-orphan") # NOVO
@@ -218,6 +256,7 @@ class Lesson(Base):
     # Constraints
     __table_args__ = (
         CheckConstraint('lesson_index > 0', name='valid_lesson_index'),
+        Index('idx_lessons_search', 'search_vector', postgresql_using='gin'),
     )
 
     def __repr__(self):
@@ -281,6 +320,8 @@ class Progress(Base):
         CheckConstraint('quiz_score >= 0 AND quiz_score <= 100', name='valid_quiz_score'),
         CheckConstraint('quiz_attempts >= 0', name='valid_quiz_attempts'),
         CheckConstraint('current_lesson_index >= 1', name='valid_current_lesson_index'), # NOVA
+        Index('idx_progress_user_course', user_id, course_id),
+        Index('idx_progress_course_id', course_id),  # Ranking por curso
     )
 
     def __repr__(self):
@@ -314,7 +355,139 @@ class LessonCompletion(Base):
     # Constraints
     __table_args__ = (
         CheckConstraint('time_spent_minutes >= 0', name='valid_time_spent'),
+        Index('uq_lesson_completions_user_lesson', user_id, lesson_id, unique=True),  # Upsert dos eventos
+    )
+
+    def __repr__(self):
+        return f"<LessonCompletion(id={self.id}, user_id={self.user_id}, lesson_id={self.lesson_id})>"
+
+
+# ------------------------------------------------------------
+# 6. MODEL: GENERATION_JOB (NOVA!)
+# ------------------------------------------------------------
+
+class GenerationJob(Base):
+    __tablename__ = "generation_jobs"
+
+    # Identificação
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)  # generate_structure, generate_module
+
+    # Status
+    status = Column(String(50), default='queued', nullable=False, index=True)
+    attempts = Column(Integer, default=0)
+
+    # Entrada, progresso e saída
+    params = Column(JSONB, nullable=False)  # Parâmetros da requisição original
+    progress = Column(JSONB, default={})    # Ex: {"done": 2, "total": 9}
+    result = Column(JSONB)                  # Resposta final (mesmo formato do endpoint síncrono)
+    error = Column(Text)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    heartbeat_at = Column(DateTime(timezone=True))  # Renovado enquanto um worker executa o job
+    finished_at = Column(DateTime(timezone=True))
+
+    # Constraints
+    __table_args__ = (
+        CheckConstraint("status IN ('queued', 'running', 'completed', 'failed')", name='valid_job_status'),
+    )
+
+    def __repr__(self):
+        return f"<GenerationJob(id={self.id}, kind='{self.kind}', status='{self.status}')>"
+
+
+# ------------------------------------------------------------
+# 7. MODEL: POINT_EVENT (NOVA!)
+# ------------------------------------------------------------
+
+class PointEvent(Base):
+    """
+    Registro de cada mudança de pontos, gravado na mesma transação da
+    mudança. Os workers leem os eventos novos para manter os leaderboards
+    em memória (app/services/leaderboard.py).
+    """
+    __tablename__ = "point_events"
+
+    # Identificação
+    id = Column(BigInteger, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    course_id = Column(Integer, ForeignKey('courses.id', ondelete='CASCADE'))  # NULL = users.total_points
+
+    # Mudança
+    points = Column(Integer, nullable=False)  # Delta (pode ser negativo)
+    reason = Column(String(50))               # signup, update, progress
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Constraints
+    __table_args__ = (
+        Index('idx_point_events_user_created', user_id, created_at),  # Ranking semanal
+        Index('idx_point_events_created_at', created_at),
+    )
+
+    def __repr__(self):
+        return f"<PointEvent(id={self.id}, user_id={self.user_id}, points={self.points})>"
+
+
+# ------------------------------------------------------------
+# 8. MODEL: LEADERBOARD_SNAPSHOT (NOVA!)
+# ------------------------------------------------------------
+
+class LeaderboardSnapshot(Base):
+    """
+    Cópia gravada periodicamente dos leaderboards em memória (as primeiras
+    posições de cada um). Semanas encerradas só existem aqui.
+    """
+    __tablename__ = "leaderboard_snapshots"
+
+    # Identificação
+    board = Column(String(100), primary_key=True)  # global, weekly:2026-W42, course:12
+    user_id = Column(Integer, primary_key=True)    # Sem FK: o histórico fica mesmo se o usuário sair
+
+    # Posição
+    position = Column(Integer, nullable=False)  # 1, 2, 3... (empates desempatados pelo user_id)
+    rank = Column(Integer, nullable=False)      # Empates dividem o rank
+    score = Column(Integer, nullable=False)
+
+    # Controle
+    last_event_id = Column(BigInteger)  # Último point_event refletido
+    taken_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Constraints
+    __table_args__ = (
+        Index('idx_leaderboard_snapshots_position', board, position),
+    )
+
+    def __repr__(self):
+        return f"<LeaderboardSnapshot(board='{self.board}', user_id={self.user_id}, rank={self.rank})>"
+
+
+# ------------------------------------------------------------
+# 9. MODEL: PROGRESS_EVENT_KEY (NOVA!)
+# ------------------------------------------------------------
+
+class ProgressEventKey(Base):
+    """
+    event_id já aplicado de POST /progress/events (idempotência: o mesmo
+    evento reenviado não soma de novo). Apagado depois de
+    PROGRESS_EVENT_KEY_TTL_HOURS.
+    """
+    __tablename__ = "progress_event_keys"
+
+    # Identificação
+    user_id = Column(Integer, primary_key=True)
+    event_id = Column(String(100), primary_key=True)  # Gerado pelo cliente (ex: UUID)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Constraints
+    __table_args__ = (
+        Index('idx_progress_event_keys_created_at', created_at),  # Limpeza
     )
 
     def __repr__(self):
-        return f"<LessonCompletion(id={self.id}, user_id={self.user_id}, lesson_id={self.lesson_id})>"
\ No newline at end of file
+        return f"<ProgressEventKey(user_id={self.user_id}, event_id='{self.event_id}')>"
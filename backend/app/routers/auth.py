@@ -1,45 +1,77 @@
 from fastapi import APIRouter, HTTPException, Depends
 from app.models.models import User
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
-from app.core.security import create_access_token, verify_password, hash_password, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.security import (
+    create_access_token,
+    password_hasher,
+    PasswordPoolBusy,
+    ACCESS_TOKEN_EXPIRE_MINUTES
+)
 from app.schemas.auth import UserLogin, UserRegister, Token
-from app.database import get_db
+from app.database import get_async_db
+from app.services.leaderboard import record_user_points
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 @router.post("/register", response_model=Token)
-def register(data: UserRegister, db: Session = Depends(get_db)):
-    user_db = db.query(User).filter(User.email == data.email).first()
+async def register(data: UserRegister, db: AsyncSession = Depends(get_async_db)):
+    user_db = await db.scalar(select(User.id).where(User.email == data.email))
     if user_db:
         raise HTTPException(status_code=400, detail="Email já cadastrado.")
 
+    try:
+        password_hash = await password_hasher.hash(data.password)
+    except PasswordPoolBusy:
+        raise HTTPException(status_code=503, detail="Servidor ocupado, tente novamente.")
+
     new_user = User(
         name=data.name,
         email=data.email,
-        password_hash=hash_password(data.password)
+        password_hash=password_hash
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.flush()
+    # Entra no ranking global (mesmo com 0 pontos)
+    record_user_points(db, new_user.id, new_user.total_points or 0, "signup")
+    await db.commit()
+    await db.refresh(new_user)
 
     access_token = create_access_token({"sub": str(new_user.id)})
     return Token(access_token=access_token)
 
 @router.post("/login", response_model=Token)
-def login(data: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == data.email).first()
+async def login(data: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(select(User).where(User.email == data.email))
 
     if not user:
         raise HTTPException(status_code=400, detail="Usuário não encontrado.")
 
-    if not verify_password(data.password, user.password_hash):
+    try:
+        valid, new_hash = await password_hasher.verify(data.password, user.password_hash)
+    except PasswordPoolBusy:
+        raise HTTPException(status_code=503, detail="Servidor ocupado, tente novamente.")
+
+    if not valid:
         raise HTTPException(status_code=401, detail="Senha incorreta.")
 
+    # Custo do bcrypt mudou: salva o hash refeito com o custo atual
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+
     access_token = create_access_token(
         {"sub": str(user.id)},
         expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
 
     return Token(access_token=access_token)
+
+@router.get("/hash-pool")
+def hash_pool_stats():
+    """
+    Métricas do pool de bcrypt (fila, rejeições, rehash)
+    """
+    return password_hasher.stats()
@@ -1,8 +1,14 @@
 # backend/app/routers/courses.py
 import traceback
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
+from typing import List, Optional
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, defer, selectinload
+from app.database import get_db, get_async_db, AsyncSessionLocal
+from app.core.pagination import keyset_page, clamp_limit
 
 # ✅ IMPORTAR OS MODELS
 from app.models.models import Course, Module, Progress, Lesson  # ← ADICIONE Module!
@@ -10,9 +16,27 @@ from app.models.models import Course, Module, Progress, Lesson  # ← ADICIONE M
 from app.schemas.courses import (
     CourseGenerateRequest, 
     CourseStructureResponse,
-    ModuleGenerateResponse
+    ModuleGenerateResponse,
+    CourseTreeResponse,
+    ModuleTree,
+    LessonTreeItem,
+    CourseSearchResponse,
+    SimilarCoursesResponse
 )
 from app.agents.orchestrator import Orchestrator
+from app.schemas.jobs import JobCreatedResponse
+from app.agents.registry import get_orchestrator, registry
+from app.services.lesson_generation import (
+    is_lesson_complete,
+    generate_lessons,
+    save_lesson_content,
+    summarize
+)
+from app.services.job_queue import job_queue, PermanentJobError
+from app.services.course_tree import save_course_tree
+from app.services.course_search import search_courses
+from app.services.course_index import course_index
+from app.core.metrics import phase
 from datetime import datetime
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
@@ -29,9 +53,95 @@ def create_course(data: dict, db: Session = Depends(get_db)):
     db.refresh(course)
     return course
 
+# Colunas da listagem (sem os JSONB pesados como structure)
+COURSE_LIST_COLUMNS = (
+    Course.id, Course.title, Course.description, Course.level, Course.category,
+    Course.tags, Course.status, Course.is_public, Course.duration_hours,
+    Course.modules_count, Course.total_enrollments, Course.completions_count, Course.average_completion_rate,
+    Course.average_rating, Course.created_at,
+)
+
 @router.get("/")
-def list_courses(db: Session = Depends(get_db)):
-    return db.query(Course).all()
+def list_courses(
+    status: Optional[str] = None,
+    level: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Lista cursos (mais recentes primeiro) com paginação por cursor.
+    Filtrar por status usa o índice idx_courses_status_created; sem
+    filtro, o idx_courses_created_id.
+    """
+    query = db.query(*COURSE_LIST_COLUMNS)
+    if status:
+        query = query.filter(Course.status == status)
+    if level:
+        query = query.filter(Course.level == level)
+
+    return keyset_page(
+        query,
+        [(Course.created_at, True), (Course.id, True)],
+        cursor,
+        limit
+    )
+
+# Precisa vir antes de /{course_id}
+@router.get("/search", response_model=CourseSearchResponse)
+async def search_catalog(
+    q: str = Query(..., min_length=2, max_length=200),
+    tags: Optional[List[str]] = Query(None),
+    level: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = Query(0, ge=0, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Busca full-text (português) em títulos e conteúdo de cursos, módulos
+    e lições, ordenada por relevância.
+
+    q aceita a sintaxe de busca web: "frase exata", -excluir, termo or termo.
+    tags=python&tags=web filtra cursos que têm todas as tags.
+    Termos muito comuns são ranqueados só sobre os primeiros
+    SEARCH_MAX_CANDIDATES matches de cada tabela (resultado aproximado).
+    """
+    limit = clamp_limit(limit)
+    items = await search_courses(
+        db, q, tags=tags, level=level, status=status, limit=limit, offset=offset
+    )
+    return {"query": q, "items": items, "limit": limit, "offset": offset}
+
+@router.get("/similar", response_model=SimilarCoursesResponse)
+async def similar_courses(
+    topic: str = Query(..., min_length=2),
+    goal: str = "",
+    level: Optional[str] = None,
+    limit: int = Query(5, ge=1, le=20),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Cursos existentes parecidos com um pedido de geração (mesmos campos
+    de POST /generate-structure), para oferecer antes de gerar outro
+    """
+    matches = course_index.search(topic, goal, level=level, k=limit) if course_index.ready else []
+    courses = {}
+    if matches:
+        rows = await db.execute(
+            select(Course.id, Course.title, Course.level)
+            .where(Course.id.in_([course_id for course_id, _ in matches]))
+        )
+        courses = {row.id: row for row in rows}
+    return {
+        "items": [
+            {"id": course_id, "title": courses[course_id].title, "level": courses[course_id].level, "similarity": round(score, 4)}
+            for course_id, score in matches
+            if course_id in courses
+        ],
+        "threshold": course_index.threshold,
+        "index": course_index.stats(),
+    }
 
 @router.get("/{course_id}")
 def get_course(course_id: int, db: Session = Depends(get_db)):
@@ -49,6 +159,7 @@ def update_course(course_id: int, data: dict, db: Session = Depends(get_db)):
         setattr(course, key, value)
     db.commit()
     db.refresh(course)
+    course_index.add_course(course.id, course.level, course.title, course.description, course.generated_by)
     return course
 
 @router.delete("/{course_id}")
@@ -58,125 +169,249 @@ def delete_course(course_id: int, db: Session = Depends(get_db)):
         raise HTTPException(404, "Course not found")
     db.delete(course)
     db.commit()
+    course_index.discard(course_id)
     return {"status": "deleted"}
 
 
+# ============================================
+# ÁRVORE DO CURSO (Course -> Modules -> Lessons)
+# ============================================
+
+@router.get("/{course_id}/tree", response_model=CourseTreeResponse)
+async def get_course_tree(
+    course_id: int,
+    include_content: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Curso com módulos e lições em 3 queries (curso, módulos, lições)
+    via selectinload, sem N+1.
+
+    Por padrão não traz Lesson.content (o Markdown das aulas);
+    use ?include_content=true para incluir.
+    """
+    lessons_loader = selectinload(Course.modules).selectinload(Module.lessons)
+    if not include_content:
+        lessons_loader = lessons_loader.defer(Lesson.content)
+
+    course = await db.scalar(
+        select(Course)
+        .where(Course.id == course_id)
+        .options(defer(Course.structure), lessons_loader)
+    )
+    if not course:
+        raise HTTPException(404, "Course not found")
+
+    modules = []
+    for module in sorted(course.modules, key=lambda m: m.module_index):
+        lessons = [
+            LessonTreeItem(
+                id=lesson.id,
+                lesson_index=lesson.lesson_index,
+                title=lesson.title,
+                # Coluna adiada não pode ser lida (seria uma query por lição)
+                content=lesson.content if include_content else None,
+                is_approved=lesson.is_approved,
+                estimated_read_time_minutes=lesson.estimated_read_time_minutes,
+            )
+            for lesson in sorted(module.lessons, key=lambda l: l.lesson_index)
+        ]
+        modules.append(ModuleTree(
+            id=module.id,
+            module_index=module.module_index,
+            title=module.title,
+            description=module.description,
+            duration_hours=module.duration_hours,
+            content_generated=module.content_generated,
+            exam_generated=module.exam_generated,
+            lessons_count=module.lessons_count,
+            lessons=lessons,
+        ))
+
+    return CourseTreeResponse(
+        id=course.id,
+        title=course.title,
+        description=course.description,
+        level=course.level,
+        status=course.status,
+        duration_hours=course.duration_hours,
+        modules_count=course.modules_count,
+        created_at=course.created_at,
+        modules=modules,
+    )
+
+
 # ============================================
 # GERAÇÃO COM IA - FASE 1: ESTRUTURA
 # ============================================
 
-@router.post("/generate-structure", response_model=CourseStructureResponse)
-async def generate_course_structure(
+async def build_course_structure(
+    db: AsyncSession,
+    orchestrator: Orchestrator,
     data: CourseGenerateRequest,
-    db: Session = Depends(get_db),
-):
+) -> CourseStructureResponse:
     """
-    FASE 1: Gera APENAS a estrutura do curso (títulos de módulos e lições)
-    e salva as entidades Course, Module e Lesson no banco de dados.
+    Gera a estrutura via LLM e salva Course, Module e Lesson.
+    Usado pelo endpoint (modo síncrono) e pelo job em background.
     """
-    try:
-        print("🔹 Iniciando geração da estrutura...")
-        
-        # Inicializa o Orchestrator (Agente que interage com o LLM)
-        orchestrator = Orchestrator()
-        
-        # 1. ✅ Gera ESTRUTURA (Course -> Modules -> Lessons) via LLM
-        # A estrutura retornada é um dicionário Python (dict)
+    print("🔹 Iniciando geração da estrutura...")
+    
+    # 1. ✅ Gera ESTRUTURA (Course -> Modules -> Lessons) via LLM
+    # A estrutura retornada é um dicionário Python (dict)
+    with phase("structure.llm"):
         structure = await orchestrator.generate_course_structure(
             topic=data.topic,
             goal=data.goal,
             level=data.level
         )
-        
-        modules_data = structure.get('modules', [])
-        print(f"✅ Estrutura gerada: {structure.get('title')}")
-        print(f"   Módulos: {len(modules_data)}")
-        
-        # 2. ✅ Salva ENTIDADE COURSE no banco
-        course = Course(
-            title=structure.get("title", data.topic),
-            description=structure.get("description", ""),
-            level=data.level,
-            duration_hours=len(modules_data) * 3,  # Estimativa
-            modules_count=len(modules_data),
-            structure=structure,  # JSON completo
-            status="draft",
-            prerequisites=[],
-            learning_outcomes=[],
-            generated_by={"orchestrator": "gemini", "timestamp": str(datetime.now())}
+    
+    modules_data = structure.get('modules', [])
+    print(f"✅ Estrutura gerada: {structure.get('title')}")
+    print(f"   Módulos: {len(modules_data)}")
+    
+    # 2. ✅ Monta a árvore Course -> Modules -> Lessons
+    course_values = dict(
+        title=structure.get("title", data.topic),
+        description=structure.get("description", ""),
+        level=data.level,
+        duration_hours=len(modules_data) * 3,  # Estimativa
+        modules_count=len(modules_data),
+        structure=structure,  # JSON completo
+        status="draft",
+        prerequisites=[],
+        learning_outcomes=[],
+        # request: assinatura usada pela detecção de duplicatas (course_index)
+        generated_by={"orchestrator": "gemini", "timestamp": str(datetime.now()), "request": data.model_dump()}
+    )
+
+    tree = []
+    for mod_index, mod_data in enumerate(modules_data, start=1):
+        lessons_data = mod_data.get("lessons", [])
+
+        module_values = dict(
+            module_index=mod_data.get("index", mod_index), # Usa o index do LLM ou o índice de iteração
+            title=mod_data.get("title", f"Módulo {mod_index}"),
+            description=mod_data.get("description", ""),
+            content_generated=False,
+            exam_generated=False,
+            lessons_count=len(lessons_data),
+            duration_hours=3,
+            examples=[],
+            exercises=[],
+            resources={},
+            quiz={},
+            is_published=False,
+            generated_by="pending"
         )
-        db.add(course)
-        db.flush()  # Garante que o course.id seja gerado antes de salvar os módulos/lições
-        
-        print(f"✅ Curso salvo no banco com ID: {course.id}")
-        
-        # Lista para armazenar o número total de lições
-        total_lessons_saved = 0
-        
-        # 3. ✅ Itera e Salva MÓDULOS e LIÇÕES no banco
-        for mod_index, mod_data in enumerate(modules_data, start=1):
-            lessons_data = mod_data.get("lessons", [])
-            lesson_count = len(lessons_data)
-            total_lessons_saved += lesson_count
-            
-            # 3.1. Salva o MÓDULO (com o contador de lições)
-            module = Module(
-                course_id=course.id,
-                module_index=mod_data.get("index", mod_index), # Usa o index do LLM ou o índice de iteração
-                title=mod_data.get("title", f"Módulo {mod_index}"),
-                description=mod_data.get("description", ""),
-                
-                # NOVOS CAMPOS: 
-                content_generated=False,
-                exam_generated=False,
-                lessons_count=lesson_count, # ✅ ATUALIZADO
-                
-                duration_hours=3,
-                examples=[],
-                exercises=[],
-                resources={},
-                quiz={},
-                is_published=False,
-                generated_by="pending"
+
+        # O conteúdo e o status de aprovação serão preenchidos na FASE 2
+        lessons_values = [
+            dict(
+                lesson_index=lesson_index,
+                title=lesson_item.get("title", f"Lição {lesson_index}"),
+                content="",
+                is_approved=False,
+                estimated_read_time_minutes=15, # Placeholder
             )
-            db.add(module)
-            db.flush() # Garante que o module.id seja gerado antes de salvar as lições
-            
-            # 3.2. Salva as LIÇÕES associadas a este módulo
-            for lesson_index, lesson_item in enumerate(lessons_data, start=1):
-                lesson = Lesson(
-                    module_id=module.id,
-                    lesson_index=lesson_index,
-                    title=lesson_item.get("title", f"Lição {lesson_index}"),
-                    
-                    # O conteúdo e o status de aprovação serão preenchidos na FASE 2
-                    content="",
-                    is_approved=False,
-                    estimated_read_time_minutes=15, # Placeholder
-                )
-                db.add(lesson)
-
-        # 4. ✅ COMMIT FINAL
-        db.commit()
-        
-        print(f"✅ Estrutura completa salva. Módulos: {len(modules_data)}, Lições: {total_lessons_saved}")
-        
-        # 5. ✅ Retorno
-        db.refresh(course) # Atualiza o objeto course para garantir consistência
-        return CourseStructureResponse(
-            id=course.id,
-            topic=data.topic,
-            title=course.title,
-            description=course.description,
-            modules=structure.get("modules", []), # Retorna a estrutura JSON original
-            total_modules=course.modules_count,
-            created_at=course.created_at
-        )
+            for lesson_index, lesson_item in enumerate(lessons_data, start=1)
+        ]
+        tree.append((module_values, lessons_values))
+
+    # 3. ✅ Salva tudo em lote (3 INSERTs, independente do tamanho)
+    with phase("structure.save"):
+        course_id, created_at = await save_course_tree(db, course_values, tree)
+        await db.commit()
+    course_index.add_course(
+        course_id, data.level, course_values["title"], course_values["description"], course_values["generated_by"]
+    )
+
+    total_lessons_saved = sum(len(lessons) for _, lessons in tree)
+    print(f"✅ Estrutura completa salva. Curso ID: {course_id}, Módulos: {len(modules_data)}, Lições: {total_lessons_saved}")
+
+    # 4. ✅ Retorno
+    return CourseStructureResponse(
+        id=course_id,
+        topic=data.topic,
+        title=course_values["title"],
+        description=course_values["description"],
+        modules=structure.get("modules", []), # Retorna a estrutura JSON original
+        total_modules=course_values["modules_count"],
+        created_at=created_at
+    )
+
+
+async def find_existing_course(db: AsyncSession, data: CourseGenerateRequest) -> Optional[CourseStructureResponse]:
+    """
+    Curso já existente praticamente igual ao pedido (course_index), no
+    formato da resposta de geração, ou None
+    """
+    duplicate = await course_index.find_duplicate(db, data.topic, data.goal, data.level)
+    if not duplicate:
+        return None
+    course_id, similarity = duplicate
+
+    course = await db.get(Course, course_id)
+    if not course:
+        # Apagado por outro worker
+        course_index.discard(course_id)
+        return None
+    # Alterado por outro worker desde o último refresh do índice
+    similarity = course_index.confirm(course, data.topic, data.goal, data.level)
+    if similarity is None:
+        return None
+
+    print(f"♻️ Curso {course_id} reaproveitado (similaridade {similarity:.2f})")
+    return CourseStructureResponse(
+        id=course.id,
+        topic=data.topic,
+        title=course.title,
+        description=course.description or "",
+        modules=(course.structure or {}).get("modules", []),
+        total_modules=course.modules_count or 0,
+        created_at=course.created_at,
+        reused=True,
+        similarity=round(similarity, 4)
+    )
+
+
+@router.post("/generate-structure")
+async def generate_course_structure(
+    data: CourseGenerateRequest,
+    response: Response,
+    wait: bool = False,
+    force: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    orchestrator: Orchestrator = Depends(get_orchestrator),
+):
+    """
+    FASE 1: Gera APENAS a estrutura do curso (títulos de módulos e lições)
+    e salva as entidades Course, Module e Lesson no banco de dados.
+
+    Por padrão enfileira um job e responde na hora com o id
+    (acompanhe em GET /jobs/{id}). Com ?wait=true gera dentro da
+    própria requisição e devolve a CourseStructureResponse.
+
+    Se já existe um curso praticamente igual (mesmo nível, tópico e
+    objetivo quase iguais), devolve esse curso (200, reused=true) sem
+    chamar o LLM. Use ?force=true para gerar outro mesmo assim.
+    """
+    if not force:
+        existing = await find_existing_course(db, data)
+        if existing:
+            return existing
+
+    if not wait:
+        job = await job_queue.enqueue(db, "generate_structure", data.model_dump())
+        response.status_code = 202
+        return JobCreatedResponse(job_id=job.id, status=job.status)
+
+    try:
+        return await build_course_structure(db, orchestrator, data)
     
     except Exception as e:
         # A instrução traceback.print_exc() é importante para ver a pilha de erros completa no console.
         traceback.print_exc()
-        db.rollback() # ✅ O rollback é CRUCIAL em caso de erro para não ter dados parciais
+        await db.rollback() # ✅ O rollback é CRUCIAL em caso de erro para não ter dados parciais
         raise HTTPException(
             status_code=500, 
             detail=f"Erro ao gerar estrutura: {str(e)}"
@@ -187,37 +422,53 @@ async def generate_course_structure(
 # GERAÇÃO COM IA - FASE 2: CONTEÚDO DO MÓDULO
 # ====================================================================
 
-def is_lesson_complete(lesson: Lesson):
-    return (
-        lesson.content is not None and
-        lesson.is_approved is True and
-        lesson.generated_by is not None and
-        lesson.estimated_read_time_minutes is not None
-    )
-
 @router.post("/generate-module/{course_id}/{module_index}")
 async def generate_module_content(
     course_id: int,
     module_index: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    wait: bool = False,
+    concurrency: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+    orchestrator: Orchestrator = Depends(get_orchestrator),
 ):
     """
     FASE 2: Gera o conteúdo detalhado para todas as lições de um módulo
     e atualiza a tabela Module.
+
+    Por padrão enfileira um job que gera todas as lições pendentes do
+    módulo (acompanhe em GET /jobs/{id}). Com ?wait=true gera só a
+    próxima lição incompleta dentro da própria requisição.
     """
+    if not wait:
+        exists = await db.scalar(select(Module.id).where(
+            Module.course_id == course_id,
+            Module.module_index == module_index
+        ))
+        if not exists:
+            raise HTTPException(status_code=404, detail="Módulo não encontrado")
+
+        job = await job_queue.enqueue(db, "generate_module", {
+            "course_id": course_id,
+            "module_index": module_index,
+            "concurrency": concurrency,
+        })
+        response.status_code = 202
+        return JobCreatedResponse(job_id=job.id, status=job.status)
+
     print(f"🔹 Iniciando FASE 2: Geração de conteúdo para Módulo {module_index} do Curso {course_id}")
     try:
         # 1. Encontra o Módulo e o Curso
-        module = db.query(Module).filter(
+        module = await db.scalar(select(Module).where(
             Module.course_id == course_id,
             Module.module_index == module_index
-        ).first()
+        ))
         
         if not module:
             raise HTTPException(status_code=404, detail="Módulo não encontrado")
         
         # ADICIONADO: Buscar o objeto Course pai para fornecer contexto global ao Orchestrator
-        course = db.query(Course).filter(Course.id == course_id).first()
+        course = await db.get(Course, course_id)
         if not course:
             # Isso só deve acontecer se houver um problema de integridade referencial no DB
             raise HTTPException(status_code=500, detail="Curso pai não encontrado para o módulo.")
@@ -232,7 +483,9 @@ async def generate_module_content(
             }
         
         # 3. Busca a lista de Lições (o Specialist Agent precisará disso)
-        lessons = db.query(Lesson).filter(Lesson.module_id == module.id).order_by(Lesson.lesson_index).all()
+        lessons = (await db.scalars(
+            select(Lesson).where(Lesson.module_id == module.id).order_by(Lesson.lesson_index)
+        )).all()
         
         if not lessons:
              raise HTTPException(status_code=404, detail="Nenhuma lição encontrada para este módulo.")
@@ -246,10 +499,7 @@ async def generate_module_content(
                 "module_id": module.id
             }
         
-        # 4. Inicializa o Orchestrator
-        orchestrator = Orchestrator()#model = "llama")
-        
-        # 5. Gera o conteúdo chamando o Orchestrator com todo o contexto
+        # 4. Gera o conteúdo chamando o Orchestrator com todo o contexto
         # O Orchestrator será responsável por limpar o contexto, chamar os agentes e salvar o Lesson.content
         
         print("⚙️ Enviando Curso, Módulo e Lições para o Orchestrator...")
@@ -265,13 +515,13 @@ async def generate_module_content(
         return (result)
         print(f"Conteudo = {result}")
         
-        # 6. Atualiza o Módulo com status de geração e metadados
+        # 5. Atualiza o Módulo com status de geração e metadados
         module.content_generated = False # Marca a conclusão da geração
         #module.ai_model_used = result.get('model_used', 'N/A')
         #module.review_score = result.get('review_score', 0)
         #
-        db.commit()
-        db.refresh(module)
+        await db.commit()
+        await db.refresh(module)
         
         return {
 
@@ -286,8 +536,261 @@ async def generate_module_content(
     
     except Exception as e:
         traceback.print_exc()
-        db.rollback()
+        await db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao gerar módulo: {str(e)}"
+        )
+
+
+# ====================================================================
+# GERAÇÃO COM IA - FASE 2 (PARALELA): MÓDULO OU CURSO INTEIRO
+# ====================================================================
+
+@router.post("/generate-module/{course_id}/{module_index}/all")
+async def generate_module_all_lessons(
+    course_id: int,
+    module_index: int,
+    concurrency: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+    orchestrator: Orchestrator = Depends(get_orchestrator),
+):
+    """
+    FASE 2 (paralela): Gera TODAS as lições incompletas do módulo ao mesmo
+    tempo (até `concurrency` simultâneas), salvando cada uma ao terminar.
+    """
+    module = await db.scalar(select(Module).where(
+        Module.course_id == course_id,
+        Module.module_index == module_index
+    ))
+
+    if not module:
+        raise HTTPException(status_code=404, detail="Módulo não encontrado")
+
+    course = await db.get(Course, course_id)
+    if not course:
+        raise HTTPException(status_code=500, detail="Curso pai não encontrado para o módulo.")
+
+    lessons = (await db.scalars(
+        select(Lesson).where(Lesson.module_id == module.id).order_by(Lesson.lesson_index)
+    )).all()
+    if not lessons:
+        raise HTTPException(status_code=404, detail="Nenhuma lição encontrada para este módulo.")
+
+    pending = [(module, l) for l in lessons if not is_lesson_complete(l)]
+    if not pending:
+        return {
+            "message": "Todas as lições já estão completas",
+            "module_id": module.id
+        }
+
+    print(f"🔹 Gerando {len(pending)} lições do Módulo {module_index} do Curso {course_id} em paralelo")
+
+    try:
+        results = await generate_lessons(db, orchestrator, course, pending, concurrency)
+    except Exception as e:
+        traceback.print_exc()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Erro ao gerar módulo: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+    await db.refresh(module)
+    return {
+        "module_id": module.id,
+        "content_generated": module.content_generated,
+        **summarize(results)
+    }
+
+
+@router.post("/generate-course/{course_id}")
+async def generate_course_all_lessons(
+    course_id: int,
+    concurrency: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+    orchestrator: Orchestrator = Depends(get_orchestrator),
+):
+    """
+    FASE 2 (paralela): Gera as lições incompletas de TODOS os módulos do
+    curso, compartilhando o mesmo limite de concorrência.
+    """
+    course = await db.get(Course, course_id)
+    if not course:
+        raise HTTPException(404, "Course not found")
+
+    modules = (await db.scalars(
+        select(Module).where(Module.course_id == course_id).order_by(Module.module_index)
+    )).all()
+    module_by_id = {m.id: m for m in modules}
+
+    lessons = (await db.scalars(
+        select(Lesson)
+        .where(Lesson.module_id.in_(module_by_id.keys()))
+        .order_by(Lesson.module_id, Lesson.lesson_index)
+    )).all()
+
+    pending = [(module_by_id[l.module_id], l) for l in lessons if not is_lesson_complete(l)]
+    if not pending:
+        return {
+            "message": "Todas as lições já estão completas",
+            "course_id": course_id
+        }
+
+    print(f"🔹 Gerando {len(pending)} lições do Curso {course_id} em paralelo")
+
+    try:
+        results = await generate_lessons(db, orchestrator, course, pending, concurrency)
+    except Exception as e:
+        traceback.print_exc()
+        await db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao gerar curso: {str(e)}"
+        )
+
+    modules_completed = await db.scalar(
+        select(func.count(Module.id)).where(
+            Module.course_id == course_id,
+            Module.content_generated.is_(True)
+        )
+    )
+    return {
+        "course_id": course_id,
+        "modules_completed": modules_completed,
+        "total_modules": len(module_by_id),
+        **summarize(results)
+    }
+
+
+# ====================================================================
+# GERAÇÃO COM IA - FASE 2 (STREAMING): UMA LIÇÃO VIA SSE
+# ====================================================================
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.get("/generate-lesson/{lesson_id}/stream")
+async def stream_lesson_content(
+    lesson_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    orchestrator: Orchestrator = Depends(get_orchestrator),
+):
+    """
+    FASE 2 (streaming): Gera o conteúdo de UMA lição e envia os pedaços
+    como Server-Sent Events assim que o LLM produz.
+
+    Eventos:
+      - chunk: {"text": "..."} (pedaço do Markdown)
+      - done:  {"lesson_id": ..., "estimated_read_time_minutes": ...}
+      - error: {"detail": "..."}
+
+    O conteúdo completo é salvo em Lesson.content ao final do stream.
+    (GET para funcionar direto com EventSource no navegador.)
+    """
+    lesson = await db.get(Lesson, lesson_id)
+    if not lesson:
+        raise HTTPException(404, "Lesson not found")
+
+    module = await db.get(Module, lesson.module_id)
+    course = await db.get(Course, module.course_id)
+
+    # Lê o contexto antes de responder: o stream usa sua própria sessão
+    course_title, module_title, lesson_title = course.title, module.title, lesson.title
+
+    async def events():
+        parts = []
+        try:
+            async for chunk in orchestrator.stream_module_structure(
+                course=course_title,
+                module=module_title,
+                lessons=lesson_title
+            ):
+                parts.append(chunk)
+                yield _sse("chunk", {"text": chunk})
+        except Exception as e:
+            traceback.print_exc()
+            yield _sse("error", {"detail": f"Erro ao gerar lição: {str(e)}"})
+            return
+
+        content = "".join(parts)
+        if not content:
+            # Não salva: a lição ficaria marcada como aprovada/completa sem conteúdo
+            yield _sse("error", {"detail": "Erro ao gerar lição: Resposta vazia do agente"})
+            return
+
+        try:
+            with phase("lesson_stream.save"):
+                async with AsyncSessionLocal() as session:
+                    read_time = await save_lesson_content(session, lesson_id, content)
+        except Exception as e:
+            traceback.print_exc()
+            yield _sse("error", {"detail": f"Erro ao salvar lição: {str(e)}"})
+            return
+
+        yield _sse("done", {"lesson_id": lesson_id, "estimated_read_time_minutes": read_time})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# ====================================================================
+# JOBS EM BACKGROUND
+# ====================================================================
+
+async def _generate_structure_job(db: AsyncSession, params: dict, report_progress) -> dict:
+    await report_progress({"phase": "structure"})
+    result = await build_course_structure(
+        db,
+        registry.orchestrator(),
+        CourseGenerateRequest(**params)
+    )
+    await report_progress({"phase": "done"})
+    return result.model_dump(mode="json")
+
+
+async def _generate_module_job(db: AsyncSession, params: dict, report_progress) -> dict:
+    course_id = params["course_id"]
+    module_index = params["module_index"]
+
+    module = await db.scalar(select(Module).where(
+        Module.course_id == course_id,
+        Module.module_index == module_index
+    ))
+    if not module:
+        raise PermanentJobError("Módulo não encontrado")
+    module_id = module.id
+
+    course = await db.get(Course, course_id)
+    if not course:
+        raise PermanentJobError("Curso pai não encontrado para o módulo.")
+
+    lessons = (await db.scalars(
+        select(Lesson).where(Lesson.module_id == module_id).order_by(Lesson.lesson_index)
+    )).all()
+    pending = [(module, l) for l in lessons if not is_lesson_complete(l)]
+
+    progress = {"total": len(pending), "generated": 0, "failed": 0}
+    await report_progress(progress)
+
+    async def on_progress(result: dict):
+        progress[result["status"]] += 1
+        await report_progress(progress)
+
+    results = await generate_lessons(
+        db,
+        registry.orchestrator(),
+        course,
+        pending,
+        params.get("concurrency"),
+        on_progress
+    )
+    return {"module_id": module_id, **summarize(results)}
+
+
+job_queue.register("generate_structure", _generate_structure_job)
+job_queue.register("generate_module", _generate_module_job)
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.models.models import GenerationJob
+from app.schemas.jobs import JobResponse
+from app.services.job_queue import job_queue
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+# Estado da fila (workers e jobs aguardando)
+@router.get("/stats")
+def jobs_stats():
+    return job_queue.stats()
+
+# Buscar job por ID (status, progresso e resultado)
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return job
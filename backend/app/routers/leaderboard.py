@@ -0,0 +1,169 @@
+# backend/app/routers/leaderboard.py
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.core.pagination import clamp_limit
+from app.models.models import Course, User
+from app.schemas.leaderboard import LeaderboardResponse, UserRankResponse
+from app.services.leaderboard import (
+    GLOBAL_BOARD,
+    Entry,
+    RankedBoard,
+    course_board,
+    leaderboard,
+    week_start
+)
+
+router = APIRouter(prefix="/leaderboard", tags=["Leaderboard"])
+
+# Maior janela em volta do usuário (posições acima e abaixo)
+RADIUS_MAX = 50
+
+
+async def _with_users(db: AsyncSession, entries: List[Entry]) -> List[dict]:
+    """
+    Nome e avatar só dos usuários da página
+    """
+    ids = [user_id for _, user_id, _ in entries]
+    users = {}
+    if ids:
+        rows = await db.execute(select(User.id, User.name, User.avatar_url).where(User.id.in_(ids)))
+        users = {row.id: row for row in rows}
+    return [
+        {
+            "rank": rank,
+            "user_id": user_id,
+            "name": getattr(users.get(user_id), "name", None),
+            "avatar_url": getattr(users.get(user_id), "avatar_url", None),
+            "score": score,
+        }
+        for rank, user_id, score in entries
+    ]
+
+
+async def _board(name: str) -> Optional[RankedBoard]:
+    if not leaderboard.ready:
+        raise HTTPException(503, "Leaderboard is loading")
+    return await leaderboard.get_board(name)
+
+
+async def _page(db: AsyncSession, name: str, limit: Optional[int], offset: int) -> dict:
+    limit = clamp_limit(limit)
+    board = await _board(name)
+    snapshot_at = None
+    if board is not None:
+        entries, total = board.top(limit, offset), len(board)
+    else:
+        entries, total, snapshot_at = await leaderboard.snapshot_page(db, name, limit, offset)
+    return {
+        "board": name,
+        "total": total,
+        "items": await _with_users(db, entries),
+        "limit": limit,
+        "offset": offset,
+        "snapshot_at": snapshot_at,
+    }
+
+
+async def _user_rank(db: AsyncSession, name: str, user_id: int, radius: int) -> dict:
+    board = await _board(name)
+    snapshot_at = None
+    if board is not None:
+        entry, around, total = board.rank(user_id), board.around(user_id, radius), len(board)
+    else:
+        entry, around, total, snapshot_at = await leaderboard.snapshot_around(db, name, user_id, radius)
+    if entry is None:
+        raise HTTPException(404, "User not ranked")
+    entry_item, *_ = await _with_users(db, [entry])
+    return {
+        "board": name,
+        "total": total,
+        "entry": entry_item,
+        "around": await _with_users(db, around),
+        "snapshot_at": snapshot_at,
+    }
+
+
+def _week(week: Optional[str]) -> str:
+    """
+    Nome do ranking semanal: semana corrente ou AAAA-Www (ex: 2026-W41)
+    """
+    if not week:
+        return leaderboard.current_week
+    name = f"weekly:{week}"
+    try:
+        week_start(name)
+    except ValueError:
+        raise HTTPException(400, "week must be in the format YYYY-Www (ex: 2026-W41)")
+    return name
+
+
+async def _course(db: AsyncSession, course_id: int) -> str:
+    if not await db.scalar(select(Course.id).where(Course.id == course_id)):
+        raise HTTPException(404, "Course not found")
+    return course_board(course_id)
+
+# Estado dos rankings em memória
+@router.get("/stats")
+def leaderboard_stats():
+    return leaderboard.stats()
+
+# Ranking global (users.total_points)
+@router.get("/", response_model=LeaderboardResponse)
+async def global_leaderboard(
+    limit: Optional[int] = None,
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _page(db, GLOBAL_BOARD, limit, offset)
+
+# Posição de um usuário no ranking global
+@router.get("/users/{user_id}", response_model=UserRankResponse)
+async def global_rank(
+    user_id: int,
+    radius: int = Query(5, ge=0, le=RADIUS_MAX),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _user_rank(db, GLOBAL_BOARD, user_id, radius)
+
+# Ranking da semana (corrente em memória; anteriores do snapshot)
+@router.get("/weekly", response_model=LeaderboardResponse)
+async def weekly_leaderboard(
+    week: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _page(db, _week(week), limit, offset)
+
+# Posição de um usuário no ranking da semana
+@router.get("/weekly/users/{user_id}", response_model=UserRankResponse)
+async def weekly_rank(
+    user_id: int,
+    week: Optional[str] = None,
+    radius: int = Query(5, ge=0, le=RADIUS_MAX),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _user_rank(db, _week(week), user_id, radius)
+
+# Ranking de um curso (progress.points_earned)
+@router.get("/courses/{course_id}", response_model=LeaderboardResponse)
+async def course_leaderboard(
+    course_id: int,
+    limit: Optional[int] = None,
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _page(db, await _course(db, course_id), limit, offset)
+
+# Posição de um usuário no ranking de um curso
+@router.get("/courses/{course_id}/users/{user_id}", response_model=UserRankResponse)
+async def course_rank(
+    course_id: int,
+    user_id: int,
+    radius: int = Query(5, ge=0, le=RADIUS_MAX),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _user_rank(db, await _course(db, course_id), user_id, radius)
@@ -1,6 +1,8 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.core.pagination import keyset_page
 from app.models.models import Module
 
 router = APIRouter(prefix="/modules", tags=["Modules"])
@@ -14,10 +16,30 @@ def create_module(data: dict, db: Session = Depends(get_db)):
     db.refresh(module)
     return module
 
-# Listar todos os módulos
+# Colunas da listagem (sem quiz, exemplos, exercícios e outros JSONB)
+MODULE_LIST_COLUMNS = (
+    Module.id, Module.course_id, Module.module_index, Module.title,
+    Module.description, Module.duration_hours, Module.content_generated,
+    Module.exam_generated, Module.lessons_count, Module.review_score,
+    Module.is_published, Module.created_at,
+)
+
+# Listar módulos (paginado; filtrando por curso vem na ordem do curso)
 @router.get("/")
-def list_modules(db: Session = Depends(get_db)):
-    return db.query(Module).all()
+def list_modules(
+    course_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    query = db.query(*MODULE_LIST_COLUMNS)
+    if course_id is not None:
+        query = query.filter(Module.course_id == course_id)
+        order_by = [(Module.module_index, False), (Module.id, False)]
+    else:
+        order_by = [(Module.id, False)]
+
+    return keyset_page(query, order_by, cursor, limit)
 
 # Buscar módulo por ID
 @router.get("/{module_id}")
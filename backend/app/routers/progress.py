@@ -1,49 +1,130 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.core.pagination import keyset_page_async
 from app.models.models import Progress
+from app.services.course_stats import course_stats
+from app.schemas.progress import ProgressEventBatch, ProgressEventsAccepted
+from app.services.leaderboard import record_progress_points
+from app.services.progress_events import (
+    EventBufferFull,
+    PROGRESS_EVENTS_FLUSH_SECONDS,
+    progress_events
+)
 
 router = APIRouter(prefix="/progress", tags=["Progress"])
 
+
+def _stats_key(progress: Progress) -> dict:
+    """
+    Campos que mexem nas estatísticas (course_stats) e no ranking do curso (leaderboard)
+    """
+    return {
+        "user_id": progress.user_id,
+        "course_id": progress.course_id,
+        "status": progress.status,
+        "points_earned": progress.points_earned,
+    }
+
 # Criar progresso
 @router.post("/")
-def create_progress(data: dict, db: Session = Depends(get_db)):
+async def create_progress(data: dict, db: AsyncSession = Depends(get_async_db)):
     progress = Progress(**data)
     db.add(progress)
-    db.commit()
-    db.refresh(progress)
+    record_progress_points(db, None, _stats_key(progress))
+    await db.commit()
+    await db.refresh(progress)
+    await course_stats.progress_changed(db, None, _stats_key(progress))
     return progress
 
-# Listar todo progresso
+# Eventos de progresso em lote (tempo de estudo e conclusão de lição)
+@router.post("/events", status_code=202, response_model=ProgressEventsAccepted)
+async def ingest_progress_events(batch: ProgressEventBatch):
+    """
+    Aceita o lote e responde na hora; a gravação em lesson_completions e
+    progress acontece em segundo plano, a cada poucos segundos.
+    Reenviar um event_id já aceito não soma de novo.
+    """
+    try:
+        accepted, duplicates = progress_events.add(batch.events)
+    except EventBufferFull:
+        raise HTTPException(
+            503,
+            "Progress event buffer is full, retry later",
+            headers={"Retry-After": str(max(1, round(PROGRESS_EVENTS_FLUSH_SECONDS)))}
+        )
+    return {"accepted": accepted, "duplicates": duplicates}
+
+# Estado do buffer de eventos
+@router.get("/events/stats")
+def progress_events_stats():
+    return progress_events.stats()
+
+# Colunas da listagem (sem quiz_answers, tutor_analysis e badges)
+PROGRESS_LIST_COLUMNS = (
+    Progress.id, Progress.user_id, Progress.course_id, Progress.module_id,
+    Progress.status, Progress.current_lesson_index, Progress.can_advance,
+    Progress.started_at, Progress.completed_at, Progress.last_accessed_at,
+    Progress.quiz_attempts, Progress.quiz_score, Progress.quiz_passed,
+    Progress.time_spent_minutes, Progress.points_earned,
+)
+
+# Listar progresso (paginado; user_id + course_id usa idx_progress_user_course)
 @router.get("/")
-def list_progress(db: Session = Depends(get_db)):
-    return db.query(Progress).all()
+async def list_progress(
+    user_id: Optional[int] = None,
+    course_id: Optional[int] = None,
+    module_id: Optional[int] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = select(*PROGRESS_LIST_COLUMNS)
+    if user_id is not None:
+        stmt = stmt.where(Progress.user_id == user_id)
+    if course_id is not None:
+        stmt = stmt.where(Progress.course_id == course_id)
+    if module_id is not None:
+        stmt = stmt.where(Progress.module_id == module_id)
+    if status:
+        stmt = stmt.where(Progress.status == status)
+
+    return await keyset_page_async(db, stmt, [(Progress.id, False)], cursor, limit)
 
 # Buscar progresso por ID
 @router.get("/{progress_id}")
-def get_progress(progress_id: int, db: Session = Depends(get_db)):
-    progress = db.query(Progress).filter(Progress.id == progress_id).first()
+async def get_progress(progress_id: int, db: AsyncSession = Depends(get_async_db)):
+    progress = await db.get(Progress, progress_id)
     if not progress:
         raise HTTPException(404, "Progress not found")
     return progress
 
 # Atualizar progresso
 @router.put("/{progress_id}")
-def update_progress(progress_id: int, data: dict, db: Session = Depends(get_db)):
-    progress = db.query(Progress).filter(Progress.id == progress_id).first()
+async def update_progress(progress_id: int, data: dict, db: AsyncSession = Depends(get_async_db)):
+    progress = await db.get(Progress, progress_id)
     if not progress:
         raise HTTPException(404, "Progress not found")
+    before = _stats_key(progress)
     for key, value in data.items():
         setattr(progress, key, value)
-    db.commit()
+    record_progress_points(db, before, _stats_key(progress))
+    await db.commit()
+    await course_stats.progress_changed(db, before, _stats_key(progress))
     return progress
 
 # Deletar progresso
 @router.delete("/{progress_id}")
-def delete_progress(progress_id: int, db: Session = Depends(get_db)):
-    progress = db.query(Progress).filter(Progress.id == progress_id).first()
+async def delete_progress(progress_id: int, db: AsyncSession = Depends(get_async_db)):
+    progress = await db.get(Progress, progress_id)
     if not progress:
         raise HTTPException(404, "Progress not found")
-    db.delete(progress)
-    db.commit()
+    before = _stats_key(progress)
+    record_progress_points(db, before, None)
+    await db.delete(progress)
+    await db.commit()
+    await course_stats.progress_changed(db, before, None)
     return {"status": "deleted"}
@@ -18,9 +18,13 @@ curl http://localhost:8000/test-ai/compare
 # http://localhost:8000/test-ai/gemini
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from app.services.groq_service import GroqService
-from app.services.gemini_service import GeminiService
+from app.services.gemini_service import GeminiService, get_executor
+from app.agents.registry import get_gemini_service, get_groq_service
+from app.services.llm_cache import llm_cache
+from app.services.rate_limiter import limiter_stats
+from app.services.resilience import resilience_stats
 
 router = APIRouter(prefix="/test-ai", tags=["🧪 Test AI"])
 
@@ -28,15 +32,13 @@ router = APIRouter(prefix="/test-ai", tags=["🧪 Test AI"])
 # TESTE: GROQ (Llama)
 # ============================================
 @router.get("/groq")
-async def test_groq():
+async def test_groq(service: GroqService = Depends(get_groq_service)):
     """
     Testa se o Groq está funcionando
     
     Acesse: http://localhost:8000/test-ai/groq
     """
     try:
-        service = GroqService()
-        
         response = await service.generate(
             prompt="Diga 'Olá, Groq funcionando!' em uma frase",
             system_prompt="Você é um assistente amigável",
@@ -54,7 +56,7 @@ async def test_groq():
 
 
 @router.post("/groq/custom")
-async def test_groq_custom(prompt: str):
+async def test_groq_custom(prompt: str, service: GroqService = Depends(get_groq_service)):
     """
     Testa Groq com prompt customizado
     
@@ -62,8 +64,6 @@ async def test_groq_custom(prompt: str):
     POST http://localhost:8000/test-ai/groq/custom?prompt=Explique Python
     """
     try:
-        service = GroqService()
-        
         response = await service.generate(
             prompt=prompt,
             temperature=0.7
@@ -83,15 +83,13 @@ async def test_groq_custom(prompt: str):
 # TESTE: GEMINI
 # ============================================
 @router.get("/gemini")
-async def test_gemini():
+async def test_gemini(service: GeminiService = Depends(get_gemini_service)):
     """
     Testa se o Gemini está funcionando
     
     Acesse: http://localhost:8000/test-ai/gemini
     """
     try:
-        service = GeminiService()
-        
         response = await service.generate(
             prompt="Diga 'Olá, Gemini funcionando!' em uma frase. E qual é a sua Versão é 2?",
             temperature=0.5
@@ -107,13 +105,11 @@ async def test_gemini():
 
 
 @router.post("/gemini/custom")
-async def test_gemini_custom(prompt: str):
+async def test_gemini_custom(prompt: str, service: GeminiService = Depends(get_gemini_service)):
     """
     Testa Gemini com prompt customizado
     """
     try:
-        service = GeminiService()
-        
         response = await service.generate(
             prompt=prompt,
             temperature=0.7
@@ -129,17 +125,59 @@ async def test_gemini_custom(prompt: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/gemini/pool")
+async def gemini_pool_stats():
+    """
+    Métricas do pool de threads do Gemini (fila, em execução, concluídas)
+    """
+    return get_executor().stats()
+
+
+# ============================================
+# CACHE DE RESPOSTAS
+# ============================================
+@router.get("/cache")
+async def cache_stats():
+    """
+    Hits, misses e tamanho do cache de respostas dos LLMs
+    """
+    return llm_cache.stats()
+
+
+@router.delete("/cache")
+async def cache_clear():
+    """
+    Esvazia o cache (memória e arquivo)
+    """
+    await llm_cache.clear()
+    return {"status": "cleared"}
+
+
+@router.get("/limits")
+async def rate_limit_stats():
+    """
+    Cota disponível por provider/modelo e chamadas coalescidas
+    """
+    return limiter_stats()
+
+
+@router.get("/breakers")
+async def circuit_breaker_stats():
+    """
+    Estado do circuit breaker de cada provider
+    """
+    return resilience_stats()
+
+
 # ============================================
 # TESTE: JSON (Groq)
 # ============================================
 @router.get("/groq/json")
-async def test_groq_json():
+async def test_groq_json(service: GroqService = Depends(get_groq_service)):
     """
     Testa geração de JSON com Groq
     """
     try:
-        service = GroqService()
-        
         response = await service.generate_json(
             prompt="Liste 3 linguagens de programação populares",
             system_prompt="Retorne um JSON com array 'languages'"
@@ -158,7 +196,10 @@ async def test_groq_json():
 # TESTE: Comparação Groq vs Gemini
 # ======================================
 @router.get("/compare")
-async def test_compare():
+async def test_compare(
+    groq: GroqService = Depends(get_groq_service),
+    gemini: GeminiService = Depends(get_gemini_service),
+):
     """
     Compara resposta do Groq e Gemini para a mesma pergunta
     """
@@ -166,11 +207,9 @@ async def test_compare():
         prompt = "Explique o que é FastAPI em uma frase"
         
         # Groq
-        groq = GroqService()
         groq_response = await groq.generate(prompt=prompt, temperature=0.5)
         
         # Gemini
-        gemini = GeminiService()
         gemini_response = await gemini.generate(prompt=prompt, temperature=0.5)
         
         return {
@@ -1,7 +1,11 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.core.pagination import keyset_page
+from app.core.auth import invalidate_principal
 from app.models.models import User
+from app.services.leaderboard import leaderboard, record_user_points
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -10,14 +14,27 @@ router = APIRouter(prefix="/users", tags=["Users"])
 def create_user(user: dict, db: Session = Depends(get_db)):
     new_user = User(**user)
     db.add(new_user)
+    db.flush()
+    # Entra no ranking global (mesmo com 0 pontos)
+    record_user_points(db, new_user.id, new_user.total_points or 0, "signup")
     db.commit()
     db.refresh(new_user)
     return new_user
 
-# Listar todos usuários
+# Colunas da listagem (sem password_hash e sem os JSONB)
+USER_LIST_COLUMNS = (
+    User.id, User.email, User.name, User.avatar_url, User.total_points,
+    User.level, User.streak_days, User.created_at, User.last_login,
+)
+
+# Listar usuários (paginado)
 @router.get("/")
-def get_users(db: Session = Depends(get_db)):
-    return db.query(User).all()
+def get_users(
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    return keyset_page(db.query(*USER_LIST_COLUMNS), [(User.id, False)], cursor, limit)
 
 # Buscar usuário por ID
 @router.get("/{user_id}")
@@ -33,9 +50,14 @@ def update_user(user_id: int, data: dict, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(404, "User not found")
+    points_before = user.total_points or 0
     for key, value in data.items():
         setattr(user, key, value)
+    points_delta = (user.total_points or 0) - points_before
+    if points_delta:
+        record_user_points(db, user_id, points_delta, "update")
     db.commit()
+    invalidate_principal(user_id)
     return user
 
 # Deletar usuário
@@ -46,4 +68,6 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(404, "User not found")
     db.delete(user)
     db.commit()
+    invalidate_principal(user_id)
+    leaderboard.forget_user(user_id)
     return {"status": "deleted"}
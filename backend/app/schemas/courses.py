@@ -30,9 +30,78 @@ class CourseStructureResponse(BaseModel):
     modules: List[ModuleStructure]
     total_modules: int
     created_at: datetime
+    reused: bool = False  # curso já existente, praticamente igual ao pedido (sem gerar)
+    similarity: Optional[float] = None
 
 class ModuleGenerateResponse(BaseModel):
     """Response do módulo gerado"""
     message: str
     module_id: int
-    title: str
\ No newline at end of file
+    title: str
+
+class LessonTreeItem(BaseModel):
+    """Lição dentro da árvore do curso (content só com include_content=true)"""
+    id: int
+    lesson_index: int
+    title: str
+    content: Optional[str] = None
+    is_approved: Optional[bool] = None
+    estimated_read_time_minutes: Optional[int] = None
+
+class ModuleTree(BaseModel):
+    """Módulo com suas lições, na ordem"""
+    id: int
+    module_index: int
+    title: str
+    description: Optional[str] = None
+    duration_hours: int
+    content_generated: Optional[bool] = None
+    exam_generated: Optional[bool] = None
+    lessons_count: Optional[int] = None
+    lessons: List[LessonTreeItem] = []
+
+class CourseTreeResponse(BaseModel):
+    """Curso completo: Course -> Modules -> Lessons"""
+    id: int
+    title: str
+    description: Optional[str] = None
+    level: str
+    status: Optional[str] = None
+    duration_hours: int
+    modules_count: Optional[int] = None
+    created_at: Optional[datetime] = None
+    modules: List[ModuleTree] = []
+
+class CourseSearchItem(BaseModel):
+    """Curso encontrado pela busca, com o trecho destacado do melhor match"""
+    id: int
+    title: str
+    level: str
+    status: Optional[str] = None
+    tags: List[str] = []
+    created_at: Optional[datetime] = None
+    score: float
+    matches: int
+    matched_in: str  # course | module | lesson
+    matched_title: Optional[str] = None
+    headline: Optional[str] = None  # termos encontrados entre <mark></mark>
+
+class CourseSearchResponse(BaseModel):
+    """Resultado de GET /courses/search"""
+    query: str
+    items: List[CourseSearchItem]
+    limit: int
+    offset: int
+
+class SimilarCourse(BaseModel):
+    """Curso existente parecido com um pedido de geração"""
+    id: int
+    title: str
+    level: str
+    similarity: float
+
+class SimilarCoursesResponse(BaseModel):
+    """Resultado de GET /courses/similar"""
+    items: List[SimilarCourse]
+    threshold: float
+    index: dict
@@ -0,0 +1,26 @@
+# backend/app/schemas/jobs.py
+
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Optional
+from datetime import datetime
+
+class JobCreatedResponse(BaseModel):
+    """Response ao enfileirar um job"""
+    job_id: int
+    status: str
+
+class JobResponse(BaseModel):
+    """Status, progresso e resultado de um job"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    kind: str
+    status: str
+    attempts: int = 0
+    params: dict
+    progress: Optional[dict] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
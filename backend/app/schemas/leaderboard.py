@@ -0,0 +1,30 @@
+# backend/app/schemas/leaderboard.py
+
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+class LeaderboardEntry(BaseModel):
+    """Uma posição do ranking (empatados dividem o rank)"""
+    rank: int
+    user_id: int
+    name: Optional[str] = None
+    avatar_url: Optional[str] = None
+    score: int
+
+class LeaderboardResponse(BaseModel):
+    """Página de um ranking"""
+    board: str  # global, weekly:2026-W42, course:12
+    total: int
+    items: List[LeaderboardEntry]
+    limit: int
+    offset: int
+    snapshot_at: Optional[datetime] = None  # semanas encerradas: lidas do snapshot gravado
+
+class UserRankResponse(BaseModel):
+    """Posição de um usuário e quem está em volta dele"""
+    board: str
+    total: int
+    entry: LeaderboardEntry
+    around: List[LeaderboardEntry]
+    snapshot_at: Optional[datetime] = None
@@ -0,0 +1,28 @@
+# backend/app/schemas/progress.py
+
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from datetime import datetime
+
+# Eventos por requisição em POST /progress/events
+PROGRESS_EVENTS_MAX_BATCH = 500
+# Ids são int4 no banco: fora disso o lote inteiro falharia no flush
+INT4_MAX = 2**31 - 1
+
+class ProgressEvent(BaseModel):
+    """Tempo de estudo numa lição ou conclusão de lição"""
+    event_id: str = Field(..., min_length=1, max_length=100)  # Gerado pelo cliente; reenviar o mesmo não conta de novo
+    type: Literal["time_spent", "lesson_completed"]
+    user_id: int = Field(..., ge=1, le=INT4_MAX)
+    lesson_id: int = Field(..., ge=1, le=INT4_MAX)
+    seconds: int = Field(0, ge=0, le=3600)  # Tempo desde o último evento
+    occurred_at: Optional[datetime] = None  # Padrão: hora em que chegou
+
+class ProgressEventBatch(BaseModel):
+    """Lote de eventos (gravados em segundo plano)"""
+    events: List[ProgressEvent] = Field(..., min_length=1, max_length=PROGRESS_EVENTS_MAX_BATCH)
+
+class ProgressEventsAccepted(BaseModel):
+    """Response de POST /progress/events"""
+    accepted: int
+    duplicates: int  # event_id repetido no lote ou ainda no buffer
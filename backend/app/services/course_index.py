@@ -0,0 +1,430 @@
+# backend/app/services/course_index.py
+"""
+Índice local de similaridade entre cursos (detecção de quase-duplicatas)
+
+Antes de gerar um curso novo, POST /courses/generate-structure procura um
+curso já existente praticamente igual (mesmo nível, tópico/objetivo quase
+iguais) e devolve esse curso em vez de rodar todo o pipeline de geração.
+
+Sem modelo de embedding nem serviço externo: cada curso vira um vetor de
+n-gramas com hashing (palavras, pares de palavras e trigramas de
+caracteres, sem acento), normalizado, numa matriz NumPy em memória. A
+consulta é um produto matriz x vetor (cosseno): ~20 ms com 100k cursos
+e dim 512 (200 MB de matriz; COURSE_INDEX_DIM menor reduz os dois).
+
+- Assinatura do curso: tópico + objetivo do pedido que o gerou (gravados
+  em generated_by["request"]); para cursos antigos, título + descrição
+- Carregado do banco em background no startup; até lá a checagem é pulada
+- Cursos criados/alterados por outros workers entram no próximo refresh
+  (COURSE_INDEX_REFRESH_SECONDS, por id e updated_at); antes de
+  reaproveitar, o candidato é conferido com a linha atual do banco
+- COURSE_INDEX_PATH (opcional): salva a matriz no shutdown e recarrega no
+  startup, buscando no banco só o que mudou
+"""
+
+import asyncio
+import os
+import re
+import time
+import unicodedata
+import zlib
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models.models import Course
+
+# ============================================
+# CONFIGURAÇÃO (via .env)
+# ============================================
+COURSE_DEDUP_ENABLED = os.getenv("COURSE_DEDUP_ENABLED", "true").lower() == "true"
+COURSE_DEDUP_THRESHOLD = float(os.getenv("COURSE_DEDUP_THRESHOLD", "0.9"))
+COURSE_INDEX_DIM = int(os.getenv("COURSE_INDEX_DIM", "512"))
+COURSE_INDEX_REFRESH_SECONDS = float(os.getenv("COURSE_INDEX_REFRESH_SECONDS", "30"))
+COURSE_INDEX_PATH = os.getenv("COURSE_INDEX_PATH", "")
+
+# Folga do refresh por updated_at: a coluna recebe o início da transação,
+# que pode commitar depois do refresh seguinte
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+# Peso do tópico em relação ao objetivo: "Python" x "Java" com o mesmo
+# objetivo tem que ficar longe; mesmo tópico com objetivo parecido, perto
+TOPIC_WEIGHT = 0.6
+
+_STOPWORDS = frozenset(
+    "a o as os de da do das dos e em no na nos nas um uma uns umas para pra "
+    "por com sem ao aos que como sobre curso cursos".split()
+)
+# Mantém "+", "#" e "." de nomes de tecnologia (c++, c#, f#, node.js, .net):
+# sem eles "C", "C++" e "C#" viram o mesmo token e contam como duplicata
+_WORD_RE = re.compile(r"\.?\w+(?:[+#]+|(?:\.\w+)+)?")
+_ACCENTS_RE = re.compile("[\u0300-\u036f]")
+
+
+# ============================================
+# VETORIZAÇÃO
+# ============================================
+def normalize(text: str) -> List[str]:
+    """
+    Minúsculas, sem acento, sem stopwords e sem o "s" do plural
+    (menos em nomes com ponto: node.js)
+    """
+    text = _ACCENTS_RE.sub("", unicodedata.normalize("NFKD", (text or "").lower()))
+    return [
+        w[:-1] if len(w) > 4 and w.endswith("s") and "." not in w else w
+        for w in _WORD_RE.findall(text)
+        if w not in _STOPWORDS
+    ]
+
+
+def _signed(feature: str, weight: float, dim: int) -> Tuple[int, float]:
+    h = zlib.crc32(feature.encode())
+    # Bit alto escolhe o sinal: colisões tendem a se cancelar
+    return h % dim, (weight if h & 0x80000000 else -weight)
+
+
+@lru_cache(maxsize=100_000)
+def _word_features(word: str, dim: int) -> Tuple[Tuple[int, float], ...]:
+    """
+    Palavra + trigramas de caractere (pegam variações e erros de digitação).
+    O vocabulário se repete muito entre cursos: o cache evita refazer os hashes.
+    """
+    padded = f" {word} "
+    return (_signed(word, 1.0, dim),) + tuple(
+        _signed(padded[i:i + 3], 0.3, dim) for i in range(len(padded) - 2)
+    )
+
+
+def vectorize(text: str, dim: int = COURSE_INDEX_DIM):
+    """
+    Vetor normalizado (float32) por feature hashing com sinal:
+    palavras, pares de palavras e trigramas de caractere
+    """
+    import numpy as np
+
+    words = normalize(text)
+    pairs = [pair for w in words for pair in _word_features(w, dim)]
+    pairs += [_signed(f"{a} {b}", 0.7, dim) for a, b in zip(words, words[1:])]
+    if not pairs:
+        return np.zeros(dim, dtype=np.float32)
+    indices, weights = zip(*pairs)
+    vector = np.bincount(indices, weights=weights, minlength=dim).astype(np.float32)
+    norm = float(np.linalg.norm(vector))
+    if norm:
+        vector /= norm
+    return vector
+
+
+def embed(topic: str, goal: str, dim: int = COURSE_INDEX_DIM):
+    """
+    Vetor de um pedido: tópico e objetivo vetorizados à parte e somados com peso
+    """
+    import numpy as np
+
+    vector = vectorize(topic, dim) * TOPIC_WEIGHT + vectorize(goal, dim) * (1 - TOPIC_WEIGHT)
+    norm = float(np.linalg.norm(vector))
+    if norm:
+        vector /= norm
+    return vector
+
+
+def course_signature(title: str, description: Optional[str], generated_by: Optional[dict]) -> Tuple[str, str]:
+    """
+    (tópico, objetivo) do pedido que gerou o curso; cursos antigos, sem o
+    pedido gravado, usam (título, descrição)
+    """
+    request = generated_by.get("request") if isinstance(generated_by, dict) else None
+    if request and request.get("topic"):
+        return request["topic"], request.get("goal") or ""
+    return title or "", description or ""
+
+
+# ============================================
+# ÍNDICE
+# ============================================
+class CourseIndex:
+    """
+    Matriz (cursos x dim) com crescimento amortizado. Usado só no event
+    loop; a vetorização em lote roda numa thread e o resultado é trocado
+    de uma vez. add_course/discard podem vir das rotas síncronas (threadpool):
+    a escrita é repassada ao loop (call_soon_threadsafe).
+    """
+
+    def __init__(self, dim: int = COURSE_INDEX_DIM, threshold: float = COURSE_DEDUP_THRESHOLD):
+        self.dim = dim
+        self.threshold = threshold
+        self._vectors = None          # np.ndarray (capacidade x dim)
+        self._ids: List[int] = []     # linha -> course_id
+        self._levels: List[str] = []  # linha -> nível
+        self._level_codes = None      # np.ndarray: linha -> código do nível (filtro vetorizado)
+        self._codes: Dict[str, int] = {}
+        self._rows: Dict[int, int] = {}
+        self.ready = False
+        self._max_id = 0
+        self._last_refresh = 0.0
+        self._refreshed_at: Optional[datetime] = None  # relógio do banco
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # ----------------------------------------
+    # Escrita
+    # ----------------------------------------
+    def _ensure_capacity(self, size: int):
+        import numpy as np
+
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2, 64)
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        codes = np.zeros(capacity, dtype=np.int16)
+        if self._vectors is not None:
+            vectors[:len(self._ids)] = self._vectors[:len(self._ids)]
+            codes[:len(self._ids)] = self._level_codes[:len(self._ids)]
+        self._vectors, self._level_codes = vectors, codes
+
+    def add(self, course_id: int, level: str, signature: Tuple[str, str] = ("", ""), vector=None):
+        if vector is None:
+            vector = embed(*signature, dim=self.dim)
+        row = self._rows.get(course_id)
+        if row is None:
+            row = len(self._ids)
+            self._ensure_capacity(row + 1)
+            self._ids.append(course_id)
+            self._levels.append(level)
+            self._rows[course_id] = row
+        self._vectors[row] = vector
+        self._levels[row] = level
+        self._level_codes[row] = self._codes.setdefault(level, len(self._codes))
+        self._max_id = max(self._max_id, course_id)
+
+    def _in_loop(self, fn, *args):
+        """
+        Executa fn no event loop: direto se já estamos nele, senão
+        agendado (chamada vinda de uma thread)
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            fn(*args)
+        elif self._loop is not None:
+            self._loop.call_soon_threadsafe(fn, *args)
+
+    def add_course(self, course_id: int, level: str, title: str, description: Optional[str], generated_by: Optional[dict]):
+        """
+        Curso criado/alterado pelas rotas. Antes da carga terminar não faz
+        nada: a carga lê o banco e já traz o curso. Pode ser chamado de
+        qualquer thread.
+        """
+        if self.ready:
+            vector = embed(*course_signature(title, description, generated_by), dim=self.dim)
+            self._in_loop(self.add, course_id, level, ("", ""), vector)
+
+    def discard(self, course_id: int):
+        """
+        Curso apagado. Pode ser chamado de qualquer thread.
+        """
+        if self.ready:
+            self._in_loop(self.remove, course_id)
+
+    def remove(self, course_id: int):
+        """
+        Troca a linha removida pela última (O(1))
+        """
+        row = self._rows.pop(course_id, None)
+        if row is None:
+            return
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._vectors[row] = self._vectors[last]
+            self._ids[row] = moved
+            self._levels[row] = self._levels[last]
+            self._level_codes[row] = self._level_codes[last]
+            self._rows[moved] = row
+        self._ids.pop()
+        self._levels.pop()
+
+    # ----------------------------------------
+    # Consulta
+    # ----------------------------------------
+    def search(self, topic: str, goal: str = "", level: Optional[str] = None, k: int = 5) -> List[Tuple[int, float]]:
+        """
+        [(course_id, similaridade)] dos k mais parecidos (cosseno)
+        """
+        import numpy as np
+
+        size = len(self._ids)
+        if not size:
+            return []
+        scores = self._vectors[:size] @ embed(topic, goal, self.dim)
+        if level is not None:
+            if level not in self._codes:
+                return []
+            scores = np.where(self._level_codes[:size] == self._codes[level], scores, -np.inf)
+        k = min(k, size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._ids[i], float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    async def find_duplicate(self, db: AsyncSession, topic: str, goal: str, level: str) -> Optional[Tuple[int, float]]:
+        """
+        Curso existente acima do limiar para o pedido, ou None
+        """
+        if not (COURSE_DEDUP_ENABLED and self.ready):
+            return None
+        if time.monotonic() - self._last_refresh > COURSE_INDEX_REFRESH_SECONDS:
+            await self.refresh(db)
+
+        best = self.search(topic, goal, level=level, k=1)
+        if best and best[0][1] >= self.threshold:
+            self.hits += 1
+            return best[0]
+        self.misses += 1
+        return None
+
+    # ----------------------------------------
+    # Carga / sincronização com o banco
+    # ----------------------------------------
+    async def _load_rows(self, db: AsyncSession, *where) -> list:
+        return (await db.execute(
+            select(Course.id, Course.level, Course.title, Course.description, Course.generated_by)
+            .where(*where)
+            .order_by(Course.id)
+        )).all()
+
+    async def _add_rows(self, rows: list):
+        import numpy as np
+
+        if not rows:
+            return
+        signatures = [course_signature(r.title, r.description, r.generated_by) for r in rows]
+        # Vetorizar milhares de cursos é CPU puro: fora do event loop
+        vectors = await asyncio.to_thread(
+            lambda: np.stack([embed(*s, dim=self.dim) for s in signatures])
+        )
+        for row, vector in zip(rows, vectors):
+            self.add(row.id, row.level, vector=vector)
+
+    async def refresh(self, db: AsyncSession):
+        """
+        Traz os cursos criados ou alterados depois da última carga
+        (ex: por outro worker)
+        """
+        self._last_refresh = time.monotonic()
+        refreshed_at = await db.scalar(select(func.now()))
+        changed = Course.id > self._max_id
+        if self._refreshed_at is not None:
+            changed = or_(changed, Course.updated_at > self._refreshed_at - REFRESH_OVERLAP)
+        await self._add_rows(await self._load_rows(db, changed))
+        self._refreshed_at = refreshed_at
+
+    def confirm(self, course: Course, topic: str, goal: str, level: str) -> Optional[float]:
+        """
+        Confere o candidato com a linha atual do banco antes de reaproveitar
+        (pode ter sido alterado por outro worker depois do último refresh).
+        Atualiza o índice e retorna a similaridade, ou None se não serve mais.
+        """
+        vector = embed(*course_signature(course.title, course.description, course.generated_by), dim=self.dim)
+        self.add(course.id, course.level, vector=vector)
+        similarity = float(vector @ embed(topic, goal, self.dim))
+        if course.level != level or similarity < self.threshold:
+            return None
+        return similarity
+
+    async def load(self):
+        """
+        Carga completa (ou a partir do arquivo salvo + diferença no banco)
+        """
+        started = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            if self._load_file():
+                # Remove os que sumiram do banco; os novos vêm no refresh
+                existing = set((await db.scalars(select(Course.id))).all())
+                for course_id in [c for c in self._ids if c not in existing]:
+                    self.remove(course_id)
+            await self.refresh(db)
+        self.ready = True
+        print(f"✅ Índice de cursos carregado: {len(self)} cursos em {time.perf_counter() - started:.2f}s")
+
+    async def start(self):
+        if not COURSE_DEDUP_ENABLED:
+            return
+        self._loop = asyncio.get_running_loop()
+
+        async def run():
+            try:
+                await self.load()
+            except Exception as e:
+                print(f"⚠️ Índice de cursos indisponível (dedup desligado): {e}")
+
+        self._task = asyncio.create_task(run(), name="course-index-load")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._loop = None
+        if self.ready and COURSE_INDEX_PATH:
+            await asyncio.to_thread(self._save_file)
+
+    # ----------------------------------------
+    # Persistência (opcional)
+    # ----------------------------------------
+    def _save_file(self):
+        import numpy as np
+
+        size = len(self._ids)
+        # Arquivo aberto aqui: np.savez com caminho acrescentaria ".npz"
+        with open(COURSE_INDEX_PATH, "wb") as f:
+            np.savez(
+                f,
+                dim=self.dim,
+                ids=np.array(self._ids, dtype=np.int64),
+                levels=np.array(self._levels, dtype=str),
+                vectors=self._vectors[:size] if size else np.zeros((0, self.dim), dtype=np.float32),
+            )
+
+    def _load_file(self) -> bool:
+        if not (COURSE_INDEX_PATH and os.path.exists(COURSE_INDEX_PATH)):
+            return False
+        import numpy as np
+
+        try:
+            with np.load(COURSE_INDEX_PATH) as data:
+                if int(data["dim"]) != self.dim:
+                    return False
+                ids, levels, vectors = data["ids"].tolist(), data["levels"].tolist(), data["vectors"]
+        except Exception as e:
+            print(f"⚠️ Não foi possível ler {COURSE_INDEX_PATH}: {e}")
+            return False
+        for course_id, level, vector in zip(ids, levels, vectors):
+            self.add(course_id, level, vector=vector)
+        # Alterados depois de salvar o arquivo entram no refresh
+        self._refreshed_at = datetime.fromtimestamp(os.path.getmtime(COURSE_INDEX_PATH), timezone.utc)
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "enabled": COURSE_DEDUP_ENABLED,
+            "ready": self.ready,
+            "courses": len(self),
+            "dim": self.dim,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+course_index = CourseIndex()
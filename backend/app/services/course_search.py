@@ -0,0 +1,185 @@
+# backend/app/services/course_search.py
+"""
+Busca full-text no catálogo (GET /courses/search)
+
+Usa as colunas search_vector (tsvector gerado pelo Postgres, com índice
+GIN) de courses, modules e lessons, numa única query:
+
+  1. cada tabela acha seus matches pelo índice (search_vector @@ query),
+     já com os filtros de tags (GIN em courses.tags), nível e status do
+     curso, até SEARCH_MAX_CANDIDATES por tabela
+  2. os matches viram candidatos por curso; a nota do curso é a soma das
+     notas (ts_rank_cd, com peso menor para módulo e lição)
+  3. ordenação pela nota e LIMIT
+  4. só para os cursos da página: ts_headline do melhor match (o trecho
+     destacado é caro, por isso fica depois do LIMIT)
+"""
+
+import os
+from typing import List, Optional
+
+from sqlalchemy import and_, case, func, literal, literal_column, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Course, Module, Lesson
+
+# Mesmo dicionário das colunas geradas (migration 0003)
+SEARCH_CONFIG = literal_column("'portuguese'")
+
+# Peso de um match em módulo/lição em relação a um match no próprio curso
+SEARCH_MODULE_WEIGHT = float(os.getenv("SEARCH_MODULE_WEIGHT", "0.6"))
+SEARCH_LESSON_WEIGHT = float(os.getenv("SEARCH_LESSON_WEIGHT", "0.4"))
+
+# Teto de matches por tabela que entram no ranking. Termos muito comuns
+# casam com boa parte do catálogo; calcular a nota de todos custaria
+# segundos, então a ordenação fica restrita a esse lote. O lote sai na
+# ordem do índice, não da nota: quando uma tabela passa do teto, o
+# resultado é aproximado (os mais relevantes do lote, não do catálogo).
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", "2000"))
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+
+def _headline(document, query):
+    return func.ts_headline(SEARCH_CONFIG, document, query, HEADLINE_OPTIONS)
+
+
+async def search_courses(
+    db: AsyncSession,
+    q: str,
+    tags: Optional[List[str]] = None,
+    level: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[dict]:
+    """
+    Cursos que casam com q (sintaxe de busca web: "frase exata", -excluir, or),
+    do mais relevante para o menos relevante
+    """
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+    # Filtros do curso (tags com GIN em courses.tags, nível, status):
+    # aplicados já na busca de candidatos, antes do teto por tabela
+    filters = []
+    if tags:
+        filters.append(Course.tags.contains(tags))  # @> usa idx_courses_tags
+    if level:
+        filters.append(Course.level == level)
+    if status:
+        filters.append(Course.status == status)
+
+    def candidates(model, *columns, joins=()):
+        # Até SEARCH_MAX_CANDIDATES matches pelo índice GIN, sem ordem: a
+        # nota (ts_rank_cd) só é calculada para eles (ver SEARCH_MAX_CANDIDATES)
+        statement = select(model.id, model.search_vector, *columns)
+        for target, onclause in joins:
+            statement = statement.join(target, onclause)
+        return (
+            statement
+            .where(model.search_vector.op("@@")(tsquery), *filters)
+            .limit(SEARCH_MAX_CANDIDATES)
+            .subquery()
+        )
+
+    # Módulos e lições só passam pelo curso quando há filtro
+    course_join = [(Course, Course.id == Module.course_id)] if filters else []
+    courses = candidates(Course)
+    modules = candidates(Module, Module.course_id, joins=course_join)
+    lessons = candidates(
+        Lesson, Module.course_id,
+        joins=[(Module, Module.id == Lesson.module_id), *course_join]
+    )
+
+    course_hits = select(
+        courses.c.id.label("course_id"),
+        literal("course").label("source"),
+        courses.c.id.label("source_id"),
+        func.ts_rank_cd(courses.c.search_vector, tsquery).label("rank"),
+    )
+    module_hits = select(
+        modules.c.course_id,
+        literal("module"),
+        modules.c.id,
+        func.ts_rank_cd(modules.c.search_vector, tsquery) * SEARCH_MODULE_WEIGHT,
+    )
+    lesson_hits = select(
+        lessons.c.course_id,
+        literal("lesson"),
+        lessons.c.id,
+        func.ts_rank_cd(lessons.c.search_vector, tsquery) * SEARCH_LESSON_WEIGHT,
+    )
+    hits = union_all(course_hits, module_hits, lesson_hits).subquery("hits")
+
+    # Uma linha por curso: o melhor match (DISTINCT ON) e a soma das notas
+    best = (
+        select(
+            hits.c.course_id,
+            hits.c.source,
+            hits.c.source_id,
+            func.sum(hits.c.rank).over(partition_by=hits.c.course_id).label("score"),
+            func.count().over(partition_by=hits.c.course_id).label("matches"),
+        )
+        .distinct(hits.c.course_id)
+        .order_by(hits.c.course_id, hits.c.rank.desc())
+        .subquery("best")
+    )
+
+    page = (
+        select(best, Course.title, Course.level, Course.status, Course.tags, Course.created_at)
+        .join(Course, Course.id == best.c.course_id)
+        .order_by(best.c.score.desc(), best.c.course_id.desc())
+        .limit(limit)
+        .offset(offset)
+        .subquery("page")
+    )
+
+    # Trecho destacado só para as linhas da página
+    headline = case(
+        (page.c.source == "lesson", _headline(func.coalesce(Lesson.content, Lesson.title), tsquery)),
+        (page.c.source == "module", _headline(func.concat_ws(". ", Module.title, Module.description), tsquery)),
+        else_=_headline(func.concat_ws(". ", Course.title, Course.description), tsquery),
+    )
+    matched_title = case(
+        (page.c.source == "lesson", Lesson.title),
+        (page.c.source == "module", Module.title),
+        else_=page.c.title,
+    )
+    statement = (
+        select(
+            page.c.course_id,
+            page.c.title,
+            page.c.level,
+            page.c.status,
+            page.c.tags,
+            page.c.created_at,
+            page.c.score,
+            page.c.matches,
+            page.c.source,
+            matched_title.label("matched_title"),
+            headline.label("headline"),
+        )
+        .select_from(page)
+        .join(Course, Course.id == page.c.course_id)
+        .outerjoin(Lesson, and_(page.c.source == "lesson", Lesson.id == page.c.source_id))
+        .outerjoin(Module, and_(page.c.source == "module", Module.id == page.c.source_id))
+        .order_by(page.c.score.desc(), page.c.course_id.desc())
+    )
+
+    rows = (await db.execute(statement)).mappings().all()
+    return [
+        {
+            "id": row["course_id"],
+            "title": row["title"],
+            "level": row["level"],
+            "status": row["status"],
+            "tags": row["tags"] or [],
+            "created_at": row["created_at"],
+            "score": round(float(row["score"]), 4),
+            "matches": row["matches"],
+            "matched_in": row["source"],
+            "matched_title": row["matched_title"],
+            "headline": row["headline"],
+        }
+        for row in rows
+    ]
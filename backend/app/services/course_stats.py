@@ -0,0 +1,271 @@
+# backend/app/services/course_stats.py
+"""
+Estatísticas dos cursos mantidas de forma incremental
+
+courses.total_enrollments, courses.completions_count e
+courses.average_completion_rate são atualizados a partir dos eventos de
+progresso (criar / alterar / apagar Progress), sem GROUP BY sobre a
+tabela progress na leitura:
+
+- inscrição: primeiro Progress de um (usuário, curso); sai quando o último some
+- conclusão: Progress com status 'completed'
+- taxa de conclusão = conclusões / (inscritos x módulos do curso), em %
+
+Os eventos só somam deltas em memória; um loop grava tudo a cada
+COURSE_STATS_FLUSH_SECONDS num único UPDATE (soma atômica no banco, então
+vários workers podem gravar ao mesmo tempo). Uma reconciliação periódica
+(COURSE_STATS_RECONCILE_SECONDS) recalcula do zero e corrige o que se
+perdeu (deltas não gravados num crash, corridas entre requisições, mudança
+de modules_count).
+
+A recontagem já inclui os eventos que outros workers ainda não gravaram:
+ela marca os cursos corrigidos com courses.stats_reconciled_at e o flush
+descarta o delta de um curso quando o último evento dele é anterior a
+essa marca. Um delta com eventos dos dois lados da marca (janela de um
+flush) ainda pode sair errado; a reconciliação seguinte corrige.
+
+average_rating não entra: ainda não existe avaliação de curso no esquema.
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import DateTime, Integer, bindparam, func, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models.models import Progress
+
+# ============================================
+# CONFIGURAÇÃO (via .env)
+# ============================================
+COURSE_STATS_FLUSH_SECONDS = float(os.getenv("COURSE_STATS_FLUSH_SECONDS", "5"))
+COURSE_STATS_RECONCILE_SECONDS = float(os.getenv("COURSE_STATS_RECONCILE_SECONDS", "3600"))
+
+# Chave do advisory lock: só um worker reconcilia por vez
+RECONCILE_LOCK_KEY = 0x4E494153  # "NIAS"
+
+# LEAST ignora NULL: o COALESCE fica dentro (curso sem módulos/inscritos = 0)
+COMPLETION_RATE_SQL = (
+    "LEAST(100, COALESCE(ROUND(100.0 * {completions} "
+    "/ NULLIF({enrollments} * COALESCE(courses.modules_count, 0), 0), 2), 0))"
+)
+
+FLUSH_SQL = text(f"""
+    UPDATE courses SET
+        total_enrollments = GREATEST(0, COALESCE(total_enrollments, 0) + d.enrollments),
+        completions_count = GREATEST(0, COALESCE(completions_count, 0) + d.completions),
+        average_completion_rate = {COMPLETION_RATE_SQL.format(
+            completions="GREATEST(0, COALESCE(completions_count, 0) + d.completions)",
+            enrollments="GREATEST(0, COALESCE(total_enrollments, 0) + d.enrollments)",
+        )}
+    FROM unnest(:ids, :enrollments, :completions, :recorded_at)
+         AS d(course_id, enrollments, completions, recorded_at)
+    WHERE courses.id = d.course_id
+      -- Eventos anteriores à última reconciliação já estão na recontagem
+      AND (courses.stats_reconciled_at IS NULL OR d.recorded_at > courses.stats_reconciled_at)
+""").bindparams(
+    bindparam("ids", type_=ARRAY(Integer)),
+    bindparam("enrollments", type_=ARRAY(Integer)),
+    bindparam("completions", type_=ARRAY(Integer)),
+    bindparam("recorded_at", type_=ARRAY(DateTime(timezone=True))),
+)
+
+ACTUAL_RATE_SQL = COMPLETION_RATE_SQL.format(
+    completions="actual.completions", enrollments="actual.enrollments"
+)
+
+# Recalcula tudo a partir de progress; só reescreve os cursos que divergem
+# (a taxa também: modules_count pode ter mudado sem nenhum evento). now() é
+# o início da transação, antes do snapshot da recontagem.
+RECONCILE_SQL = text(f"""
+    WITH actual AS (
+        SELECT c.id,
+               COALESCE(p.enrollments, 0) AS enrollments,
+               COALESCE(p.completions, 0) AS completions
+        FROM courses c
+        LEFT JOIN (
+            SELECT course_id,
+                   COUNT(DISTINCT user_id) AS enrollments,
+                   COUNT(*) FILTER (WHERE status = 'completed') AS completions
+            FROM progress
+            GROUP BY course_id
+        ) p ON p.course_id = c.id
+    )
+    UPDATE courses SET
+        total_enrollments = actual.enrollments,
+        completions_count = actual.completions,
+        average_completion_rate = {ACTUAL_RATE_SQL},
+        stats_reconciled_at = now()
+    FROM actual
+    WHERE courses.id = actual.id
+      AND (courses.total_enrollments IS DISTINCT FROM actual.enrollments
+           OR courses.completions_count IS DISTINCT FROM actual.completions
+           OR courses.average_completion_rate IS DISTINCT FROM {ACTUAL_RATE_SQL})
+""")
+
+
+class CourseStatsAggregator:
+    """
+    Deltas por curso em memória + loop de flush/reconciliação
+    """
+
+    def __init__(
+        self,
+        flush_seconds: float = COURSE_STATS_FLUSH_SECONDS,
+        reconcile_seconds: float = COURSE_STATS_RECONCILE_SECONDS,
+    ):
+        self.flush_seconds = flush_seconds
+        self.reconcile_seconds = reconcile_seconds
+        # course_id -> [inscrições, conclusões, instante do último evento]
+        self._pending: Dict[int, list] = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._last_reconcile = time.monotonic()
+        self.events = 0
+        self.flushes = 0
+        self.reconciled_courses = 0
+
+    # ----------------------------------------
+    # Eventos
+    # ----------------------------------------
+    def record(
+        self,
+        course_id: int,
+        enrollments: int = 0,
+        completions: int = 0,
+        recorded_at: Optional[datetime] = None,
+    ):
+        if not (enrollments or completions):
+            return
+        recorded_at = recorded_at or datetime.now(timezone.utc)
+        delta = self._pending.setdefault(course_id, [0, 0, recorded_at])
+        delta[0] += enrollments
+        delta[1] += completions
+        delta[2] = max(delta[2], recorded_at)
+        self.events += 1
+
+    async def _rows_for(self, db: AsyncSession, user_id: int, course_id: int) -> int:
+        return await db.scalar(
+            select(func.count()).select_from(Progress)
+            .where(Progress.user_id == user_id, Progress.course_id == course_id)
+        )
+
+    async def progress_changed(self, db: AsyncSession, before: Optional[dict], after: Optional[dict]):
+        """
+        Chamado depois do commit de um Progress criado (before=None),
+        alterado ou apagado (after=None). before/after: user_id, course_id, status.
+        """
+        key_changed = (
+            before is None or after is None
+            or (before["user_id"], before["course_id"]) != (after["user_id"], after["course_id"])
+        )
+        if not key_changed and before["status"] == after["status"]:
+            return
+
+        if before is not None:
+            completions = -1 if before["status"] == "completed" else 0
+            enrollments = 0
+            if key_changed and not await self._rows_for(db, before["user_id"], before["course_id"]):
+                enrollments = -1
+            self.record(before["course_id"], enrollments, completions)
+
+        if after is not None:
+            completions = 1 if after["status"] == "completed" else 0
+            enrollments = 0
+            if key_changed and await self._rows_for(db, after["user_id"], after["course_id"]) == 1:
+                enrollments = 1
+            self.record(after["course_id"], enrollments, completions)
+
+    # ----------------------------------------
+    # Gravação
+    # ----------------------------------------
+    async def flush(self) -> int:
+        """
+        Grava os deltas acumulados num único UPDATE. Em caso de erro os
+        deltas voltam para a fila.
+        """
+        async with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(FLUSH_SQL, {
+                        "ids": list(pending),
+                        "enrollments": [d[0] for d in pending.values()],
+                        "completions": [d[1] for d in pending.values()],
+                        "recorded_at": [d[2] for d in pending.values()],
+                    })
+                    await db.commit()
+            except Exception:
+                for course_id, (enrollments, completions, recorded_at) in pending.items():
+                    self.record(course_id, enrollments, completions, recorded_at)
+                raise
+            self.flushes += 1
+            return len(pending)
+
+    async def reconcile(self) -> Optional[int]:
+        """
+        Recalcula as estatísticas a partir de progress. Retorna quantos
+        cursos foram corrigidos, ou None se outro worker já está reconciliando.
+        """
+        # Deltas deste worker entram antes; senão seriam contados duas vezes
+        await self.flush()
+        async with AsyncSessionLocal() as db:
+            locked = await db.scalar(
+                text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": RECONCILE_LOCK_KEY}
+            )
+            if not locked:
+                # Outro worker está reconciliando agora: conta como feito,
+                # senão este tentaria de novo a cada flush até o lock soltar
+                self._last_reconcile = time.monotonic()
+                return None
+            result = await db.execute(RECONCILE_SQL)
+            await db.commit()
+        self._last_reconcile = time.monotonic()
+        self.reconciled_courses += result.rowcount
+        if result.rowcount:
+            print(f"🔁 Estatísticas reconciliadas: {result.rowcount} cursos corrigidos")
+        return result.rowcount
+
+    # ----------------------------------------
+    # Ciclo de vida
+    # ----------------------------------------
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await self.flush()
+                if time.monotonic() - self._last_reconcile >= self.reconcile_seconds:
+                    await self.reconcile()
+            except Exception as e:
+                print(f"⚠️ Erro ao gravar estatísticas dos cursos: {e}")
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run(), name="course-stats")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"⚠️ Estatísticas não gravadas no shutdown: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "pending_courses": len(self._pending),
+            "events": self.events,
+            "flushes": self.flushes,
+            "reconciled_courses": self.reconciled_courses,
+        }
+
+
+course_stats = CourseStatsAggregator()
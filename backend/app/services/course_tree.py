@@ -0,0 +1,60 @@
+# backend/app/services/course_tree.py
+"""
+Gravação em lote da árvore de um curso (Course -> Modules -> Lessons)
+
+Em vez de db.add() + flush() por módulo (uma ida ao banco por módulo e o
+unit-of-work do ORM linha a linha), a árvore inteira sai em 3 INSERTs:
+
+  1. INSERT do curso ... RETURNING id, created_at
+  2. INSERT multi-linha dos módulos ... RETURNING id (na ordem enviada)
+  3. INSERT multi-linha das lições
+
+O número de comandos não depende do tamanho da estrutura.
+"""
+
+from typing import List, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Course, Module, Lesson
+
+
+async def save_course_tree(
+    db: AsyncSession,
+    course_values: dict,
+    modules: List[Tuple[dict, List[dict]]],
+) -> Tuple[int, object]:
+    """
+    Insere o curso, os módulos e as lições (sem commit).
+
+    Args:
+        course_values: colunas do Course
+        modules: [(colunas do Module sem course_id, [colunas de cada Lesson sem module_id])]
+
+    Returns:
+        tuple: (course_id, created_at)
+    """
+    course_id, created_at = (await db.execute(
+        insert(Course).values(**course_values).returning(Course.id, Course.created_at)
+    )).one()
+
+    if not modules:
+        return course_id, created_at
+
+    module_rows = [{**values, "course_id": course_id} for values, _ in modules]
+    # sort_by_parameter_order: os ids voltam na mesma ordem das linhas enviadas
+    module_ids = (await db.execute(
+        insert(Module).returning(Module.id, sort_by_parameter_order=True),
+        module_rows
+    )).scalars().all()
+
+    lesson_rows = [
+        {**values, "module_id": module_id}
+        for module_id, (_, lessons) in zip(module_ids, modules)
+        for values in lessons
+    ]
+    if lesson_rows:
+        await db.execute(insert(Lesson), lesson_rows)
+
+    return course_id, created_at
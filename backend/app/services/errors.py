@@ -0,0 +1,43 @@
+# backend/app/services/errors.py
+"""
+Erros dos services de IA, com a classificação usada nos retries
+"""
+
+from typing import Optional
+
+# Status HTTP que valem nova tentativa (limite, timeout, falha do provider)
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class LLMServiceError(Exception):
+    """
+    Falha numa chamada ao provider de IA
+
+    Attributes:
+        provider: "gemini", "groq", ...
+        status_code: status HTTP retornado pelo provider (se houver)
+        retryable: se vale a pena tentar de novo / trocar de provider
+        retry_after: segundos sugeridos pelo provider (header Retry-After)
+    """
+
+    def __init__(
+        self,
+        message: str,
+        provider: Optional[str] = None,
+        status_code: Optional[int] = None,
+        retryable: Optional[bool] = None,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.provider = provider
+        self.status_code = status_code
+        if retryable is None:
+            retryable = status_code in RETRYABLE_STATUS
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, LLMServiceError):
+        return error.retryable
+    return isinstance(error, (TimeoutError, ConnectionError))
@@ -0,0 +1,156 @@
+# backend/app/services/fake_service.py
+"""
+Service de IA falso, local e determinístico (benchmarks e testes de carga)
+
+Mesma interface do GeminiService/GroqService (generate, generate_json,
+generate_stream), sem rede e sem gastar cota. Latência, jitter, taxa de
+erro e tamanho da resposta são configuráveis (via .env ou no construtor).
+
+Só é registrado como provider "fake" com FAKE_LLM_ENABLED=true
+(ver app/agents/registry.py).
+"""
+
+import asyncio
+import hashlib
+import os
+import random
+from typing import AsyncIterator, Optional
+
+from app.core.metrics import llm_call
+from app.services.errors import LLMServiceError
+from app.services.rate_limiter import estimate_tokens
+
+# ============================================
+# CONFIGURAÇÃO (via .env)
+# ============================================
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "500"))
+FAKE_LLM_JITTER_MS = float(os.getenv("FAKE_LLM_JITTER_MS", "100"))
+FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+FAKE_LLM_OUTPUT_WORDS = int(os.getenv("FAKE_LLM_OUTPUT_WORDS", "800"))
+FAKE_LLM_MODULES = int(os.getenv("FAKE_LLM_MODULES", "3"))
+FAKE_LLM_LESSONS = int(os.getenv("FAKE_LLM_LESSONS", "3"))
+FAKE_LLM_SEED = int(os.getenv("FAKE_LLM_SEED", "42"))
+
+_WORDS = (
+    "python função variável lista dicionário classe objeto módulo pacote "
+    "exemplo conceito prática exercício teste código dados algoritmo "
+    "estrutura laço condição retorno parâmetro erro exceção arquivo"
+).split()
+
+
+class FakeLLMService:
+    """
+    Provider local: dorme a latência configurada e devolve texto
+    determinístico (mesmo prompt + mesma seed = mesma resposta)
+    """
+
+    provider = "fake"
+
+    def __init__(
+        self,
+        model_name: str = "fake-llm",
+        latency_ms: float = FAKE_LLM_LATENCY_MS,
+        jitter_ms: float = FAKE_LLM_JITTER_MS,
+        error_rate: float = FAKE_LLM_ERROR_RATE,
+        output_words: int = FAKE_LLM_OUTPUT_WORDS,
+        modules: int = FAKE_LLM_MODULES,
+        lessons: int = FAKE_LLM_LESSONS,
+        seed: int = FAKE_LLM_SEED,
+    ):
+        self.model_name = model_name
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.output_words = output_words
+        self.modules = modules
+        self.lessons = lessons
+        self.seed = seed
+        # Sequência de latências/erros reproduzível entre execuções
+        self._random = random.Random(seed)
+        self.calls = 0
+
+    def _prompt_random(self, prompt: str) -> random.Random:
+        digest = hashlib.sha256(f"{self.seed}:{prompt}".encode()).hexdigest()
+        return random.Random(int(digest[:16], 16))
+
+    async def _simulate_call(self):
+        self.calls += 1
+        delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        failed = self._random.random() < self.error_rate
+        await asyncio.sleep(max(delay, 0) / 1000)
+        if failed:
+            raise LLMServiceError(
+                "❌ Erro simulado do provider fake",
+                provider=self.provider,
+                status_code=503
+            )
+
+    def _lesson_text(self, prompt: str) -> str:
+        rng = self._prompt_random(prompt)
+        words = [rng.choice(_WORDS) for _ in range(self.output_words)]
+        paragraphs = [" ".join(words[i:i + 80]) for i in range(0, len(words), 80)]
+        body = "\n\n".join(f"## Seção {i}\n\n{p}" for i, p in enumerate(paragraphs, start=1))
+        read_time = max(1, self.output_words // 200)
+        return f"# Lição\n\n{body}\n\nestimated_read_time_minutes: {read_time}"
+
+    def _course_structure(self, prompt: str) -> dict:
+        rng = self._prompt_random(prompt)
+        topic = rng.choice(_WORDS).capitalize()
+        return {
+            "title": f"Curso de {topic}",
+            "description": f"Curso gerado pelo provider fake sobre {topic.lower()}.",
+            "modules": [
+                {
+                    "index": m,
+                    "title": f"Módulo {m}: {rng.choice(_WORDS)}",
+                    "description": " ".join(rng.choice(_WORDS) for _ in range(12)),
+                    "lessons": [
+                        {"title": f"Aula {m}.{l}: {rng.choice(_WORDS)}", "content": ""}
+                        for l in range(1, self.lessons + 1)
+                    ],
+                }
+                for m in range(1, self.modules + 1)
+            ],
+        }
+
+    async def generate(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4000
+    ) -> str:
+        with llm_call(self.provider, self.model_name) as call:
+            await self._simulate_call()
+            text = self._lesson_text(prompt)
+            call.tokens(estimate_tokens(prompt), estimate_tokens(text))
+            return text
+
+    async def generate_json(
+        self,
+        prompt: str,
+        temperature: float = 0.3
+    ) -> dict:
+        with llm_call(self.provider, self.model_name) as call:
+            await self._simulate_call()
+            structure = self._course_structure(prompt)
+            call.tokens(estimate_tokens(prompt), estimate_tokens(str(structure)))
+            return structure
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4000
+    ) -> AsyncIterator[str]:
+        await self._simulate_call()
+        text = self._lesson_text(prompt)
+        for i in range(0, len(text), 200):
+            yield text[i:i + 200]
+            await asyncio.sleep(0)
+
+    async def validate_content(self, content: str, criteria: str) -> dict:
+        await self._simulate_call()
+        return {"score": 8, "approved": True, "feedback": "ok", "suggestions": []}
+
+    def stats(self) -> dict:
+        return {"calls": self.calls}
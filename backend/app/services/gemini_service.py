@@ -3,11 +3,78 @@
 Serviço para comunicação com Google Gemini API
 """
 
-import google.generativeai as genai
+import asyncio
 import os
-from typing import Optional
-import json
-import re
+import threading
+from typing import AsyncIterator, Optional
+from app.services.json_extract import extract_json
+from app.services.llm_cache import llm_cache
+from app.services.rate_limiter import get_limiter, single_flight, estimate_tokens
+from app.services.errors import LLMServiceError
+from app.core.executor import BoundedExecutor
+from app.core.metrics import LLMCall, llm_call
+
+
+# ============================================
+# POOL DE THREADS PARA O SDK SÍNCRONO
+# ============================================
+# O SDK do Gemini (generate_content) é bloqueante. Para não congelar o
+# event loop do FastAPI, as chamadas rodam num pool de threads limitado,
+# compartilhado por todas as instâncias do service.
+GEMINI_MAX_WORKERS = int(os.getenv("GEMINI_MAX_WORKERS", "8"))
+
+
+class GeminiExecutor(BoundedExecutor):
+    """
+    Pool de threads do SDK do Gemini (sem limite de fila)
+    """
+
+    def __init__(self, max_workers: int = GEMINI_MAX_WORKERS):
+        super().__init__("gemini", max_workers)
+
+
+_executor: Optional[GeminiExecutor] = None
+
+
+def get_executor() -> GeminiExecutor:
+    """
+    Retorna o pool compartilhado (criado no primeiro uso)
+    """
+    global _executor
+    if _executor is None:
+        _executor = GeminiExecutor()
+    return _executor
+
+
+def _genai():
+    """
+    Importa o SDK só no primeiro uso: google.generativeai (grpc, protobuf)
+    é a parte mais lenta do import do app e nem todo worker usa o Gemini.
+    """
+    import google.generativeai as genai
+    return genai
+
+
+def gemini_error(error: Exception) -> LLMServiceError:
+    """
+    Converte exceções do SDK (google.api_core) em LLMServiceError.
+    As exceções do SDK trazem o status HTTP em `.code` (ex: 429, 503).
+    """
+    status_code = getattr(error, "code", None)
+    if not isinstance(status_code, int):
+        status_code = None
+
+    retryable = None
+    if status_code is None and isinstance(error, (TimeoutError, ConnectionError)):
+        retryable = True
+
+    return LLMServiceError(
+        f"❌ Erro ao chamar Gemini: {str(error)}",
+        provider="gemini",
+        status_code=status_code,
+        retryable=retryable
+    )
+
 
 class GeminiService:
     """
@@ -19,6 +86,8 @@ class GeminiService:
     - Coordenação (Orchestrator)
     """
     
+    provider = "gemini"
+    
     def __init__(self, model_name: str = "gemini-2.5-flash"):
         """
         Inicializa o service do Gemini
@@ -32,9 +101,11 @@ class GeminiService:
             raise ValueError("❌ GEMINI_API_KEY não encontrada no .env!")
         
         # Configura a API
+        genai = _genai()
         genai.configure(api_key=api_key)
         
         # Cria o modelo
+        self.model_name = model_name
         self.model = genai.GenerativeModel(model_name)
         
         print(f"✅ Gemini Service inicializado com modelo: {model_name}")
@@ -57,6 +128,31 @@ class GeminiService:
             str: Texto gerado pela IA
         """
         
+        with llm_call("gemini", self.model_name) as call:
+            # Prompt idêntico já respondido? Devolve do cache
+            cache_key = llm_cache.make_key("gemini", self.model_name, prompt, temperature, max_tokens)
+            cached = await llm_cache.get(cache_key)
+            if cached is not None:
+                call.cache = "hit"
+                return cached
+            
+            # Chamadas idênticas simultâneas compartilham uma única ida à API
+            return await single_flight.do(
+                cache_key,
+                lambda: self._generate(prompt, temperature, max_tokens, cache_key, call)
+            )
+    
+    async def _generate(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        cache_key: str,
+        call: Optional[LLMCall] = None
+    ) -> str:
+        limiter = get_limiter("gemini", self.model_name)
+        await limiter.acquire(estimate_tokens(prompt))
+        
         try:
             # Configurações de geração
             generation_config = {
@@ -64,16 +160,102 @@ class GeminiService:
                 "max_output_tokens": max_tokens,
             }
             
-            # Gera o conteúdo (sícrono, mas rápido)
-            response = self.model.generate_content(
+            # O SDK é síncrono: roda no pool para não travar o event loop
+            response = await get_executor().run(
+                self.model.generate_content,
                 prompt,
                 generation_config=generation_config
             )
             
-            return response.text
+            text = response.text
         
         except Exception as e:
-            raise Exception(f"❌ Erro ao chamar Gemini: {str(e)}")
+            raise gemini_error(e)
+        
+        # Contagem real de tokens quando o SDK informa (usage_metadata)
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", None) or estimate_tokens(prompt)
+        completion_tokens = getattr(usage, "candidates_token_count", None) or estimate_tokens(text)
+        if call is not None:
+            call.tokens(prompt_tokens, completion_tokens)
+        
+        limiter.consume(completion_tokens)
+        await llm_cache.set(cache_key, text)
+        return text
+    
+    async def generate_stream(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4000
+    ) -> AsyncIterator[str]:
+        """
+        Gera texto usando Gemini em streaming (stream=True)
+        
+        Os pedaços chegam de uma thread do pool e são repassados ao
+        event loop por uma fila. Ao final, o texto completo vai para o cache.
+        
+        Yields:
+            str: Pedaços do texto, na ordem em que chegam
+        """
+        
+        cache_key = llm_cache.make_key("gemini", self.model_name, prompt, temperature, max_tokens)
+        cached = await llm_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        limiter = get_limiter("gemini", self.model_name)
+        await limiter.acquire(estimate_tokens(prompt))
+        
+        generation_config = {
+            "temperature": temperature,
+            "max_output_tokens": max_tokens,
+        }
+        
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        cancelled = threading.Event()
+        
+        def produce():
+            try:
+                chunks = self.model.generate_content(
+                    prompt,
+                    generation_config=generation_config,
+                    stream=True
+                )
+                for chunk in chunks:
+                    if cancelled.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk.text)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, finished)
+        
+        producer = asyncio.ensure_future(get_executor().run(produce))
+        parts = []
+        
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                if isinstance(item, Exception):
+                    raise gemini_error(item)
+                parts.append(item)
+                yield item
+        finally:
+            # Cliente desconectou (ou erro): a thread para no próximo pedaço
+            cancelled.set()
+            await producer
+        
+        text = "".join(parts)
+        limiter.consume(estimate_tokens(text))
+        # Stream vazio não vai para o cache: o generate() devolveria uma lição vazia
+        if text:
+            await llm_cache.set(cache_key, text)
     
     async def generate_json(
         self,
@@ -98,24 +280,9 @@ Não use ```json, apenas o JSON puro."""
             temperature=temperature
         )
         
-        # Remove possíveis markdown
-        response = re.sub(r'```json\n?', '', response)
-        response = re.sub(r'```\n?', '', response)
-        response = response.strip()
-        
-        # Converte para dict
-        try:
-            return json.loads(response)
-        except json.JSONDecodeError as e:
-            # Tenta encontrar JSON no texto
-            match = re.search(r'\{.*\}', response, re.DOTALL)
-            if match:
-                try:
-                    return json.loads(match.group())
-                except:
-                    pass
-            
-            raise Exception(f"❌ Resposta não é JSON válido: {response[:200]}...")
+        # Cercas, vírgulas sobrando, comentários e saída truncada são
+        # reparados aqui, sem gastar outra chamada ao modelo
+        return extract_json(response)
     
     async def validate_content(
         self,
@@ -3,12 +3,47 @@
 Serviço para comunicação com Groq API (Llama 3.3)
 """
 
-import httpx
+import json
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+from app.services import http_client
+from app.services.json_extract import extract_json
+from app.services.llm_cache import llm_cache
+from app.services.rate_limiter import get_limiter, single_flight, estimate_tokens
+from app.services.errors import LLMServiceError
+from app.core.metrics import LLMCall, llm_call
+
+if TYPE_CHECKING:
+    import httpx
+
+
+def groq_status_error(response: "httpx.Response") -> LLMServiceError:
+    """
+    Converte uma resposta de erro da API em LLMServiceError
+    (429/5xx viram erros "retryable", com o Retry-After do Groq)
+    """
+    try:
+        error_detail = response.json()
+    except ValueError:
+        error_detail = response.text
+
+    retry_after = response.headers.get("retry-after")
+    try:
+        retry_after = float(retry_after) if retry_after else None
+    except ValueError:
+        retry_after = None
+
+    return LLMServiceError(
+        f"❌ Erro na API do Groq: {error_detail}",
+        provider="groq",
+        status_code=response.status_code,
+        retry_after=retry_after
+    )
+
 
 class GroqService:
 
+    provider = "groq"
     
     def __init__(self, model: str = "llama-3.3-70b-versatile"):
        
@@ -22,14 +57,13 @@ class GroqService:
         
         print(f"✅ Groq Service inicializado com modelo: {model}")
     
-    async def generate(
+    def _build_payload(
         self,
         prompt: str,
-        system_prompt: Optional[str] = None,
-        temperature: float = 0.7,
-        max_tokens: int = 4000
-    ) -> str:
-        
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int
+    ) -> dict:
         # Monta as mensagens
         messages = []
         
@@ -45,48 +79,168 @@ class GroqService:
         })
         
         # Payload da requisição
-        payload = {
+        return {
             "model": self.model,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
         }
-        
-        # Headers
-        headers = {
+    
+    def _headers(self) -> dict:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+    
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4000
+    ) -> str:
+        
+        with llm_call("groq", self.model) as call:
+            # Prompt idêntico já respondido? Devolve do cache
+            cache_key = llm_cache.make_key(
+                "groq", self.model, prompt, temperature, max_tokens, system_prompt
+            )
+            cached = await llm_cache.get(cache_key)
+            if cached is not None:
+                call.cache = "hit"
+                return cached
+            
+            # Chamadas idênticas simultâneas compartilham uma única ida à API
+            return await single_flight.do(
+                cache_key,
+                lambda: self._generate(prompt, system_prompt, temperature, max_tokens, cache_key, call)
+            )
+    
+    async def _generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        cache_key: str,
+        call: Optional[LLMCall] = None
+    ) -> str:
+        limiter = get_limiter("groq", self.model)
+        await limiter.acquire(estimate_tokens(prompt) + estimate_tokens(system_prompt or ""))
+        
+        payload = self._build_payload(prompt, system_prompt, temperature, max_tokens)
+        headers = self._headers()
         
         try:
-            # Faz a chamada HTTP
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    json=payload,
-                    headers=headers
-                )
-                
-                # Verifica se deu erro
-                response.raise_for_status()
-                
-                # Extrai o texto da resposta
-                data = response.json()
-                content = data["choices"][0]["message"]["content"]
+            # Faz a chamada HTTP (cliente compartilhado, conexões reaproveitadas)
+            response = await http_client.post(
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                headers=headers
+            )
+            
+            # Verifica se deu erro
+            if response.status_code >= 400:
+                raise groq_status_error(response)
+            
+            # Extrai o texto da resposta
+            data = response.json()
+            content = data["choices"][0]["message"]["content"]
+            
+            # O Groq informa os tokens reais gerados
+            usage = data.get("usage") or {}
+            completion_tokens = usage.get("completion_tokens") or estimate_tokens(content)
+            limiter.consume(completion_tokens)
+            if call is not None:
+                call.tokens(usage.get("prompt_tokens"), completion_tokens)
+        
+        except LLMServiceError:
+            raise
+        
+        except Exception as e:
+            # Timeout, conexão recusada/caída: vale tentar de novo
+            retryable = http_client.is_transport_error(e)
+            raise LLMServiceError(f"❌ Erro ao chamar Groq: {str(e)}", provider="groq", retryable=retryable)
+        
+        await llm_cache.set(cache_key, content)
+        return content
+    
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4000
+    ) -> AsyncIterator[str]:
+        """
+        Gera texto em streaming (SSE compatível com OpenAI: "data: {...}")
+        
+        Yields:
+            str: Pedaços do texto, na ordem em que chegam
+        """
+        
+        cache_key = llm_cache.make_key(
+            "groq", self.model, prompt, temperature, max_tokens, system_prompt
+        )
+        cached = await llm_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        limiter = get_limiter("groq", self.model)
+        await limiter.acquire(estimate_tokens(prompt) + estimate_tokens(system_prompt or ""))
+        
+        payload = self._build_payload(prompt, system_prompt, temperature, max_tokens)
+        payload["stream"] = True
+        parts = []
+        
+        try:
+            async with http_client.stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                headers=self._headers()
+            ) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    raise groq_status_error(response)
                 
-                return content
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    
+                    try:
+                        delta = json.loads(data)["choices"][0].get("delta", {})
+                    except (ValueError, KeyError, IndexError, TypeError) as e:
+                        raise LLMServiceError(
+                            f"❌ Resposta inválida no stream da Groq: {str(e)}", provider="groq"
+                        )
+                    text = delta.get("content")
+                    if text:
+                        parts.append(text)
+                        yield text
         
-        except httpx.HTTPStatusError as e:
-            error_detail = e.response.json() if e.response else str(e)
-            raise Exception(f"❌ Erro na API do Groq: {error_detail}")
+        except LLMServiceError:
+            raise
         
         except Exception as e:
-            raise Exception(f"❌ Erro ao chamar Groq: {str(e)}")
+            retryable = http_client.is_transport_error(e)
+            raise LLMServiceError(f"❌ Erro ao chamar Groq: {str(e)}", provider="groq", retryable=retryable)
+        
+        text = "".join(parts)
+        limiter.consume(estimate_tokens(text))
+        # Stream vazio não vai para o cache: o generate() devolveria uma lição vazia
+        if text:
+            await llm_cache.set(cache_key, text)
     
     async def generate_json(
         self,
         prompt: str,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.3
     ) -> dict:
         """
         Gera resposta em formato JSON
@@ -101,21 +255,12 @@ class GroqService:
         response = await self.generate(
             prompt=full_prompt,
             system_prompt=system_prompt,
-            temperature=0.3  # Menos criativo para JSON
+            temperature=temperature  # Menos criativo para JSON (padrão 0.3)
         )
         
-        # Remove possíveis markdown ```json
-        import re
-        response = re.sub(r'```json\n?', '', response)
-        response = re.sub(r'```\n?', '', response)
-        response = response.strip()
-        
-        # Converte para dict
-        import json
-        try:
-            return json.loads(response)
-        except json.JSONDecodeError as e:
-            raise Exception(f"❌ Resposta não é JSON válido: {response[:200]}...")
+        # Cercas, vírgulas sobrando, comentários e saída truncada são
+        # reparados aqui, sem gastar outra chamada ao modelo
+        return extract_json(response)
 
 
 # ============================================
@@ -0,0 +1,123 @@
+# backend/app/services/http_client.py
+"""
+Cliente HTTP compartilhado (pool de conexões) para as APIs de IA
+
+Um único httpx.AsyncClient por processo, criado no startup da aplicação
+e fechado no shutdown. Assim as chamadas dos agentes reaproveitam
+conexões TCP/TLS já abertas (keep-alive, HTTP/2) em vez de pagar um
+handshake novo a cada prompt.
+
+O httpx só é importado quando o cliente é criado (startup ou primeiro
+uso), não no import do app.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import httpx
+
+# ============================================
+# CONFIGURAÇÃO (via .env)
+# ============================================
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "120"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "20"))
+HTTP_USE_HTTP2 = os.getenv("HTTP_USE_HTTP2", "true").lower() == "true"
+
+_client: Optional[httpx.AsyncClient] = None
+_host_slots: Dict[str, asyncio.Semaphore] = {}
+
+
+def _http2_available() -> bool:
+    """
+    HTTP/2 no httpx depende do pacote opcional 'h2'
+    """
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def init_http_client() -> httpx.AsyncClient:
+    """
+    Cria o cliente compartilhado (chamado no startup do app)
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        import httpx
+
+        http2 = HTTP_USE_HTTP2 and _http2_available()
+        _client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT_SECONDS,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        print(f"✅ HTTP client compartilhado criado (http2={http2}, max_connections={HTTP_MAX_CONNECTIONS})")
+    return _client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Retorna o cliente compartilhado, criando no primeiro uso
+    (útil fora do app, ex: scripts de teste)
+    """
+    if _client is None or _client.is_closed:
+        return init_http_client()
+    return _client
+
+
+async def close_http_client():
+    """
+    Fecha o cliente compartilhado (chamado no shutdown do app)
+    """
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _host_slots.clear()
+
+
+def is_transport_error(exc: BaseException) -> bool:
+    """
+    Timeout, conexão recusada/caída (httpx.TransportError): vale tentar de novo
+    """
+    import httpx
+    return isinstance(exc, httpx.TransportError)
+
+
+def _host_slot(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).netloc
+    if host not in _host_slots:
+        _host_slots[host] = asyncio.Semaphore(HTTP_MAX_PER_HOST)
+    return _host_slots[host]
+
+
+async def post(url: str, **kwargs) -> httpx.Response:
+    """
+    POST pelo cliente compartilhado, respeitando o limite por host
+    """
+    async with _host_slot(url):
+        return await get_http_client().post(url, **kwargs)
+
+
+@asynccontextmanager
+async def stream(method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+    """
+    Requisição em streaming pelo cliente compartilhado (limite por host)
+    """
+    async with _host_slot(url):
+        async with get_http_client().stream(method, url, **kwargs) as response:
+            yield response
@@ -0,0 +1,260 @@
+# backend/app/services/job_queue.py
+"""
+Fila de jobs em background para a geração de cursos
+
+Sem broker externo: os jobs ficam na tabela generation_jobs (Postgres) e
+um pool de workers asyncio, dentro do próprio processo, consome a fila.
+O endpoint só grava o job e devolve o id; o cliente acompanha o status
+em GET /jobs/{id}.
+
+Vários processos podem consumir a mesma tabela: cada job é reivindicado
+com um UPDATE atômico (status 'queued' -> 'running'), então só um worker
+o executa, mesmo que o id esteja na fila em memória de mais de um
+processo. Enquanto executa, o worker renova heartbeat_at; jobs 'running'
+com heartbeat vencido (JOB_LEASE_SECONDS, worker morto) e jobs 'queued'
+esquecidos voltam para a fila numa varredura periódica (e no startup).
+Um job abandonado que já gastou JOB_MAX_ATTEMPTS tentativas (ex: derruba
+o worker toda vez) vira 'failed' em vez de voltar para a fila.
+"""
+
+import asyncio
+import os
+import traceback
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import request_id_var
+from app.database import AsyncSessionLocal
+from app.models.models import GenerationJob
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Sem heartbeat por esse tempo, o job 'running' é considerado abandonado
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "120"))
+JOB_HEARTBEAT_SECONDS = JOB_LEASE_SECONDS / 4
+
+
+class PermanentJobError(Exception):
+    """
+    Erro que não adianta tentar de novo (ex: curso inexistente)
+    """
+
+
+# handler(db, params, report_progress) -> dict (resultado do job)
+JobHandler = Callable[[AsyncSession, dict, Callable[[dict], Awaitable[None]]], Awaitable[dict]]
+
+
+class JobQueue:
+    """
+    Pool de workers asyncio que executa os jobs gravados no banco
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS):
+        self.workers = workers
+        self._handlers: Dict[str, JobHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: Set[int] = set()  # ids na fila em memória (evita duplicar na varredura)
+        self._tasks: List[asyncio.Task] = []
+
+    def register(self, kind: str, handler: JobHandler):
+        self._handlers[kind] = handler
+
+    # ----------------------------------------
+    # Ciclo de vida
+    # ----------------------------------------
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+        await self._recover()
+        self._tasks.append(asyncio.create_task(self._sweep(), name="job-sweep"))
+        print(f"✅ Fila de jobs iniciada com {self.workers} workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queued.clear()
+
+    def _put(self, job_id: int):
+        if job_id not in self._queued:
+            self._queued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def _recover(self):
+        """
+        Devolve à fila os jobs 'running' cujo worker parou de dar sinal
+        (ou marca como 'failed', se já esgotaram as tentativas) e coloca na
+        fila em memória os 'queued' (se outro processo também os tiver, o
+        UPDATE de _claim decide quem executa)
+        """
+        try:
+            async with AsyncSessionLocal() as db:
+                expired = datetime.now(timezone.utc) - timedelta(seconds=JOB_LEASE_SECONDS)
+                exhausted = func.coalesce(GenerationJob.attempts, 0) >= JOB_MAX_ATTEMPTS
+                statuses = (await db.scalars(
+                    update(GenerationJob)
+                    .where(
+                        GenerationJob.status == "running",
+                        or_(
+                            GenerationJob.heartbeat_at < expired,
+                            and_(GenerationJob.heartbeat_at.is_(None), GenerationJob.started_at < expired),
+                        ),
+                    )
+                    .values(
+                        status=case((exhausted, "failed"), else_="queued"),
+                        error=case(
+                            (exhausted, f"Worker parou de responder em {JOB_MAX_ATTEMPTS} tentativas"),
+                            else_=GenerationJob.error,
+                        ),
+                        finished_at=case((exhausted, func.now()), else_=GenerationJob.finished_at),
+                    )
+                    .returning(GenerationJob.status)
+                )).all()
+                await db.commit()
+                reset = statuses.count("queued")
+                failed = statuses.count("failed")
+
+                queued = (await db.scalars(
+                    select(GenerationJob.id)
+                    .where(GenerationJob.status == "queued")
+                    .order_by(GenerationJob.id)
+                )).all()
+                for job_id in queued:
+                    self._put(job_id)
+                if reset:
+                    print(f"🔁 {reset} jobs abandonados re-enfileirados")
+                if failed:
+                    print(f"❌ {failed} jobs abandonados sem tentativas restantes marcados como failed")
+        except Exception as e:
+            print(f"⚠️ Não foi possível recuperar jobs pendentes: {e}")
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(JOB_LEASE_SECONDS)
+            await self._recover()
+
+    # ----------------------------------------
+    # Enfileirar
+    # ----------------------------------------
+    async def enqueue(self, db: AsyncSession, kind: str, params: dict) -> GenerationJob:
+        if kind not in self._handlers:
+            raise ValueError(f"Tipo de job desconhecido: {kind}")
+        # Antes do commit: sem fila, o job não pode ficar gravado sem ninguém para executar
+        if self._queue is None:
+            raise RuntimeError("Fila de jobs não iniciada")
+
+        job = GenerationJob(kind=kind, params=params, status="queued", progress={})
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+
+        self._put(job.id)
+        return job
+
+    # ----------------------------------------
+    # Worker
+    # ----------------------------------------
+    async def _worker(self, worker_id: int):
+        while True:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            try:
+                await self._run(job_id)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                self._queue.task_done()
+
+    async def _claim(self, db: AsyncSession, job_id: int) -> bool:
+        """
+        'queued' -> 'running' num UPDATE só: se outro worker já pegou o
+        job (ou ele terminou), não afeta nenhuma linha
+        """
+        claimed = await db.scalar(
+            update(GenerationJob)
+            .where(GenerationJob.id == job_id, GenerationJob.status == "queued")
+            .values(
+                status="running",
+                attempts=func.coalesce(GenerationJob.attempts, 0) + 1,
+                started_at=func.now(),
+                heartbeat_at=func.now(),
+            )
+            .returning(GenerationJob.id)
+        )
+        await db.commit()
+        return claimed is not None
+
+    async def _heartbeat(self, job_id: int):
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(GenerationJob)
+                        .where(GenerationJob.id == job_id, GenerationJob.status == "running")
+                        .values(heartbeat_at=func.now())
+                    )
+                    await db.commit()
+            except Exception as e:
+                print(f"⚠️ Heartbeat do job {job_id} falhou: {e}")
+
+    async def _run(self, job_id: int):
+        # Logs do job saem com o id do job no lugar do request id
+        request_id_var.set(f"job-{job_id}")
+        async with AsyncSessionLocal() as db:
+            if not await self._claim(db, job_id):
+                return
+            job = await db.get(GenerationJob, job_id)
+
+            heartbeat = asyncio.create_task(self._heartbeat(job_id), name=f"job-heartbeat-{job_id}")
+            try:
+                await self._execute(db, job)
+            finally:
+                heartbeat.cancel()
+
+    async def _execute(self, db: AsyncSession, job: GenerationJob):
+        async def report_progress(progress: dict):
+            job.progress = dict(progress)
+            await db.commit()
+
+        handler = self._handlers[job.kind]
+        try:
+            result = await handler(db, dict(job.params), report_progress)
+        except Exception as e:
+            traceback.print_exc()
+            await db.rollback()
+            # O rollback expira o job: recarrega antes de mexer nele
+            await db.refresh(job)
+            job.error = str(e)
+            if job.attempts < JOB_MAX_ATTEMPTS and not isinstance(e, PermanentJobError):
+                job.status = "queued"
+                await db.commit()
+                self._put(job.id)
+            else:
+                job.status = "failed"
+                job.finished_at = datetime.now(timezone.utc)
+                await db.commit()
+            return
+
+        job.status = "completed"
+        job.result = result
+        job.error = None
+        job.finished_at = datetime.now(timezone.utc)
+        await db.commit()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers if self._tasks else 0,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "handlers": sorted(self._handlers),
+        }
+
+
+job_queue = JobQueue()
@@ -0,0 +1,188 @@
+# backend/app/services/json_extract.py
+"""
+Extração e reparo de JSON vindo de LLM
+
+Os modelos nem sempre devolvem JSON puro: vem cercado de ```json, com
+texto antes/depois, vírgula sobrando, comentários // (o próprio template
+da estrutura de curso tem), quebras de linha cruas dentro de strings ou
+cortado no meio por limite de tokens. Em vez de gerar tudo de novo,
+extract_json() faz uma única passada balanceando chaves/colchetes e
+conserta o que dá para consertar:
+
+- remove cercas de markdown (fora de strings) e texto fora do JSON
+- remove comentários // e /* */ (fora de strings)
+- remove vírgulas antes de } e ]
+- escapa quebras de linha/tab cruas dentro de strings
+- saída truncada: descarta o último valor incompleto e fecha o que ficou aberto
+
+O parse final usa orjson (bem mais rápido que o json da stdlib) quando
+está instalado.
+"""
+
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson está no requirements.txt
+    orjson = None
+
+# Quantos pontos de início diferentes tentar quando há texto com chaves antes do JSON
+MAX_START_ATTEMPTS = 5
+
+# Cerca de markdown só no começo/fim da resposta: ``` dentro de uma string
+# JSON (ex: exemplo de código numa lição) faz parte do conteúdo
+_FENCE_RE = re.compile(r"```[a-zA-Z0-9_-]*[ \t]*\n?")
+_LEADING_FENCE_RE = re.compile(r"^\s*```[a-zA-Z0-9_-]*[ \t]*\n?")
+_TRAILING_FENCE_RE = re.compile(r"\n?[ \t]*```\s*$")
+_CLOSERS = {"{": "}", "[": "]"}
+_STRING_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+
+class JSONExtractionError(ValueError):
+    """
+    Não foi possível recuperar um JSON válido da resposta
+    """
+
+    def __init__(self, text: str):
+        super().__init__(f"❌ Resposta não é JSON válido: {text[:200]}...")
+        self.text = text
+
+
+def _loads(text: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _parses(text: str) -> Tuple[bool, Any]:
+    try:
+        return True, _loads(text)
+    except ValueError:  # orjson.JSONDecodeError e json.JSONDecodeError herdam de ValueError
+        return False, None
+
+
+def strip_fences(text: str) -> str:
+    """
+    Remove as cercas ``` / ```json do começo e do fim
+    (inclusive a de fechamento ausente)
+    """
+    text = _LEADING_FENCE_RE.sub("", text, count=1)
+    return _TRAILING_FENCE_RE.sub("", text, count=1).strip()
+
+
+def _scan(text: str, start: int) -> Optional[str]:
+    """
+    Copia o JSON que começa em text[start] já reparado.
+    Retorna None se não há nada aproveitável a partir daí.
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    # (tamanho de out, pilha) logo após o último valor completo dentro de
+    # um container: truncado, um objeto pela metade vira nada (não {})
+    safe: Tuple[int, Tuple[str, ...]] = (0, ())
+    in_string = False
+    escape = False
+    i, n = start, len(text)
+
+    while i < n:
+        ch = text[i]
+
+        if in_string:
+            if escape:
+                escape = False
+                out.append(ch)
+            elif ch == "\\":
+                escape = True
+                out.append(ch)
+            elif ch == '"':
+                in_string = False
+                out.append(ch)
+            else:
+                out.append(_STRING_ESCAPES.get(ch, ch))
+            i += 1
+            continue
+
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch == "`" and text.startswith("```", i):
+            # Cerca no meio da resposta (fora de string): ignora
+            i = _FENCE_RE.match(text, i).end()
+            continue
+        elif ch == "/" and text.startswith("//", i):
+            end = text.find("\n", i)
+            i = n if end == -1 else end
+            continue
+        elif ch == "/" and text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        elif ch in _CLOSERS:
+            stack.append(_CLOSERS[ch])
+            out.append(ch)
+        elif ch in "}]":
+            if not stack or ch != stack[-1]:
+                # Fechamento sem par: o JSON acabou antes (ou está quebrado)
+                break
+            _drop_trailing_comma(out)
+            stack.pop()
+            out.append(ch)
+            if not stack:
+                return "".join(out)
+            safe = (len(out), tuple(stack))
+        elif ch == ",":
+            _drop_trailing_comma(out)
+            safe = (len(out), tuple(stack))
+            out.append(ch)
+        else:
+            out.append(ch)
+        i += 1
+
+    # Truncado: volta ao último ponto completo e fecha o que ficou aberto
+    length, open_stack = safe
+    if not open_stack:
+        return None
+    out = out[:length]
+    _drop_trailing_comma(out)
+    out.extend(reversed(open_stack))
+    return "".join(out)
+
+
+def _drop_trailing_comma(out: List[str]):
+    j = len(out) - 1
+    while j >= 0 and out[j].isspace():
+        j -= 1
+    if j >= 0 and out[j] == ",":
+        del out[j:]
+
+
+def extract_json(text: str) -> Any:
+    """
+    Extrai (e repara, se preciso) o primeiro objeto/lista JSON do texto
+
+    Raises:
+        JSONExtractionError: nada recuperável
+    """
+    cleaned = strip_fences(text or "")
+
+    # Caminho rápido: a resposta já é JSON puro
+    ok, value = _parses(cleaned)
+    if ok and isinstance(value, (dict, list)):
+        return value
+
+    start = 0
+    for _ in range(MAX_START_ATTEMPTS):
+        starts = [p for p in (cleaned.find("{", start), cleaned.find("[", start)) if p != -1]
+        if not starts:
+            break
+        start = min(starts)
+        candidate = _scan(cleaned, start)
+        if candidate is not None:
+            ok, value = _parses(candidate)
+            if ok:
+                return value
+        start += 1
+
+    raise JSONExtractionError(cleaned)
@@ -0,0 +1,616 @@
+# backend/app/services/leaderboard.py
+"""
+Leaderboards em memória (GET /leaderboard)
+
+Com ORDER BY total_points DESC OFFSET N, cada página lê e descarta N
+linhas, e "minha posição" vira um COUNT(*) sobre a tabela inteira. Os
+pontos ainda mudam entre uma página e outra. Aqui cada ranking fica em
+memória numa lista ordenada (SortedList de (-pontos, user_id)): posição
+de um usuário, página a partir de qualquer offset e janela em volta de
+um usuário saem em O(log n).
+
+Rankings:
+- global: users.total_points
+- por curso (course:<id>): soma de progress.points_earned do aluno no
+  curso. Carregado na primeira consulta, com no máximo
+  LEADERBOARD_MAX_COURSE_BOARDS em memória (os menos usados saem).
+- semanal (weekly:<ano>-W<semana>): pontos ganhos na semana ISO
+  corrente (UTC)
+
+Sincronização: toda mudança de pontos grava uma linha em point_events na
+mesma transação (record_user_points / record_progress_points, que também
+acordam o loop logo depois do commit). Um loop
+lê os eventos novos (id > último lido) e recalcula, a partir das tabelas
+de origem, a pontuação de quem foi afetado. Reaplicar um evento não
+muda nada, e todos os workers chegam ao mesmo ranking. Ids pulados na
+leitura (transação com id menor que ainda não tinha commitado) ficam
+pendentes e são consultados de novo a cada volta por até
+LEADERBOARD_GAP_SECONDS (depois disso era rollback). A cada
+LEADERBOARD_RELOAD_SECONDS tudo é recarregado do zero: isso corrige
+usuários apagados em outro worker.
+
+Snapshots: a cada LEADERBOARD_SNAPSHOT_SECONDS os rankings alterados
+são gravados em leaderboard_snapshots (até LEADERBOARD_SNAPSHOT_SIZE
+posições). O ranking da semana é gravado uma última vez na virada, e as
+semanas anteriores são lidas de lá.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from sortedcontainers import SortedList
+from sqlalchemy import delete, event, func, insert, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models.models import LeaderboardSnapshot, PointEvent, Progress, User
+
+# ============================================
+# CONFIGURAÇÃO (via .env)
+# ============================================
+LEADERBOARD_SYNC_SECONDS = float(os.getenv("LEADERBOARD_SYNC_SECONDS", "2"))
+LEADERBOARD_SNAPSHOT_SECONDS = float(os.getenv("LEADERBOARD_SNAPSHOT_SECONDS", "300"))
+LEADERBOARD_RELOAD_SECONDS = float(os.getenv("LEADERBOARD_RELOAD_SECONDS", "3600"))
+LEADERBOARD_SNAPSHOT_SIZE = int(os.getenv("LEADERBOARD_SNAPSHOT_SIZE", "1000"))  # 0 = ranking inteiro
+LEADERBOARD_MAX_COURSE_BOARDS = int(os.getenv("LEADERBOARD_MAX_COURSE_BOARDS", "256"))
+
+# Por quanto tempo um id pulado em point_events ainda é esperado
+LEADERBOARD_GAP_SECONDS = float(os.getenv("LEADERBOARD_GAP_SECONDS", "60"))
+
+# Eventos lidos por consulta no loop de sincronização
+SYNC_BATCH_SIZE = 5000
+# Máximo de ids pulados acompanhados (um salto maior fica para o reload)
+MAX_PENDING_GAPS = 10000
+
+# Advisory lock (chave, hashtext(board)): um worker grava cada snapshot por vez
+SNAPSHOT_LOCK_KEY = 0x4E49414C  # "NIAL"
+
+GLOBAL_BOARD = "global"
+
+# (rank, user_id, pontos)
+Entry = Tuple[int, int, int]
+
+
+def course_board(course_id: int) -> str:
+    return f"course:{course_id}"
+
+
+def week_board(when: Optional[datetime] = None) -> str:
+    year, week, _ = (when or datetime.now(timezone.utc)).isocalendar()
+    return f"weekly:{year}-W{week:02d}"
+
+
+def week_start(board: str) -> datetime:
+    """
+    Segunda-feira 00:00 UTC de um ranking weekly:<ano>-W<semana>
+    (ValueError se o nome não estiver nesse formato)
+    """
+    start = datetime.strptime(board.split(":", 1)[1] + "-1", "%G-W%V-%u")
+    return start.replace(tzinfo=timezone.utc)
+
+
+# ============================================
+# EVENTOS DE PONTOS (gravados com a transação da mudança)
+# ============================================
+# Marca em session.info: já existe um notify agendado para o próximo commit
+_NOTIFY_PENDING = "leaderboard_notify"
+
+
+def _notify_after_commit(db):
+    """
+    leaderboard.notify() depois do commit da sessão (antes dele o loop
+    ainda não enxergaria o evento)
+    """
+    session = getattr(db, "sync_session", db)  # AsyncSession -> Session
+    if session.info.get(_NOTIFY_PENDING):
+        return
+    session.info[_NOTIFY_PENDING] = True
+
+    def after_commit(session):
+        session.info.pop(_NOTIFY_PENDING, None)
+        leaderboard.notify()
+
+    event.listen(session, "after_commit", after_commit, once=True)
+
+
+def record_user_points(db, user_id: int, points: int, reason: str):
+    """
+    Mudança em users.total_points (ranking global e semanal): usado por
+    todo caminho que cria usuário ou altera os pontos. Funciona com
+    Session e AsyncSession: só adiciona na sessão; o commit acorda o loop.
+    """
+    db.add(PointEvent(user_id=user_id, points=points, reason=reason))
+    _notify_after_commit(db)
+
+
+def record_progress_points(db, before: Optional[dict], after: Optional[dict]):
+    """
+    Mudança em progress.points_earned (ranking do curso). before/after:
+    user_id, course_id, points_earned; None = progresso criado/apagado.
+    """
+    def add(key: dict, points: int):
+        db.add(PointEvent(
+            user_id=key["user_id"], course_id=key["course_id"], points=points, reason="progress"
+        ))
+        _notify_after_commit(db)
+
+    if before is not None and after is not None \
+            and (before["user_id"], before["course_id"]) == (after["user_id"], after["course_id"]):
+        delta = (after["points_earned"] or 0) - (before["points_earned"] or 0)
+        if delta:
+            add(after, delta)
+        return
+    # Criado, apagado ou trocou de aluno/curso: sai de um ranking e entra no outro
+    if before is not None:
+        add(before, -(before["points_earned"] or 0))
+    if after is not None:
+        add(after, after["points_earned"] or 0)
+
+
+# ============================================
+# RANKING EM MEMÓRIA
+# ============================================
+class RankedBoard:
+    """
+    Pontos por usuário + SortedList de (-pontos, user_id). Empatados
+    dividem o rank (1, 2, 2, 4); na ordem, desempata o user_id.
+    Protegido por lock: as rotas síncronas rodam em threads.
+    """
+
+    def __init__(self, name: str, scores: Optional[Dict[int, int]] = None):
+        self.name = name
+        self._scores: Dict[int, int] = dict(scores or {})
+        self._order = SortedList((-score, user_id) for user_id, score in self._scores.items())
+        self._lock = threading.Lock()
+        self.changed = bool(self._scores)  # alterado desde o último snapshot
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def set(self, user_id: int, score: int):
+        with self._lock:
+            old = self._scores.get(user_id)
+            if old == score:
+                return
+            if old is not None:
+                self._order.remove((-old, user_id))
+            self._scores[user_id] = score
+            self._order.add((-score, user_id))
+            self.changed = True
+
+    def remove(self, user_id: int):
+        with self._lock:
+            old = self._scores.pop(user_id, None)
+            if old is None:
+                return
+            self._order.remove((-old, user_id))
+            self.changed = True
+
+    def _rank(self, score: int) -> int:
+        # Quantos têm mais pontos, + 1 (user_id >= 1: (-score, 0) fica antes de todos os empatados)
+        return self._order.bisect_left((-score, 0)) + 1
+
+    def _entries(self, start: int, stop: int) -> List[Entry]:
+        return [
+            (self._rank(-negative), user_id, -negative)
+            for negative, user_id in self._order.islice(start, stop)
+        ]
+
+    def top(self, limit: int, offset: int = 0) -> List[Entry]:
+        with self._lock:
+            return self._entries(offset, offset + limit)
+
+    def rank(self, user_id: int) -> Optional[Entry]:
+        with self._lock:
+            score = self._scores.get(user_id)
+            if score is None:
+                return None
+            return (self._rank(score), user_id, score)
+
+    def around(self, user_id: int, radius: int) -> List[Entry]:
+        """
+        Até radius posições acima e abaixo do usuário (ele incluído)
+        """
+        with self._lock:
+            score = self._scores.get(user_id)
+            if score is None:
+                return []
+            position = self._order.index((-score, user_id))
+            return self._entries(max(0, position - radius), position + radius + 1)
+
+
+# ============================================
+# SERVIÇO
+# ============================================
+class LeaderboardService:
+    """
+    Rankings em memória + loop de sincronização/snapshot
+    """
+
+    def __init__(
+        self,
+        sync_seconds: float = LEADERBOARD_SYNC_SECONDS,
+        snapshot_seconds: float = LEADERBOARD_SNAPSHOT_SECONDS,
+        reload_seconds: float = LEADERBOARD_RELOAD_SECONDS,
+    ):
+        self.sync_seconds = sync_seconds
+        self.snapshot_seconds = snapshot_seconds
+        self.reload_seconds = reload_seconds
+        self._boards: Dict[str, RankedBoard] = {}  # global + semana corrente
+        self._course_boards: "OrderedDict[str, RankedBoard]" = OrderedDict()  # LRU
+        self._course_lock = asyncio.Lock()
+        self.current_week = week_board()
+        self._last_event_id = 0
+        self._gaps: Dict[int, float] = {}  # id pulado -> quando foi visto
+        self._last_reload = self._last_snapshot = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.ready = False
+        self.events = 0
+        self.snapshots = 0
+        self.reloads = 0
+
+    # ----------------------------------------
+    # Consultas às tabelas de origem
+    # ----------------------------------------
+    @staticmethod
+    def _global_scores():
+        return select(User.id, func.coalesce(User.total_points, 0))
+
+    @staticmethod
+    def _course_scores(*course_ids: int):
+        return (
+            select(Progress.course_id, Progress.user_id, func.coalesce(func.sum(Progress.points_earned), 0))
+            .where(Progress.course_id.in_(course_ids))
+            .group_by(Progress.course_id, Progress.user_id)
+        )
+
+    @staticmethod
+    def _week_scores(board: str):
+        start = week_start(board)
+        return (
+            select(PointEvent.user_id, func.sum(PointEvent.points))
+            .where(
+                PointEvent.course_id.is_(None),
+                PointEvent.created_at >= start,
+                PointEvent.created_at < start + timedelta(days=7),
+            )
+            .group_by(PointEvent.user_id)
+            .having(func.sum(PointEvent.points) != 0)
+        )
+
+    async def _build(self, name: str, statement) -> RankedBoard:
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(statement)).all()
+        # Linhas terminam em (..., user_id, pontos)
+        scores = {row[-2]: int(row[-1]) for row in rows}
+        # Ordenar milhões de entradas leva um tempo: fora do event loop
+        return await asyncio.to_thread(RankedBoard, name, scores)
+
+    # ----------------------------------------
+    # Rankings
+    # ----------------------------------------
+    async def get_board(self, name: str) -> Optional[RankedBoard]:
+        """
+        Ranking em memória pelo nome (global, weekly:..., course:<id>).
+        Ranking de curso é carregado na primeira consulta; None para
+        semanas que não são a corrente.
+        """
+        board = self._boards.get(name)
+        if board is not None or not name.startswith("course:"):
+            return board
+
+        board = self._course_boards.get(name)
+        if board is None:
+            async with self._course_lock:
+                board = self._course_boards.get(name)
+                if board is None:
+                    course_id = int(name.split(":", 1)[1])
+                    board = await self._build(name, self._course_scores(course_id))
+                    self._course_boards[name] = board
+                    # Fora da memória não se perde nada: recarrega da tabela progress
+                    while len(self._course_boards) > LEADERBOARD_MAX_COURSE_BOARDS:
+                        self._course_boards.popitem(last=False)
+        if name in self._course_boards:
+            self._course_boards.move_to_end(name)
+        return board
+
+    def _all_boards(self) -> List[RankedBoard]:
+        return [*self._boards.values(), *self._course_boards.values()]
+
+    async def reload(self):
+        """
+        Recarrega global e semanal do zero; os de curso voltam sob demanda
+        """
+        started = time.perf_counter()
+        # Eventos a partir daqui são reaplicados pelo sync (sem efeito se já contados)
+        async with AsyncSessionLocal() as db:
+            last_event_id = await db.scalar(select(func.coalesce(func.max(PointEvent.id), 0)))
+        current_week = week_board()
+        boards = {
+            GLOBAL_BOARD: await self._build(GLOBAL_BOARD, self._global_scores()),
+            current_week: await self._build(current_week, self._week_scores(current_week)),
+        }
+        self._boards = boards
+        self.current_week = current_week
+        self._course_boards.clear()
+        self._last_event_id = last_event_id
+        self._last_reload = time.monotonic()
+        self.ready = True
+        self.reloads += 1
+        print(
+            f"🏆 Leaderboard carregado: {len(boards[GLOBAL_BOARD])} usuários "
+            f"em {time.perf_counter() - started:.2f}s"
+        )
+
+    async def _roll_week(self):
+        """
+        Virada da semana: snapshot final da que acabou e ranking novo
+        """
+        previous = self._boards.pop(self.current_week, None)
+        self.current_week = week_board()
+        self._boards[self.current_week] = await self._build(
+            self.current_week, self._week_scores(self.current_week)
+        )
+        if previous is not None:
+            previous.changed = True
+            await self._snapshot_board(previous)
+
+    # ----------------------------------------
+    # Sincronização
+    # ----------------------------------------
+    async def sync(self) -> int:
+        """
+        Aplica os point_events novos. Retorna quantos foram lidos.
+        """
+        if week_board() != self.current_week:
+            await self._roll_week()
+
+        now = time.monotonic()
+        self._gaps = {event_id: seen for event_id, seen in self._gaps.items() if now - seen < LEADERBOARD_GAP_SECONDS}
+        new_events = PointEvent.id > self._last_event_id
+        if self._gaps:
+            new_events = or_(new_events, PointEvent.id.in_(list(self._gaps)))
+
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(PointEvent.id, PointEvent.user_id, PointEvent.course_id)
+                .where(new_events)
+                .order_by(PointEvent.id)
+                .limit(SYNC_BATCH_SIZE)
+            )).all()
+            if not rows:
+                return 0
+            self._track_gaps([row.id for row in rows], now)
+
+            users: Set[int] = set()
+            courses: Dict[int, Set[int]] = {}
+            for _, user_id, course_id in rows:
+                if course_id is None:
+                    users.add(user_id)
+                elif course_board(course_id) in self._course_boards:
+                    courses.setdefault(course_id, set()).add(user_id)
+
+            if users:
+                await self._refresh_users(db, users)
+            if courses:
+                await self._refresh_courses(db, courses)
+
+        self._last_event_id = max(self._last_event_id, rows[-1].id)
+        self.events += len(rows)
+        return len(rows)
+
+    def _track_gaps(self, event_ids: List[int], now: float):
+        """
+        Tira da lista os ids pulados que apareceram e registra os novos
+        buracos acima do último id lido
+        """
+        expected = self._last_event_id + 1
+        for event_id in event_ids:
+            if event_id < expected:
+                self._gaps.pop(event_id, None)
+                continue
+            if len(self._gaps) + event_id - expected <= MAX_PENDING_GAPS:
+                self._gaps.update((missing, now) for missing in range(expected, event_id))
+            expected = event_id + 1
+
+    async def _refresh_users(self, db: AsyncSession, users: Set[int]):
+        ids = list(users)
+        totals = dict((await db.execute(self._global_scores().where(User.id.in_(ids)))).all())
+        weekly = dict((await db.execute(
+            self._week_scores(self.current_week).where(PointEvent.user_id.in_(ids))
+        )).all())
+
+        global_board = self._boards[GLOBAL_BOARD]
+        week = self._boards[self.current_week]
+        for user_id in ids:
+            if user_id in totals:
+                global_board.set(user_id, totals[user_id])
+            else:
+                global_board.remove(user_id)  # usuário apagado
+            if user_id in weekly:
+                week.set(user_id, int(weekly[user_id]))
+            else:
+                week.remove(user_id)
+
+    async def _refresh_courses(self, db: AsyncSession, courses: Dict[int, Set[int]]):
+        user_ids = set().union(*courses.values())
+        rows = (await db.execute(
+            self._course_scores(*courses).where(Progress.user_id.in_(user_ids))
+        )).all()
+        scores = {(course_id, user_id): int(score) for course_id, user_id, score in rows}
+
+        for course_id, users in courses.items():
+            board = self._course_boards.get(course_board(course_id))
+            if board is None:
+                continue  # saiu da memória enquanto consultava
+            for user_id in users:
+                score = scores.get((course_id, user_id))
+                if score is None:
+                    board.remove(user_id)  # não tem mais progresso no curso
+                else:
+                    board.set(user_id, score)
+
+    def _forget(self, user_id: int):
+        for board in self._all_boards():
+            board.remove(user_id)
+
+    def forget_user(self, user_id: int):
+        """
+        Usuário apagado: sai dos rankings deste worker na hora (os eventos
+        dele somem junto, em cascata; os outros workers corrigem no reload).
+        Pode ser chamado de qualquer thread.
+        """
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._forget, user_id)
+
+    def notify(self):
+        """
+        Acorda o loop de sincronização logo depois de uma mudança de
+        pontos (em vez de esperar LEADERBOARD_SYNC_SECONDS). Pode ser
+        chamado de qualquer thread.
+        """
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    # ----------------------------------------
+    # Snapshots
+    # ----------------------------------------
+    async def _snapshot_board(self, board: RankedBoard):
+        board.changed = False
+        entries = board.top(LEADERBOARD_SNAPSHOT_SIZE or len(board))
+        try:
+            async with AsyncSessionLocal() as db:
+                locked = await db.scalar(
+                    text("SELECT pg_try_advisory_xact_lock(:key, hashtext(:board))"),
+                    {"key": SNAPSHOT_LOCK_KEY, "board": board.name}
+                )
+                if not locked:
+                    board.changed = True  # outro worker gravando: tenta de novo no próximo
+                    return
+                await db.execute(delete(LeaderboardSnapshot).where(LeaderboardSnapshot.board == board.name))
+                if entries:
+                    await db.execute(insert(LeaderboardSnapshot), [
+                        {
+                            "board": board.name,
+                            "user_id": user_id,
+                            "position": position,
+                            "rank": rank,
+                            "score": score,
+                            "last_event_id": self._last_event_id,
+                        }
+                        for position, (rank, user_id, score) in enumerate(entries, start=1)
+                    ])
+                await db.commit()
+        except Exception:
+            board.changed = True
+            raise
+        self.snapshots += 1
+
+    async def snapshot(self) -> int:
+        """
+        Grava os rankings alterados desde o último snapshot. Retorna quantos.
+        """
+        boards = [board for board in self._all_boards() if board.changed]
+        for board in boards:
+            await self._snapshot_board(board)
+        self._last_snapshot = time.monotonic()
+        return len(boards)
+
+    async def snapshot_page(
+        self, db: AsyncSession, name: str, limit: int, offset: int = 0
+    ) -> Tuple[List[Entry], int, Optional[datetime]]:
+        """
+        Página de um ranking gravado: (entradas, total gravado, data do snapshot)
+        """
+        rows = (await db.execute(
+            select(LeaderboardSnapshot.rank, LeaderboardSnapshot.user_id,
+                   LeaderboardSnapshot.score, LeaderboardSnapshot.taken_at)
+            .where(LeaderboardSnapshot.board == name)
+            .order_by(LeaderboardSnapshot.position)
+            .limit(limit)
+            .offset(offset)
+        )).all()
+        total = await db.scalar(
+            select(func.count()).select_from(LeaderboardSnapshot).where(LeaderboardSnapshot.board == name)
+        )
+        taken_at = rows[0].taken_at if rows else None
+        return [(rank, user_id, score) for rank, user_id, score, _ in rows], total, taken_at
+
+    async def snapshot_around(
+        self, db: AsyncSession, name: str, user_id: int, radius: int
+    ) -> Tuple[Optional[Entry], List[Entry], int, Optional[datetime]]:
+        """
+        Posição de um usuário num ranking gravado e a janela em volta
+        """
+        own = (await db.execute(
+            select(LeaderboardSnapshot.position, LeaderboardSnapshot.rank,
+                   LeaderboardSnapshot.score, LeaderboardSnapshot.taken_at)
+            .where(LeaderboardSnapshot.board == name, LeaderboardSnapshot.user_id == user_id)
+        )).first()
+        if own is None:
+            return None, [], 0, None
+        window, total, _ = await self.snapshot_page(
+            db, name, 2 * radius + 1, max(0, own.position - 1 - radius)
+        )
+        return (own.rank, user_id, own.score), window, total, own.taken_at
+
+    # ----------------------------------------
+    # Ciclo de vida
+    # ----------------------------------------
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.sync_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                if not self.ready or time.monotonic() - self._last_reload >= self.reload_seconds:
+                    await self.reload()
+                else:
+                    while await self.sync() >= SYNC_BATCH_SIZE:
+                        pass
+                if self.ready and time.monotonic() - self._last_snapshot >= self.snapshot_seconds:
+                    await self.snapshot()
+            except Exception as e:
+                print(f"⚠️ Erro ao sincronizar leaderboard: {e}")
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._wake.set()  # primeira volta do loop já carrega os rankings
+        self._task = asyncio.create_task(self._run(), name="leaderboard")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._loop = self._wake = None
+        if self.ready:
+            try:
+                await self.snapshot()
+            except Exception as e:
+                print(f"⚠️ Leaderboard não gravado no shutdown: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "boards": {board.name: len(board) for board in self._all_boards()},
+            "current_week": self.current_week,
+            "last_event_id": self._last_event_id,
+            "pending_gaps": len(self._gaps),
+            "events": self.events,
+            "snapshots": self.snapshots,
+            "reloads": self.reloads,
+        }
+
+
+leaderboard = LeaderboardService()
@@ -0,0 +1,169 @@
+# backend/app/services/lesson_generation.py
+"""
+Geração concorrente do conteúdo das lições (FASE 2)
+
+Gera várias lições ao mesmo tempo (limitado por um semáforo) e salva cada
+Lesson no banco assim que ela termina. O tempo total de um módulo (ou de
+um curso inteiro) fica próximo ao da lição mais lenta, e não à soma.
+"""
+
+import asyncio
+import os
+import re
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import phase
+from app.models.models import Course, Module, Lesson
+
+# Quantas lições são geradas ao mesmo tempo (padrão)
+LESSON_GENERATION_CONCURRENCY = int(os.getenv("LESSON_GENERATION_CONCURRENCY", "3"))
+MAX_LESSON_GENERATION_CONCURRENCY = int(os.getenv("MAX_LESSON_GENERATION_CONCURRENCY", "10"))
+
+_READ_TIME_RE = re.compile(r'^\s*estimated_read_time_minutes\s*:\s*(\d+)\s*$', re.MULTILINE | re.IGNORECASE)
+
+
+def is_lesson_complete(lesson: Lesson):
+    return (
+        lesson.content is not None and
+        lesson.is_approved is True and
+        lesson.generated_by is not None and
+        lesson.estimated_read_time_minutes is not None
+    )
+
+
+def parse_lesson_markdown(text: str) -> Tuple[str, Optional[int]]:
+    """
+    Separa o Markdown da linha final "estimated_read_time_minutes: X"
+    pedida no prompt do SpecialistAgent.
+    """
+    match = None
+    for match in _READ_TIME_RE.finditer(text):
+        pass
+
+    if match is None:
+        # Sem estimativa: ~200 palavras por minuto
+        return text.strip(), max(1, round(len(text.split()) / 200))
+
+    content = (text[:match.start()] + text[match.end():]).strip()
+    return content, int(match.group(1))
+
+
+async def save_lesson_content(db: AsyncSession, lesson_id: int, text: str) -> Optional[int]:
+    """
+    Salva o Markdown gerado na Lesson e marca como completa
+
+    Returns:
+        int: tempo estimado de leitura (minutos)
+    """
+    content, read_time = parse_lesson_markdown(text)
+
+    await db.execute(
+        update(Lesson)
+        .where(Lesson.id == lesson_id)
+        .values(
+            content=content,
+            estimated_read_time_minutes=read_time,
+            generated_by="SpecialistAgent",
+            # Ainda não há ReviewerAgent no pipeline: conteúdo gerado é aprovado
+            is_approved=True,
+        )
+    )
+    await db.commit()
+    return read_time
+
+
+def clamp_concurrency(concurrency: Optional[int]) -> int:
+    if not concurrency:
+        return LESSON_GENERATION_CONCURRENCY
+    return max(1, min(concurrency, MAX_LESSON_GENERATION_CONCURRENCY))
+
+
+async def generate_lessons(
+    db: AsyncSession,
+    orchestrator,
+    course: Course,
+    items: List[Tuple[Module, Lesson]],
+    concurrency: Optional[int] = None,
+    on_progress: Optional[Callable[[dict], Awaitable[None]]] = None,
+) -> List[dict]:
+    """
+    Gera o conteúdo de cada (módulo, lição) em paralelo e salva no banco.
+
+    Cada lição é commitada assim que fica pronta, então uma falha numa
+    lição não perde as outras. await on_progress(resultado) é chamado a
+    cada lição concluída (ou com erro), com a sessão já livre.
+
+    Returns:
+        list: um resultado por lição, na mesma ordem de items
+    """
+    semaphore = asyncio.Semaphore(clamp_concurrency(concurrency))
+    # Uma AsyncSession não aceita operações simultâneas: as escritas
+    # são serializadas (as chamadas ao LLM continuam em paralelo)
+    db_lock = asyncio.Lock()
+
+    # Lê os dados antes de começar: um rollback expira os objetos da sessão
+    course_title = course.title
+    jobs = [(lesson.id, module.id, module.title, lesson.title) for module, lesson in items]
+    module_ids = sorted({module_id for _, module_id, _, _ in jobs})
+
+    async def worker(lesson_id: int, module_id: int, module_title: str, lesson_title: str) -> dict:
+        result = {"lesson_id": lesson_id, "module_id": module_id, "title": lesson_title}
+        try:
+            async with semaphore:
+                with phase("lesson.llm"):
+                    text = await orchestrator.generate_module_structure(
+                        course=course_title,
+                        module=module_title,
+                        lessons=lesson_title
+                    )
+
+            if not text:
+                raise Exception("Resposta vazia do agente")
+
+            async with db_lock:
+                with phase("lesson.save"):
+                    read_time = await save_lesson_content(db, lesson_id, text)
+
+            result.update(status="generated", estimated_read_time_minutes=read_time)
+        except Exception as e:
+            async with db_lock:
+                await db.rollback()
+            result.update(status="failed", error=str(e))
+
+        if on_progress:
+            async with db_lock:
+                await on_progress(result)
+        return result
+
+    results = await asyncio.gather(*(worker(*job) for job in jobs))
+
+    # Marca os módulos cujas lições ficaram todas completas
+    for module_id in module_ids:
+        lessons = (await db.scalars(select(Lesson).where(Lesson.module_id == module_id))).all()
+        if lessons and all(is_lesson_complete(l) for l in lessons):
+            await db.execute(
+                update(Module)
+                .where(Module.id == module_id)
+                .values(
+                    content_generated=True,
+                    generated_by="SpecialistAgent",
+                    ai_model_used=getattr(orchestrator, "provider", None),
+                )
+            )
+    await db.commit()
+
+    return results
+
+
+def summarize(results: List[dict]) -> dict:
+    generated = sum(1 for r in results if r["status"] == "generated")
+    failed = sum(1 for r in results if r["status"] == "failed")
+    return {
+        "total": len(results),
+        "generated": generated,
+        "failed": failed,
+        "lessons": results,
+    }
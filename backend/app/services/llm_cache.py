@@ -0,0 +1,210 @@
+# backend/app/services/llm_cache.py
+"""
+Cache de respostas dos LLMs (Gemini, Groq)
+
+A chave é um hash do conteúdo da chamada:
+(provider, modelo, prompt, system_prompt, temperature, max_tokens).
+Prompts idênticos devolvem a resposta salva em milissegundos, sem
+gastar cota da API.
+
+Dois níveis:
+  1. Memória (LRU, limitado por LLM_CACHE_MAX_ENTRIES)
+  2. Arquivo SQLite local (persiste entre reinícios/workers)
+
+Ambos respeitam o TTL (LLM_CACHE_TTL_SECONDS). Cada nível tem o seu
+lock: um hit em memória não espera o I/O de disco de outra thread, e o
+SQLite só é acessado fora do event loop (asyncio.to_thread).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# ============================================
+# CONFIGURAÇÃO (via .env)
+# ============================================
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+# Caminho vazio desativa o nível persistente
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite3")
+
+
+class LLMCache:
+    """
+    Cache LRU em memória + SQLite, com TTL e contadores de hit/miss
+    """
+
+    def __init__(
+        self,
+        enabled: bool = LLM_CACHE_ENABLED,
+        ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        path: str = LLM_CACHE_PATH,
+    ):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path = path
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # ----------------------------------------
+    # Chave
+    # ----------------------------------------
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system_prompt: Optional[str] = None,
+    ) -> str:
+        raw = json.dumps(
+            [provider, model, prompt, system_prompt, temperature, max_tokens],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # ----------------------------------------
+    # Nível persistente (SQLite)
+    # ----------------------------------------
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if not self.path:
+            return None
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _disk_get(self, key: str) -> Optional[tuple]:
+        with self._disk_lock:
+            db = self._connect()
+            if db is None:
+                return None
+            row = db.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                db.commit()
+                return None
+            return row
+
+    def _disk_set(self, key: str, value: str, expires_at: float):
+        with self._disk_lock:
+            db = self._connect()
+            if db is None:
+                return
+            db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+            db.commit()
+
+    def _disk_clear(self):
+        with self._disk_lock:
+            db = self._connect()
+            if db is not None:
+                db.execute("DELETE FROM llm_cache")
+                db.commit()
+
+    # ----------------------------------------
+    # Nível em memória (LRU)
+    # ----------------------------------------
+    def _memory_get(self, key: str) -> Optional[str]:
+        with self._memory_lock:
+            item = self._memory.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at < time.time():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return value
+
+    def _memory_set(self, key: str, value: str, expires_at: float):
+        with self._memory_lock:
+            self._memory[key] = (value, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    # ----------------------------------------
+    # API pública
+    # ----------------------------------------
+    async def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+
+        value = self._memory_get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        row = await asyncio.to_thread(self._disk_get, key)
+        if row is not None:
+            value, expires_at = row
+            self.hits += 1
+            self.disk_hits += 1
+            # Promove para a memória mantendo o TTL original
+            self._memory_set(key, value, expires_at)
+            return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str):
+        if not self.enabled or value is None:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        self._memory_set(key, value, expires_at)
+        await asyncio.to_thread(self._disk_set, key, value, expires_at)
+
+    async def clear(self):
+        with self._memory_lock:
+            self._memory.clear()
+        await asyncio.to_thread(self._disk_clear)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "persistent_path": self.path or None,
+        }
+
+
+llm_cache = LLMCache()
@@ -0,0 +1,374 @@
+# backend/app/services/progress_events.py
+"""
+Ingestão em lote de eventos de progresso (POST /progress/events)
+
+O cliente manda, a cada poucos segundos por aluno, o tempo de estudo numa
+lição e as conclusões de lição. Gravar cada evento na hora custaria uma
+transação por heartbeat. Por isso os eventos só entram num buffer em
+memória (write-behind), e a cada PROGRESS_EVENTS_FLUSH_SECONDS um flush:
+
+  1. registra os event_id em progress_event_keys (ON CONFLICT DO NOTHING);
+     só os que ainda não existiam são aplicados, e reenvios não contam de novo
+  2. junta os eventos por (aluno, lição)
+  3. faz upsert em lesson_completions (tempo somado, concluída, data da conclusão)
+  4. soma o tempo em progress (linhas já existentes do aluno no módulo da
+     lição) e atualiza last_accessed_at
+
+Tudo numa transação: ou o lote inteiro entra (com as chaves), ou nada
+entra e os eventos voltam para o buffer. Se o erro é do próprio dado
+(ex: id fora de int4: tentar de novo não resolve), o lote é gravado
+em metades até isolar os eventos que falham sozinhos; esses são
+descartados (contados em "dropped") em vez de voltar para o buffer para
+sempre. Eventos aceitos e ainda não gravados se perdem se o processo
+morrer (até PROGRESS_EVENTS_FLUSH_SECONDS de eventos); no shutdown
+normal o buffer é gravado.
+
+O tempo chega em segundos e as colunas são em minutos: o resto (< 60s) de
+cada (aluno, lição) fica guardado para o próximo flush.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import Boolean, DateTime, Integer, String, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
+
+from app.database import AsyncSessionLocal
+
+# ============================================
+# CONFIGURAÇÃO (via .env)
+# ============================================
+PROGRESS_EVENTS_FLUSH_SECONDS = float(os.getenv("PROGRESS_EVENTS_FLUSH_SECONDS", "2"))
+PROGRESS_EVENTS_MAX_PENDING = int(os.getenv("PROGRESS_EVENTS_MAX_PENDING", "50000"))
+# Por quanto tempo um event_id reenviado ainda é reconhecido
+PROGRESS_EVENT_KEY_TTL_HOURS = int(os.getenv("PROGRESS_EVENT_KEY_TTL_HOURS", "168"))
+
+# Intervalo da limpeza de progress_event_keys
+KEY_PRUNE_SECONDS = 3600
+
+KEYS_SQL = text("""
+    INSERT INTO progress_event_keys (user_id, event_id)
+    SELECT * FROM unnest(:user_ids, :event_ids)
+    ON CONFLICT DO NOTHING
+    RETURNING user_id, event_id
+""").bindparams(
+    bindparam("user_ids", type_=ARRAY(Integer)),
+    bindparam("event_ids", type_=ARRAY(String)),
+)
+
+# Aluno ou lição que não existem (mais) são ignorados em vez de derrubar o lote
+COMPLETIONS_SQL = text("""
+    INSERT INTO lesson_completions (user_id, lesson_id, completed, time_spent_minutes, completed_at)
+    SELECT d.user_id, d.lesson_id, d.completed, d.minutes, d.completed_at
+    FROM unnest(:user_ids, :lesson_ids, :completed, :minutes, :completed_at)
+         AS d(user_id, lesson_id, completed, minutes, completed_at)
+    WHERE EXISTS (SELECT 1 FROM users WHERE users.id = d.user_id)
+      AND EXISTS (SELECT 1 FROM lessons WHERE lessons.id = d.lesson_id)
+    ON CONFLICT (user_id, lesson_id) DO UPDATE SET
+        completed = COALESCE(lesson_completions.completed, false) OR EXCLUDED.completed,
+        time_spent_minutes = COALESCE(lesson_completions.time_spent_minutes, 0) + EXCLUDED.time_spent_minutes,
+        completed_at = COALESCE(lesson_completions.completed_at, EXCLUDED.completed_at)
+""").bindparams(
+    bindparam("user_ids", type_=ARRAY(Integer)),
+    bindparam("lesson_ids", type_=ARRAY(Integer)),
+    bindparam("completed", type_=ARRAY(Boolean)),
+    bindparam("minutes", type_=ARRAY(Integer)),
+    bindparam("completed_at", type_=ARRAY(DateTime(timezone=True))),
+)
+
+# Progress é por módulo: o tempo das lições soma no módulo de cada uma
+PROGRESS_SQL = text("""
+    UPDATE progress SET
+        time_spent_minutes = COALESCE(progress.time_spent_minutes, 0) + d.minutes,
+        last_accessed_at = GREATEST(progress.last_accessed_at, d.last_at)
+    FROM (
+        SELECT e.user_id, lessons.module_id, SUM(e.minutes) AS minutes, MAX(e.last_at) AS last_at
+        FROM unnest(:user_ids, :lesson_ids, :minutes, :last_at) AS e(user_id, lesson_id, minutes, last_at)
+        JOIN lessons ON lessons.id = e.lesson_id
+        GROUP BY e.user_id, lessons.module_id
+    ) d
+    WHERE progress.user_id = d.user_id AND progress.module_id = d.module_id
+""").bindparams(
+    bindparam("user_ids", type_=ARRAY(Integer)),
+    bindparam("lesson_ids", type_=ARRAY(Integer)),
+    bindparam("minutes", type_=ARRAY(Integer)),
+    bindparam("last_at", type_=ARRAY(DateTime(timezone=True))),
+)
+
+PRUNE_SQL = text("DELETE FROM progress_event_keys WHERE created_at < now() - make_interval(hours => :hours)")
+
+
+def is_data_error(error: Exception) -> bool:
+    """
+    Erro causado pelo próprio dado do lote (tentar de novo não resolve)
+    """
+    if isinstance(error, (DataError, IntegrityError)):
+        return True
+    # Valor recusado pelo asyncpg ao montar os parâmetros (ex: fora de int4)
+    # chega como DBAPIError genérico; o SQLSTATE da causa diz a classe
+    # (22 = dado inválido, 23 = violação de constraint)
+    cause = getattr(getattr(error, "orig", None), "__cause__", None)
+    return isinstance(error, DBAPIError) and str(getattr(cause, "sqlstate", ""))[:2] in ("22", "23")
+
+
+class EventBufferFull(Exception):
+    """Buffer cheio (o banco não está dando conta): o cliente tenta de novo depois"""
+
+
+@dataclass(frozen=True)
+class PendingEvent:
+    user_id: int
+    lesson_id: int
+    completed: bool
+    seconds: int
+    occurred_at: datetime
+
+
+class ProgressEventBuffer:
+    """
+    Eventos aceitos e ainda não gravados + loop de flush
+    """
+
+    def __init__(self, flush_seconds: float = PROGRESS_EVENTS_FLUSH_SECONDS):
+        self.flush_seconds = flush_seconds
+        # (user_id, event_id) -> evento; o mesmo id reenviado antes do flush é ignorado
+        self._pending: Dict[Tuple[int, str], PendingEvent] = {}
+        # (user_id, lesson_id) -> segundos que ainda não fecharam um minuto
+        self._carry: Dict[Tuple[int, int], int] = {}
+        self._lock = asyncio.Lock()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_prune = time.monotonic()
+        self.accepted = 0
+        self.duplicates = 0
+        self.applied = 0
+        self.dropped = 0
+        self.flushes = 0
+
+    # ----------------------------------------
+    # Eventos
+    # ----------------------------------------
+    def add(self, events: Iterable) -> Tuple[int, int]:
+        """
+        Enfileira eventos (event_id, type, user_id, lesson_id, seconds,
+        occurred_at). Retorna (aceitos, repetidos).
+        """
+        events = list(events)
+        if len(self._pending) + len(events) > PROGRESS_EVENTS_MAX_PENDING:
+            raise EventBufferFull()
+
+        now = datetime.now(timezone.utc)
+        accepted = 0
+        for event in events:
+            key = (event.user_id, event.event_id)
+            if key in self._pending:
+                continue
+            occurred_at = event.occurred_at or now
+            if occurred_at.tzinfo is None:
+                occurred_at = occurred_at.replace(tzinfo=timezone.utc)
+            self._pending[key] = PendingEvent(
+                user_id=event.user_id,
+                lesson_id=event.lesson_id,
+                completed=event.type == "lesson_completed",
+                seconds=event.seconds,
+                occurred_at=min(occurred_at, now),  # relógio do cliente adiantado
+            )
+            accepted += 1
+
+        self.accepted += accepted
+        self.duplicates += len(events) - accepted
+        # Buffer enchendo: grava antes do intervalo
+        if self._wake is not None and len(self._pending) >= PROGRESS_EVENTS_MAX_PENDING // 2:
+            self._wake.set()
+        return accepted, len(events) - accepted
+
+    def _coalesce(self, events: Iterable[PendingEvent], final: bool):
+        """
+        Uma linha por (aluno, lição): colunas para os UPDATE/INSERT em lote
+        e o resto de segundos de cada par depois deste flush
+        """
+        totals: Dict[Tuple[int, int], dict] = {}
+        for event in events:
+            item = totals.setdefault((event.user_id, event.lesson_id), {
+                "seconds": 0, "completed": False, "completed_at": None, "last_at": event.occurred_at,
+            })
+            item["seconds"] += event.seconds
+            item["last_at"] = max(item["last_at"], event.occurred_at)
+            if event.completed:
+                item["completed"] = True
+                item["completed_at"] = min(item["completed_at"] or event.occurred_at, event.occurred_at)
+        if final:
+            # Shutdown: o resto guardado também é gravado (arredondado)
+            for pair in self._carry:
+                totals.setdefault(pair, {"seconds": 0, "completed": False, "completed_at": None, "last_at": None})
+
+        columns = {"user_ids": [], "lesson_ids": [], "completed": [], "minutes": [], "completed_at": [], "last_at": []}
+        carry = {}
+        for (user_id, lesson_id), item in totals.items():
+            seconds = self._carry.get((user_id, lesson_id), 0) + item["seconds"]
+            minutes = round(seconds / 60) if final else seconds // 60
+            carry[(user_id, lesson_id)] = 0 if final else seconds - minutes * 60
+            columns["user_ids"].append(user_id)
+            columns["lesson_ids"].append(lesson_id)
+            columns["completed"].append(item["completed"])
+            columns["minutes"].append(minutes)
+            columns["completed_at"].append(item["completed_at"])
+            columns["last_at"].append(item["last_at"])
+        return columns, carry
+
+    # ----------------------------------------
+    # Gravação
+    # ----------------------------------------
+    async def _write(self, pending: Dict[Tuple[int, str], PendingEvent], final: bool) -> int:
+        """
+        Grava um lote numa transação e atualiza o resto de segundos.
+        Retorna quantos eventos foram aplicados.
+        """
+        async with AsyncSessionLocal() as db:
+            fresh = []
+            if pending:
+                keys = list(pending)
+                rows = await db.execute(KEYS_SQL, {
+                    "user_ids": [user_id for user_id, _ in keys],
+                    "event_ids": [event_id for _, event_id in keys],
+                })
+                fresh = [pending[tuple(row)] for row in rows]
+
+            columns, carry = self._coalesce(fresh, final)
+            if columns["user_ids"]:
+                await db.execute(COMPLETIONS_SQL, {
+                    name: columns[name]
+                    for name in ("user_ids", "lesson_ids", "completed", "minutes", "completed_at")
+                })
+                await db.execute(PROGRESS_SQL, {
+                    name: columns[name] for name in ("user_ids", "lesson_ids", "minutes", "last_at")
+                })
+            await db.commit()
+
+        for pair, seconds in carry.items():
+            if seconds:
+                self._carry[pair] = seconds
+            else:
+                self._carry.pop(pair, None)
+        self.duplicates += len(pending) - len(fresh)
+        self.applied += len(fresh)
+        return len(fresh)
+
+    async def _write_isolating(self, pending: Dict[Tuple[int, str], PendingEvent], remaining: dict, final: bool) -> int:
+        """
+        Grava o lote; com erro de dado, grava em metades até isolar os
+        eventos que falham sozinhos (descartados). Cada evento gravado ou
+        descartado sai de remaining.
+        """
+        try:
+            applied = await self._write(pending, final)
+        except Exception as e:
+            if not is_data_error(e):
+                raise
+            if len(pending) > 1:
+                keys = list(pending)
+                middle = len(keys) // 2
+                first = {key: pending[key] for key in keys[:middle]}
+                second = {key: pending[key] for key in keys[middle:]}
+                return (
+                    await self._write_isolating(first, remaining, final)
+                    + await self._write_isolating(second, remaining, final)
+                )
+            (key, event), = pending.items()
+            print(
+                f"⚠️ Evento de progresso descartado (event_id={key[1]}, user_id={event.user_id}, "
+                f"lesson_id={event.lesson_id}): {getattr(e, 'orig', None) or e}"
+            )
+            remaining.pop(key, None)
+            self.dropped += 1
+            return 0
+        for key in pending:
+            remaining.pop(key, None)
+        return applied
+
+    async def flush(self, final: bool = False) -> int:
+        """
+        Grava o buffer numa transação. Retorna quantos eventos foram
+        aplicados (reenvios de eventos já gravados ficam de fora). Em caso
+        de erro os eventos voltam para o buffer, menos os que têm erro de
+        dado (descartados).
+        """
+        async with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending and not (final and self._carry):
+                return 0
+            remaining = dict(pending)
+            try:
+                if pending:
+                    applied = await self._write_isolating(pending, remaining, final)
+                else:
+                    applied = await self._write(pending, final)  # shutdown: só o resto de segundos
+            except Exception:
+                # Eventos que chegaram durante o flush têm prioridade (mesmo id)
+                for key, event in remaining.items():
+                    self._pending.setdefault(key, event)
+                raise
+
+            self.flushes += 1
+            return applied
+
+    async def prune_keys(self) -> int:
+        """
+        Apaga os event_id mais velhos que PROGRESS_EVENT_KEY_TTL_HOURS
+        """
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(PRUNE_SQL, {"hours": PROGRESS_EVENT_KEY_TTL_HOURS})
+            await db.commit()
+        self._last_prune = time.monotonic()
+        return result.rowcount
+
+    # ----------------------------------------
+    # Ciclo de vida
+    # ----------------------------------------
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+                if time.monotonic() - self._last_prune >= KEY_PRUNE_SECONDS:
+                    await self.prune_keys()
+            except Exception as e:
+                print(f"⚠️ Erro ao gravar eventos de progresso: {e}")
+
+    async def start(self):
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="progress-events")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._wake = None
+        try:
+            await self.flush(final=True)
+        except Exception as e:
+            print(f"⚠️ Eventos de progresso não gravados no shutdown: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "carried_pairs": len(self._carry),
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+            "applied": self.applied,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+        }
+
+
+progress_events = ProgressEventBuffer()
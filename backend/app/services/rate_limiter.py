@@ -0,0 +1,188 @@
+# backend/app/services/rate_limiter.py
+"""
+Limite de taxa por provider/modelo + coalescência de chamadas idênticas
+
+1. Token bucket (requisições/minuto e tokens/minuto), compartilhado por
+   todos os agentes do processo. Quando o bucket esvazia a chamada ESPERA,
+   em vez de estourar o limite do plano gratuito e receber 429.
+
+   Os tokens da resposta só são conhecidos no final: antes da chamada
+   reservamos os tokens do prompt; depois debitamos os da resposta
+   (o bucket pode ficar negativo, e as próximas chamadas esperam).
+
+2. Single-flight: se várias requisições pedem o MESMO prompt ao mesmo
+   tempo, só uma chamada vai para a API e as outras aguardam o resultado.
+"""
+
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, Tuple
+
+from app.services.errors import LLMServiceError
+
+# ============================================
+# CONFIGURAÇÃO (via .env) - limites do plano gratuito
+# ============================================
+PROVIDER_LIMITS = {
+    "gemini": (
+        int(os.getenv("GEMINI_RPM", "10")),
+        int(os.getenv("GEMINI_TPM", "250000")),
+    ),
+    "groq": (
+        int(os.getenv("GROQ_RPM", "30")),
+        int(os.getenv("GROQ_TPM", "12000")),
+    ),
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimativa grosseira: ~4 caracteres por token
+    """
+    return max(1, len(text or "") // 4)
+
+
+class TokenBucket:
+    """
+    Bucket que recarrega `per_minute` unidades por minuto
+    (capacidade = um minuto de cota)
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        Segundos até haver `amount` disponível (0 = já pode)
+        """
+        self._refill()
+        # Pedido maior que a capacidade: libera com o bucket cheio
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= amount
+
+
+class ProviderLimiter:
+    """
+    Limite de requisições/minuto e tokens/minuto de um provider/modelo
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self._lock = asyncio.Lock()
+        self.waits = 0
+        self.waited_seconds = 0.0
+
+    async def acquire(self, prompt_tokens: int):
+        """
+        Espera até haver cota para 1 requisição + os tokens do prompt
+        """
+        # O lock garante ordem de chegada (FIFO) entre as chamadas
+        async with self._lock:
+            while True:
+                delay = max(
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(prompt_tokens)
+                )
+                if delay <= 0:
+                    break
+                self.waits += 1
+                self.waited_seconds += delay
+                await asyncio.sleep(delay)
+
+            self.requests.take(1)
+            self.tokens.take(prompt_tokens)
+
+    def consume(self, tokens: int):
+        """
+        Debita os tokens da resposta (conhecidos só depois da chamada)
+        """
+        self.tokens.take(tokens)
+
+    def stats(self) -> dict:
+        self.requests._refill()
+        self.tokens._refill()
+        return {
+            "rpm": int(self.requests.capacity),
+            "tpm": int(self.tokens.capacity),
+            "available_requests": round(self.requests.tokens, 2),
+            "available_tokens": round(self.tokens.tokens, 2),
+            "waits": self.waits,
+            "waited_seconds": round(self.waited_seconds, 3),
+        }
+
+
+_limiters: Dict[Tuple[str, str], ProviderLimiter] = {}
+
+
+def get_limiter(provider: str, model: str) -> ProviderLimiter:
+    """
+    Limiter compartilhado de um provider/modelo (criado no primeiro uso)
+    """
+    key = (provider, model)
+    if key not in _limiters:
+        rpm, tpm = PROVIDER_LIMITS.get(provider, (60, 100000))
+        _limiters[key] = ProviderLimiter(rpm, tpm)
+    return _limiters[key]
+
+
+class SingleFlight:
+    """
+    Coalescência de chamadas concorrentes com a mesma chave
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable]):
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # shield: se quem espera for cancelado, a chamada original continua
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # Quem aguardava recebe um erro "retryable", não um cancelamento
+            future.set_exception(LLMServiceError("❌ Chamada original cancelada", retryable=True))
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Evita "Future exception was never retrieved" sem esperas
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+
+single_flight = SingleFlight()
+
+
+def limiter_stats() -> dict:
+    return {
+        "limiters": {f"{p}:{m}": l.stats() for (p, m), l in _limiters.items()},
+        "in_flight": len(single_flight._in_flight),
+        "coalesced": single_flight.coalesced,
+    }
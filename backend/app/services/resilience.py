@@ -0,0 +1,304 @@
+# backend/app/services/resilience.py
+"""
+Camada de resiliência para as chamadas aos LLMs
+
+- Retry só para erros que valem a pena (429, 5xx, timeouts), com backoff
+  exponencial e jitter (respeitando o Retry-After do provider)
+- Deadline: um prazo total (contextvar) propagado para todas as chamadas
+  de um fluxo; nenhum retry começa se não cabe no prazo restante
+- Circuit breaker por provider: depois de N falhas seguidas o provider
+  fica "aberto" por um tempo e as chamadas vão direto para o próximo
+- Failover: ResilientService tenta os services em ordem
+  (ex: Gemini -> Groq) com a mesma interface generate/generate_json
+"""
+
+import asyncio
+import os
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.services.errors import LLMServiceError, is_retryable
+from app.core.metrics import LLM_FAILOVERS, LLM_RETRIES, log_event
+
+# ============================================
+# CONFIGURAÇÃO (via .env)
+# ============================================
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "3"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1.0"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "20"))
+LLM_CALL_TIMEOUT_SECONDS = float(os.getenv("LLM_CALL_TIMEOUT_SECONDS", "120"))
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+
+# ============================================
+# DEADLINE
+# ============================================
+_deadline: ContextVar[Optional[float]] = ContextVar("llm_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: float):
+    """
+    Define um prazo total para as chamadas feitas dentro do bloco.
+    Um prazo externo menor sempre prevalece.
+    """
+    new_deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        new_deadline = min(new_deadline, current)
+
+    token = _deadline.set(new_deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """
+    Segundos até o deadline atual (None = sem deadline)
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+# ============================================
+# CIRCUIT BREAKER
+# ============================================
+class CircuitBreaker:
+    """
+    closed -> (N falhas seguidas) -> open -> (reset_timeout) -> half_open
+    half_open: deixa passar uma chamada de teste; sucesso fecha, falha reabre.
+    As outras são recusadas enquanto o teste não termina.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = LLM_BREAKER_THRESHOLD,
+        reset_timeout: float = LLM_BREAKER_RESET_SECONDS,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_started: Optional[float] = None  # chamada de teste em andamento (half_open)
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        if self.state == "open":
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            self.state = "half_open"
+        if self.state == "half_open":
+            # Teste que sumiu sem resultado (cancelado, por exemplo) não
+            # segura o breaker para sempre: depois de reset_timeout vale outro
+            if self._probe_started is not None and now - self._probe_started < self.reset_timeout:
+                return False
+            self._probe_started = now
+        return True
+
+    def release(self):
+        """
+        A chamada terminou sem dizer nada sobre a saúde do provider (erro
+        do cliente): libera a vaga de teste sem mudar o estado
+        """
+        self._probe_started = None
+
+    def record_success(self):
+        self.failures = 0
+        self.state = "closed"
+        self._probe_started = None
+
+    def record_failure(self):
+        self.failures += 1
+        self._probe_started = None
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                print(f"⚠️ Circuit breaker ABERTO para '{self.name}'")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {"state": self.state, "failures": self.failures, "probe_in_flight": self._probe_started is not None}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    if provider not in _breakers:
+        _breakers[provider] = CircuitBreaker(provider)
+    return _breakers[provider]
+
+
+# ============================================
+# RETRY
+# ============================================
+def backoff_delay(attempt: int, error: Exception) -> float:
+    """
+    Backoff exponencial com "full jitter"; nunca menor que o Retry-After
+    """
+    cap = min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * (2 ** (attempt - 1)))
+    delay = random.uniform(0, cap)
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after:
+        delay = max(delay, retry_after)
+    return delay
+
+
+async def call_with_retry(
+    fn: Callable[[], Awaitable],
+    breaker: CircuitBreaker,
+    max_attempts: int = LLM_MAX_ATTEMPTS,
+):
+    """
+    Executa fn() com timeout por tentativa, retry classificado e deadline
+    """
+    for attempt in range(1, max_attempts + 1):
+        timeout = LLM_CALL_TIMEOUT_SECONDS
+        remaining = remaining_time()
+        if remaining is not None:
+            if remaining <= 0:
+                raise LLMServiceError("❌ Deadline da geração excedido", provider=breaker.name, retryable=False)
+            timeout = min(timeout, remaining)
+
+        try:
+            result = await asyncio.wait_for(fn(), timeout)
+            breaker.record_success()
+            return result
+        except asyncio.TimeoutError:
+            error = LLMServiceError(
+                f"❌ Timeout ao chamar {breaker.name} ({timeout:.0f}s)",
+                provider=breaker.name,
+                retryable=True
+            )
+        except Exception as e:
+            error = e
+
+        # Erro do cliente (prompt inválido, JSON ruim...): não adianta repetir
+        if not is_retryable(error):
+            breaker.release()
+            raise error
+
+        breaker.record_failure()
+        if attempt == max_attempts or not breaker.allow():
+            raise error
+
+        delay = backoff_delay(attempt, error)
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            raise error
+
+        print(f"🔁 {breaker.name}: tentativa {attempt} falhou ({error}); nova tentativa em {delay:.1f}s")
+        LLM_RETRIES.inc(provider=breaker.name)
+        log_event("llm_retry", provider=breaker.name, attempt=attempt, delay=round(delay, 3), error=str(error))
+        await asyncio.sleep(delay)
+
+
+# ============================================
+# SERVICE COM FAILOVER
+# ============================================
+class ResilientService:
+    """
+    Mesma interface dos services (generate, generate_json, generate_stream),
+    com retry, circuit breaker e failover entre providers.
+    """
+
+    def __init__(self, services: List):
+        self.services = services
+        self.provider = services[0].provider
+
+    async def _call(self, method: str, *args, **kwargs):
+        last_error: Optional[Exception] = None
+
+        for service in self.services:
+            breaker = get_breaker(service.provider)
+            if not breaker.allow():
+                last_error = LLMServiceError(
+                    f"❌ Provider '{service.provider}' indisponível (circuit breaker aberto)",
+                    provider=service.provider,
+                    retryable=True
+                )
+                continue
+
+            try:
+                return await call_with_retry(
+                    lambda: getattr(service, method)(*args, **kwargs),
+                    breaker
+                )
+            except Exception as e:
+                # Só troca de provider se o problema for do provider
+                if not is_retryable(e):
+                    raise
+                last_error = e
+                print(f"⚠️ Failover: '{service.provider}' falhou ({e})")
+                LLM_FAILOVERS.inc(provider=service.provider)
+
+        raise last_error
+
+    async def generate(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4000
+    ) -> str:
+        return await self._call("generate", prompt, temperature=temperature, max_tokens=max_tokens)
+
+    async def generate_json(
+        self,
+        prompt: str,
+        temperature: float = 0.3
+    ) -> dict:
+        return await self._call("generate_json", prompt, temperature=temperature)
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4000
+    ) -> AsyncIterator[str]:
+        """
+        Failover só antes do primeiro pedaço: depois que o cliente já
+        recebeu texto, trocar de provider misturaria duas respostas.
+        """
+        last_error: Optional[Exception] = None
+
+        for service in self.services:
+            breaker = get_breaker(service.provider)
+            if not breaker.allow():
+                continue
+
+            started = False
+            try:
+                async for chunk in service.generate_stream(
+                    prompt,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                ):
+                    started = True
+                    yield chunk
+                breaker.record_success()
+                return
+            except Exception as e:
+                if started or not is_retryable(e):
+                    breaker.release()
+                    raise
+                breaker.record_failure()
+                last_error = e
+                print(f"⚠️ Failover (stream): '{service.provider}' falhou ({e})")
+                LLM_FAILOVERS.inc(provider=service.provider)
+
+        raise last_error or LLMServiceError("❌ Nenhum provider de IA disponível", retryable=True)
+
+
+def resilience_stats() -> dict:
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
@@ -0,0 +1,270 @@
+# backend/benchmarks/bench_generation.py
+"""
+Benchmark offline do pipeline de geração (sem gastar cota de API)
+
+Sobe o app em processo com o provider "fake" (app/services/fake_service.py)
+no lugar do Gemini/Groq e dispara as rotas de geração com a concorrência
+pedida, contra um Postgres local (DATABASE_URL, ex: o do docker-compose).
+
+Mede throughput, latência p50/p95/p99 e o atraso do event loop (lag),
+que denuncia código bloqueante nas rotas async.
+
+Uso (dentro de backend/, com o banco migrado: alembic upgrade head):
+
+    python -m benchmarks.bench_generation --scenario structure -n 50 -c 10
+    python -m benchmarks.bench_generation --scenario module -n 30 -c 5 --latency-ms 800
+    python -m benchmarks.bench_generation --scenario structure --jobs --error-rate 0.05
+
+Cada execução cria cursos novos no banco: use um banco de desenvolvimento.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+
+# ============================================
+# ESTATÍSTICAS
+# ============================================
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """
+    Percentil por interpolação linear (p entre 0 e 100)
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * p / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+
+def summarize_ms(values: List[float]) -> Dict:
+    return {
+        "p50_ms": _ms(percentile(values, 50)),
+        "p95_ms": _ms(percentile(values, 95)),
+        "p99_ms": _ms(percentile(values, 99)),
+        "max_ms": _ms(max(values) if values else None),
+        "mean_ms": _ms(statistics.fmean(values) if values else None),
+    }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+class LoopLagMonitor:
+    """
+    Acorda a cada `interval` e mede quanto atrasou: se o loop ficou
+    travado (CPU ou I/O síncrono), o atraso aparece aqui
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+# ============================================
+# CENÁRIOS
+# ============================================
+async def wait_for_job(client, job_id: int, poll: float) -> Dict:
+    while True:
+        job = (await client.get(f"/jobs/{job_id}")).json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        await asyncio.sleep(poll)
+
+
+async def call_structure(client, i: int, args) -> bool:
+    body = {"topic": f"Tópico de benchmark {i}", "goal": "Aprender o básico", "level": "basic"}
+    if args.jobs:
+        response = await client.post("/courses/generate-structure", json=body)
+        if response.status_code != 202:
+            return False
+        job = await wait_for_job(client, response.json()["job_id"], args.poll)
+        return job["status"] == "completed"
+
+    response = await client.post("/courses/generate-structure", params={"wait": "true"}, json=body)
+    return response.status_code == 200
+
+
+async def call_module(client, target: tuple, args) -> bool:
+    course_id, module_index = target
+    if args.jobs:
+        response = await client.post(f"/courses/generate-module/{course_id}/{module_index}")
+        if response.status_code != 202:
+            return False
+        job = await wait_for_job(client, response.json()["job_id"], args.poll)
+        return job["status"] == "completed" and not (job.get("result") or {}).get("failed")
+
+    response = await client.post(
+        f"/courses/generate-module/{course_id}/{module_index}/all",
+        params={"concurrency": args.lesson_concurrency} if args.lesson_concurrency else None
+    )
+    return response.status_code == 200 and not response.json().get("failed")
+
+
+async def prepare_modules(client, count: int, modules_per_course: int) -> List[tuple]:
+    """
+    Cria cursos (fora da medição) até ter `count` módulos pendentes
+    """
+    targets = []
+    i = 0
+    while len(targets) < count:
+        response = await client.post(
+            "/courses/generate-structure",
+            params={"wait": "true"},
+            json={"topic": f"Preparação {i}", "goal": "Benchmark", "level": "basic"}
+        )
+        response.raise_for_status()
+        course_id = response.json()["id"]
+        targets.extend((course_id, m) for m in range(1, modules_per_course + 1))
+        i += 1
+    return targets[:count]
+
+
+async def run(args) -> Dict:
+    import httpx
+    from app.main import app
+
+    await app.router.startup()
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            targets = []
+            if args.scenario == "module":
+                targets = await prepare_modules(client, args.requests, args.modules)
+
+            semaphore = asyncio.Semaphore(args.concurrency)
+            latencies: List[float] = []
+            errors = 0
+
+            async def one(i: int):
+                nonlocal errors
+                async with semaphore:
+                    start = time.perf_counter()
+                    try:
+                        if args.scenario == "structure":
+                            ok = await call_structure(client, i, args)
+                        else:
+                            ok = await call_module(client, targets[i], args)
+                    except Exception as e:
+                        print(f"⚠️ Requisição {i} falhou: {e}", file=sys.stderr)
+                        ok = False
+                    latencies.append(time.perf_counter() - start)
+                    if not ok:
+                        errors += 1
+
+            monitor = LoopLagMonitor()
+            monitor.start()
+            started = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(args.requests)))
+            elapsed = time.perf_counter() - started
+            await monitor.stop()
+    finally:
+        await app.router.shutdown()
+
+    return {
+        "scenario": args.scenario,
+        "mode": "jobs" if args.jobs else "inline",
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(args.requests / elapsed, 3) if elapsed else None,
+        "latency": summarize_ms(latencies),
+        "loop_lag": summarize_ms(monitor.samples),
+        "fake_llm": {
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "output_words": args.output_words,
+        },
+    }
+
+
+def print_report(result: Dict):
+    latency, lag = result["latency"], result["loop_lag"]
+    print(f"\n📊 Cenário: {result['scenario']} ({result['mode']})")
+    print(f"   Requisições: {result['requests']}  Concorrência: {result['concurrency']}  Erros: {result['errors']}")
+    print(f"   Tempo total: {result['elapsed_s']}s  Throughput: {result['throughput_rps']} req/s")
+    print(f"   Latência  p50={latency['p50_ms']}ms  p95={latency['p95_ms']}ms  p99={latency['p99_ms']}ms  max={latency['max_ms']}ms")
+    print(f"   Loop lag  p50={lag['p50_ms']}ms  p95={lag['p95_ms']}ms  p99={lag['p99_ms']}ms  max={lag['max_ms']}ms")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline da geração de cursos (provider fake)")
+    parser.add_argument("--scenario", choices=("structure", "module"), default="structure")
+    parser.add_argument("-n", "--requests", type=int, default=20)
+    parser.add_argument("-c", "--concurrency", type=int, default=5)
+    parser.add_argument("--jobs", action="store_true", help="usa a fila de jobs (202 + polling) em vez de ?wait=true")
+    parser.add_argument("--poll", type=float, default=0.05, help="intervalo do polling de jobs (s)")
+    parser.add_argument("--lesson-concurrency", type=int, default=None)
+    parser.add_argument("--latency-ms", type=float, default=500)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--output-words", type=int, default=800)
+    parser.add_argument("--modules", type=int, default=3, help="módulos por curso gerado")
+    parser.add_argument("--lessons", type=int, default=3, help="lições por módulo")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    return parser.parse_args(argv)
+
+
+def configure_env(args):
+    """
+    O app lê a configuração no import: precisa vir antes de importar app.main
+    """
+    os.environ.update({
+        "FAKE_LLM_ENABLED": "true",
+        "LLM_DEFAULT_PROVIDER": "fake",
+        "LLM_FAILOVER": "false",
+        "LLM_WARM_UP": "off",
+        # Com cache, prompts repetidos não chegariam ao provider
+        "LLM_CACHE_ENABLED": "false",
+        # Pedidos parecidos reaproveitariam o curso em vez de gerar
+        "COURSE_DEDUP_ENABLED": "false",
+        "STARTUP_REPORT": "false",
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+        "FAKE_LLM_LATENCY_MS": str(args.latency_ms),
+        "FAKE_LLM_JITTER_MS": str(args.jitter_ms),
+        "FAKE_LLM_ERROR_RATE": str(args.error_rate),
+        "FAKE_LLM_OUTPUT_WORDS": str(args.output_words),
+        "FAKE_LLM_MODULES": str(args.modules),
+        "FAKE_LLM_LESSONS": str(args.lessons),
+        "FAKE_LLM_SEED": str(args.seed),
+    })
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_env(args)
+    result = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# backend/tests/test_course_index.py
+"""
+Detecção de quase-duplicatas (app/services/course_index.py)
+"""
+
+import pytest
+
+from app.services.course_index import COURSE_DEDUP_THRESHOLD, CourseIndex, embed, normalize
+
+GOAL = "Aprender a programar do zero"
+
+
+def test_normalize_keeps_language_symbols():
+    assert normalize("C") == ["c"]
+    assert normalize("C++") == ["c++"]
+    assert normalize("C#") == ["c#"]
+    assert normalize("F# e .NET com Node.js.") == ["f#", ".net", "node.js"]
+
+
+@pytest.mark.parametrize("existing, requested", [
+    ("C", "C++"),
+    ("C++", "C"),
+    ("C", "C#"),
+    ("C#", "C++"),
+    ("F", "F#"),
+])
+def test_similar_language_names_are_not_duplicates(existing, requested):
+    index = CourseIndex(dim=512)
+    index.add(1, "basic", (existing, GOAL))
+
+    [(course_id, similarity)] = index.search(requested, GOAL, level="basic", k=1)
+    assert course_id == 1
+    assert similarity < COURSE_DEDUP_THRESHOLD
+
+
+def test_same_request_is_duplicate():
+    index = CourseIndex(dim=512)
+    index.add(1, "basic", ("C++", GOAL))
+
+    [(_, similarity)] = index.search("c++", GOAL, level="basic", k=1)
+    assert similarity >= COURSE_DEDUP_THRESHOLD
+    assert float(embed("C++", GOAL) @ embed("C++", GOAL)) == pytest.approx(1.0, abs=1e-5)
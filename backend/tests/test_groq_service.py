@@ -0,0 +1,56 @@
+# backend/tests/test_groq_service.py
+"""
+Classificação dos erros do GroqService (app/services/groq_service.py)
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import http_client
+from app.services.errors import LLMServiceError
+from app.services.groq_service import GroqService
+
+
+def _generate(monkeypatch, handler) -> str:
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+
+    async def run():
+        http_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await GroqService()._generate("prompt", None, 0.1, 10, "test-cache-key")
+        finally:
+            await http_client.close_http_client()
+
+    return asyncio.run(run())
+
+
+def test_body_without_choices_is_llm_error(monkeypatch):
+    with pytest.raises(LLMServiceError) as error:
+        _generate(monkeypatch, lambda request: httpx.Response(200, json={"error": "sem choices"}))
+    assert error.value.provider == "groq"
+    assert not error.value.retryable
+
+
+def test_invalid_json_body_is_llm_error(monkeypatch):
+    with pytest.raises(LLMServiceError) as error:
+        _generate(monkeypatch, lambda request: httpx.Response(200, text="<html>"))
+    assert not error.value.retryable
+
+
+def test_transport_error_is_retryable(monkeypatch):
+    def handler(request):
+        raise httpx.ConnectError("conexão recusada")
+
+    with pytest.raises(LLMServiceError) as error:
+        _generate(monkeypatch, handler)
+    assert error.value.retryable
+
+
+def test_status_error_keeps_classification(monkeypatch):
+    with pytest.raises(LLMServiceError) as error:
+        _generate(monkeypatch, lambda request: httpx.Response(429, json={}, headers={"retry-after": "3"}))
+    assert error.value.status_code == 429
+    assert error.value.retryable
+    assert error.value.retry_after == 3.0
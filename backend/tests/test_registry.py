@@ -0,0 +1,39 @@
+# backend/tests/test_registry.py
+"""
+Fallbacks do AgentRegistry (app/agents/registry.py)
+"""
+
+import pytest
+
+from app.agents import registry as registry_module
+from app.agents.registry import AgentRegistry
+from app.services.fake_service import FakeLLMService
+
+
+class StubService:
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    monkeypatch.setattr(registry_module, "PROVIDERS", {
+        "gemini": (StubService, "gemini-model"),
+        "llama": (StubService, "llama-model"),
+        "fake": (FakeLLMService, "fake-llm"),
+    })
+    monkeypatch.setattr(registry_module, "LLM_FAILOVER", True)
+
+
+def test_fake_is_not_a_fallback_for_real_providers(providers, monkeypatch):
+    monkeypatch.setattr(registry_module, "DEFAULT_PROVIDER", "gemini")
+
+    fallbacks = AgentRegistry()._fallbacks("gemini")
+    assert [service.model_name for service in fallbacks] == ["llama-model"]
+
+
+def test_fake_is_a_fallback_when_it_is_the_default(providers, monkeypatch):
+    monkeypatch.setattr(registry_module, "DEFAULT_PROVIDER", "fake")
+
+    fallbacks = AgentRegistry()._fallbacks("gemini")
+    assert [service.model_name for service in fallbacks] == ["llama-model", "fake-llm"]